@@ -7,8 +7,13 @@ from starlette.middleware.sessions import SessionMiddleware
 from models import db
 from rest.api import _FastAPI
 from authentication.authentication import SDAuthentication
+from authentication.sessionextender import session_extender
+from authentication.sessionreaper import session_reaper
 from config import config
 from gql.graphql import graphql, ws_graphql
+from referencedata import reference_data
+from trustadapter.patientcache import patient_cache
+from trustadapter.healthmonitor import trust_adapter_health_monitor
 from containers import SDContainer
 
 starlette_middleware = [
@@ -28,8 +33,21 @@ starlette_routes = [
 app = Starlette(
     debug=True,
     middleware=starlette_middleware,
-    routes=starlette_routes
+    routes=starlette_routes,
+    on_startup=[session_extender.start, session_reaper.start],
+    on_shutdown=[
+        session_extender.stop, session_reaper.stop, patient_cache.stop,
+        trust_adapter_health_monitor.stop
+    ]
 )
 app.mount("/rest", _FastAPI)
 app.container = SDContainer()
+app.add_event_handler(
+    "startup", lambda: trust_adapter_health_monitor.start(
+        app.container.trust_adapter_service()
+    )
+)
+app.add_event_handler("shutdown", app.container.trust_adapter_client().close)
 db.init_app(app)
+# after the database connects on startup
+app.add_event_handler("startup", reference_data.warm)
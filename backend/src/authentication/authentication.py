@@ -1,17 +1,17 @@
 from starlette.authentication import (
-    AuthenticationBackend, BaseUser,
-    AuthCredentials, has_required_scope
+    AuthenticationBackend, BaseUser, AuthCredentials
 )
 import inspect
-from config import config
 from starlette.exceptions import HTTPException
 from ariadne.format_error import GraphQLError
 from SdTypes import Permissions
 from models.db import db
 from models import User, Session, RolePermission, Role, UserRole
+from .sessioncache import session_cache
+from .sessionextender import session_extender
 from starlette.requests import HTTPConnection
-from typing import Callable, List, Optional
-from datetime import datetime, timedelta
+from typing import Callable, FrozenSet, Iterable, List, Optional
+from datetime import datetime
 from functools import wraps
 
 
@@ -54,6 +54,32 @@ class SDUser(BaseUser):
         self.email = email
 
 
+class SDAuthCredentials(AuthCredentials):
+    """
+    Credentials holding a user's scopes as a frozenset, so that
+    permission checks do not scan a list
+    """
+    def __init__(self, scopes: Iterable[str] = None):
+        self.scopes = frozenset(() if scopes is None else scopes)
+
+
+def has_required_scopes(
+    request: HTTPConnection = None, required_scopes: FrozenSet[str] = None
+) -> bool:
+    """
+    Checks the request's user has every one of the required scopes
+
+    :param request: any web request
+    :param required_scopes: scopes the user must have
+
+    :return: bool
+    """
+    scopes = request.auth.scopes
+    if not isinstance(scopes, (set, frozenset)):
+        scopes = frozenset(scopes)
+    return required_scopes <= scopes
+
+
 class SDAuthentication(AuthenticationBackend):
     """
     The backend's authentication mechanism as a middleware
@@ -65,13 +91,23 @@ class SDAuthentication(AuthenticationBackend):
 
         :param request: any web request
 
-        :return: AuthCredentials, SdUser
+        :return: SDAuthCredentials, SdUser
         """
         if "Authorization" not in request.headers:
             if request['session']:
+                session_key = str(request['session'])
+                cached = session_cache.get(session_key)
+                if cached is not None:
+                    session_extender.touch(
+                        session_key, cached.session_expiry
+                    )
+                    return SDAuthCredentials(
+                        scopes=cached.scopes
+                    ), cached.user
+
                 async with db.acquire(reuse=False) as conn:
-                    user_query = db.select([User, Session]).where(
-                        Session.session_key == str(request['session'])
+                    user_query = db.select([User, Session.expiry]).where(
+                        Session.session_key == session_key
                     ).where(
                         Session.user_id == User.id
                     ).where(
@@ -81,14 +117,7 @@ class SDAuthentication(AuthenticationBackend):
                     )
                     user: User = await conn.one_or_none(user_query)
                     if user:
-                        session_query = Session.query.where(
-                            Session.session_key == str(request['session']))
-                        session: Session = await conn.one_or_none(
-                            session_query)
-                        sessionExpiry = datetime.now() + timedelta(
-                            seconds=int(config['SESSION_EXPIRY_LENGTH'])
-                        )
-                        await session.update(expiry=sessionExpiry).apply()
+                        session_extender.touch(session_key, user.expiry)
                         sdUser = SDUser(
                             id=user.id,
                             username=user.username,
@@ -108,20 +137,29 @@ class SDAuthentication(AuthenticationBackend):
                         scopes = [Permissions.AUTHENTICATED]
                         for p in permissions:
                             scopes.append(p.permission)
-                        return AuthCredentials(
+                        session_cache.set(
+                            session_key, sdUser, scopes, user.expiry
+                        )
+                        return SDAuthCredentials(
                             scopes=scopes
                         ), sdUser
             else:
-                return AuthCredentials(scopes=[]), None
+                return SDAuthCredentials(scopes=[]), None
 
 
 def needsAuthorization(
-    required_scopes: Optional[List[Permissions]] = []
+    required_scopes: Optional[Iterable[Permissions]] = None
 ) -> Callable:
     """
-    A decorator to ensure a user has one of a specified
+    A decorator to ensure a user has all of a specified
     list of scopes/permissions
     """
+    required: FrozenSet[Permissions] = frozenset(
+        () if required_scopes is None else required_scopes
+    ) | {Permissions.AUTHENTICATED}
+    missing_message = "Missing one or many permissions: " \
+        f"{sorted(p.value for p in required)}"
+
     def decorator(func: Callable) -> Callable:
         signature = inspect.signature(func)
         info = False
@@ -137,27 +175,21 @@ def needsAuthorization(
 
         @wraps(func)
         def graphql_wrapper(*args, **kwargs):
-            required_scopes.append(Permissions.AUTHENTICATED)
             request = args[1].context['request']
 
-            if has_required_scope(request, required_scopes):
+            if has_required_scopes(request, required):
                 return func(*args, **kwargs)
             else:
-                raise GraphQLError(
-                    f"Missing one or many permissions: {required_scopes}"
-                )
+                raise GraphQLError(missing_message)
 
         @wraps(func)
         async def fastapi_wrapper(*args, **kwargs):
-            required_scopes.append(Permissions.AUTHENTICATED)
             request = kwargs["request"]
 
-            if has_required_scope(request, required_scopes):
+            if has_required_scopes(request, required):
                 return await func(*args, **kwargs)
             else:
-                raise PermissionsError(
-                    f"Missing one or many permissions: {required_scopes}"
-                )
+                raise PermissionsError(missing_message)
 
         if info:
             return graphql_wrapper
@@ -187,7 +219,7 @@ def needsAuthenticated(func: Callable) -> Callable:
 
         if request is None:
             raise Exception("Request parameter not found")
-        if not has_required_scope(request, [Permissions.AUTHENTICATED]):
+        if Permissions.AUTHENTICATED not in request.auth.scopes:
             raise AuthenticationError("Invalid login")
 
         if inspect.iscoroutinefunction(func):
@@ -1,19 +1,42 @@
 from base64 import b64encode
-from typing import List, Union
-from gino.loader import ModelLoader
+from secrets import randbits
 from gino import Gino
+from sqlalchemy import JSON, func, literal_column, select, type_coerce
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from starlette.responses import JSONResponse
 from models.db import db
 from models import User, Session, Pathway, Role, UserRole, UserPathway
 from starlette.requests import Request
-from bcrypt import checkpw
-from random import getrandbits
 from datetime import datetime, timedelta
 from config import config
 from .authentication import SDUser
+from .sessioncache import session_cache
+from .passwords import password_hasher
 import itsdangerous
 
 
+def _json_list(id_column, name_column, from_obj, where):
+    """
+    Builds a correlated subquery aggregating rows into a JSON list of
+    `{"id": ..., "name": ...}` objects, ordered by ID
+
+    :return: scalar subquery
+    """
+    aggregate = func.json_agg(aggregate_order_by(
+        func.json_build_object(
+            literal_column("'id'"), id_column,
+            literal_column("'name'"), name_column
+        ),
+        id_column
+    ))
+    return type_coerce(
+        select([
+            func.coalesce(aggregate, literal_column("'[]'::json"))
+        ]).select_from(from_obj).where(where).as_scalar(),
+        JSON
+    )
+
+
 class LoginController:
     """
     A class to handle authentication methods
@@ -51,19 +74,39 @@ class LoginController:
 
         username = str(inputData['username']).lower()
         password = inputData['password']
+
+        # the user, with everything the response needs, in one query
+        default_pathway = type_coerce(
+            select([
+                func.json_build_object(
+                    literal_column("'id'"), Pathway.id,
+                    literal_column("'name'"), Pathway.name
+                )
+            ]).where(Pathway.id == User.default_pathway_id).as_scalar(),
+            JSON
+        )
+        user_query = db.select([
+            User,
+            _json_list(
+                Role.id, Role.name, Role.join(UserRole),
+                UserRole.user_id == User.id
+            ).label("roles"),
+            _json_list(
+                Pathway.id, Pathway.name, Pathway.join(UserPathway),
+                UserPathway.user_id == User.id
+            ).label("pathways"),
+            default_pathway.label("default_pathway"),
+        ]).where(User.username == username)
         async with self._db.acquire(reuse=False) as conn:
-            user: User = await conn.one_or_none(
-                User.query.where(User.username == username)
-            )
+            user = await conn.one_or_none(user_query)
 
         if user is None:
             return JSONResponse({
                 "error": self._WRONG_USERNAME_OR_PASSWORD_PROMPT
             })
 
-        if not checkpw(
-            password.encode('utf-8'),
-            user.password.encode('utf-8')
+        if not await password_hasher.check_password(
+            password, user.password
         ):
             return JSONResponse({
                 "error": self._WRONG_USERNAME_OR_PASSWORD_PROMPT
@@ -78,64 +121,24 @@ class LoginController:
             default_pathway_id=user.default_pathway_id,
         )
 
-        async with self._context['db'].acquire(reuse=False) as conn:
-            role_query = Role.outerjoin(UserRole)\
-                .outerjoin(User)\
-                .select()\
-                .where(User.id == user.id)\
-                .execution_options(loader=ModelLoader(Role))
-            roles: List[Role] = await conn.all(role_query)
-
-            pathway_query = Pathway.outerjoin(UserPathway)\
-                .outerjoin(User)\
-                .select()\
-                .where(User.id == user.id)\
-                .execution_options(loader=ModelLoader(Pathway))
-            pathways: List[Pathway] = await conn.all(pathway_query)
-
-            default_pathway: Union[Pathway, None] = await conn.one_or_none(
-                Pathway.query.where(Pathway.id == sdUser.default_pathway_id)
-            )
-            default_pathway_dict = None
-            if default_pathway is not None:
-                default_pathway_dict = {
-                    "id": default_pathway.id,
-                    "name": default_pathway.name
-                }
-
-            role_dicts = []
-            for r in roles:
-                role_dicts.append({
-                    "id": r.id,
-                    "name": r.name
-                })
-
-            user_pathways = []
-            for p in pathways:
-                user_pathways.append({
-                    "id": p.id,
-                    "name": p.name
-                })
+        sessionExpiry = datetime.now()+timedelta(
+            seconds=int(config['SESSION_EXPIRY_LENGTH'])
+        )
 
+        # the cookie is decoded as JSON by the session middleware, so
+        # keys stay numeric strings
         sessionKey = None
         async with self._context['db'].acquire(reuse=False) as conn:
             while sessionKey is None:
-                tempKey = getrandbits(64)
-                result: Union[Session, None] = await conn.one_or_none(
-                    Session.query.where(Session.session_key == str(tempKey))
+                sessionKey = await conn.scalar(
+                    insert(Session).values(
+                        session_key=str(randbits(128)),
+                        expiry=sessionExpiry,
+                        user_id=sdUser.id
+                    ).on_conflict_do_nothing().returning(
+                        Session.session_key
+                    )
                 )
-                if result is None:
-                    sessionKey = tempKey
-
-        sessionExpiry = datetime.now()+timedelta(
-            seconds=int(config['SESSION_EXPIRY_LENGTH'])
-        )
-
-        sdSession: Session = await Session.create(
-            session_key=str(sessionKey),
-            expiry=sessionExpiry,
-            user_id=sdUser.id
-        )
 
         res = JSONResponse({
             "user": {
@@ -144,10 +147,10 @@ class LoginController:
                 "firstName": sdUser.first_name,
                 "lastName": sdUser.last_name,
                 "department": sdUser.department,
-                "defaultPathway": default_pathway_dict,
-                "token": str(sessionKey),
-                "roles": role_dicts,
-                "pathways": user_pathways
+                "defaultPathway": user.default_pathway,
+                "token": sessionKey,
+                "roles": user.roles,
+                "pathways": user.pathways
             },
             "config": {
                 "hospitalNumberFormat": config['HOSPITAL_NUMBER_FORMAT'],
@@ -158,7 +161,7 @@ class LoginController:
         signer = itsdangerous.TimestampSigner(
             str(config['SESSION_SECRET_KEY'])
         )
-        cookieValue = b64encode(sdSession.session_key.encode("utf-8"))
+        cookieValue = b64encode(sessionKey.encode("utf-8"))
         cookieValue = signer.sign(cookieValue)
 
         res.set_cookie(
@@ -187,6 +190,7 @@ class LoginController:
                         Session.session_key == str(request['session'])
                     )
                 )
+                session_cache.invalidate(str(request['session']))
                 res = JSONResponse({
                     "success": True
                 })
@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+from bcrypt import checkpw, gensalt, hashpw
+from config import config
+
+T = TypeVar("T")
+
+
+@dataclass
+class PasswordHasherStats:
+    """
+    Queue depth and throughput of a PasswordHasher
+    """
+    waiting: int = 0
+    running: int = 0
+    max_waiting: int = 0
+    completed: int = 0
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a thread pool so hashing does not block the event
+    loop. At most `max_concurrency` operations run at once; further
+    callers wait their turn, which shows in the stats' queue depth
+    """
+
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max_concurrency
+        self.stats = PasswordHasherStats()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="bcrypt"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        # created lazily so it belongs to the running event loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+
+        self.stats.waiting += 1
+        self.stats.max_waiting = max(
+            self.stats.max_waiting, self.stats.waiting
+        )
+        queued = True
+        try:
+            async with self._semaphore:
+                queued = False
+                self.stats.waiting -= 1
+                self.stats.running += 1
+                try:
+                    return await loop.run_in_executor(
+                        self._executor, func, *args
+                    )
+                finally:
+                    self.stats.running -= 1
+                    self.stats.completed += 1
+        finally:
+            # cancelled while waiting for a slot
+            if queued:
+                self.stats.waiting -= 1
+
+    async def hash_password(self, password: str = None) -> str:
+        """
+        Hashes a password with a new salt
+
+        :param password: plaintext password
+
+        :return: hashed password
+        """
+        hashed = await self._run(hashpw, password.encode('utf-8'), gensalt())
+        return hashed.decode('utf-8')
+
+    async def check_password(
+        self, password: str = None, hashed_password: str = None
+    ) -> bool:
+        """
+        Checks a password against its hash
+
+        :param password: plaintext password
+        :param hashed_password: hash stored for the user
+
+        :return: bool
+        """
+        return await self._run(
+            checkpw,
+            password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+
+
+password_hasher = PasswordHasher(
+    max_concurrency=int(config.get('PASSWORD_HASH_CONCURRENCY', 4))
+)
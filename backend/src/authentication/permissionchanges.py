@@ -0,0 +1,52 @@
+from typing import Dict
+
+
+class PermissionChanges:
+    """
+    Records when users' roles or permissions change, so that anything
+    holding on to a user's scopes, such as a websocket connection, can
+    tell when to read them again
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._all_version = 0
+        self._user_versions: Dict[int, int] = {}
+
+    @property
+    def version(self) -> int:
+        """
+        The current version, to be kept alongside scopes that are about
+        to be read
+        """
+        return self._version
+
+    def publish(self, user_id: int = None):
+        """
+        Records a permission change
+
+        :param user_id: ID of the affected user, or None if a change
+            could affect every user, e.g. a role's permissions changed
+        """
+        self._version += 1
+        if user_id is None:
+            self._all_version = self._version
+        else:
+            self._user_versions[user_id] = self._version
+
+    def changed_since(self, user_id: int = None, version: int = None) -> bool:
+        """
+        Checks whether a user's permissions may have changed since
+        a version
+
+        :param user_id: ID of the user
+        :param version: version kept when the user's scopes were read
+
+        :return: bool
+        """
+        return max(
+            self._all_version, self._user_versions.get(user_id, 0)
+        ) > version
+
+
+permission_changes = PermissionChanges()
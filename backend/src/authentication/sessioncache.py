@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Optional, Set
+from starlette.authentication import BaseUser
+from config import config
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """
+    An authenticated session as held in the session cache
+    """
+    user: BaseUser
+    scopes: FrozenSet[str]
+    expiry: datetime
+    session_expiry: datetime
+
+
+class SessionCache:
+    """
+    Per-process LRU cache of session key to authenticated user and
+    scopes. Entries live for at most `ttl` seconds, which bounds how
+    long another process' changes (or a missed invalidation) can go
+    unseen
+    """
+
+    def __init__(self, max_size: int = None, ttl: int = None):
+        self.max_size = max_size
+        self.ttl = timedelta(seconds=ttl)
+        self._sessions: "OrderedDict[str, CachedSession]" = OrderedDict()
+        self._user_sessions: Dict[int, Set[str]] = {}
+
+    def get(self, session_key: str = None) -> Optional[CachedSession]:
+        """
+        Gets a cached session if it has not expired
+
+        :param session_key: session key from the request
+
+        :return: CachedSession or None
+        """
+        cached = self._sessions.get(session_key)
+        if cached is None:
+            return None
+        if cached.expiry <= datetime.now():
+            self.invalidate(session_key)
+            return None
+        self._sessions.move_to_end(session_key)
+        return cached
+
+    def set(
+        self, session_key: str = None, user: BaseUser = None,
+        scopes: FrozenSet[str] = None, expiry: datetime = None
+    ) -> CachedSession:
+        """
+        Caches a session, until the earlier of the session's expiry
+        and the cache's TTL
+
+        :param session_key: session key from the request
+        :param user: authenticated user
+        :param scopes: user's scopes
+        :param expiry: session expiry in the database
+
+        :return: CachedSession
+        """
+        self.invalidate(session_key)
+        cached = CachedSession(
+            user=user,
+            scopes=frozenset(scopes),
+            expiry=min(expiry, datetime.now() + self.ttl),
+            session_expiry=expiry
+        )
+        self._sessions[session_key] = cached
+        self._user_sessions.setdefault(user.id, set()).add(session_key)
+        while len(self._sessions) > self.max_size:
+            oldest_key = next(iter(self._sessions))
+            self.invalidate(oldest_key)
+        return cached
+
+    def invalidate(self, session_key: str = None):
+        """
+        Removes a session from the cache, e.g. on logout
+
+        :param session_key: session key to remove
+        """
+        cached = self._sessions.pop(session_key, None)
+        if cached is None:
+            return
+        user_sessions = self._user_sessions.get(cached.user.id)
+        if user_sessions is not None:
+            user_sessions.discard(session_key)
+            if not user_sessions:
+                del self._user_sessions[cached.user.id]
+
+    def invalidate_user(self, user_id: int = None):
+        """
+        Removes all of a user's sessions from the cache, e.g. when their
+        details or roles change
+
+        :param user_id: ID of the user
+        """
+        for session_key in list(self._user_sessions.get(user_id, ())):
+            self.invalidate(session_key)
+
+    def clear(self):
+        """
+        Removes every session from the cache, e.g. when a role's
+        permissions change
+        """
+        self._sessions.clear()
+        self._user_sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+session_cache = SessionCache(
+    max_size=int(config.get('SESSION_CACHE_SIZE', 10000)),
+    ttl=int(config.get('SESSION_CACHE_TTL', 60)),
+)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import bindparam, DateTime, String, text
+from config import config
+from models.db import db
+
+log = logging.getLogger("uvicorn")
+
+
+class SessionExpiryExtender:
+    """
+    Write-behind sliding session expiry. Requests record that a session
+    was used, and the new expiries are written in one batched UPDATE
+    every `interval` seconds. Sessions whose stored expiry is within
+    `threshold` seconds of a full session length are not written at all
+    """
+
+    def __init__(
+        self, expiry_length: int = None,
+        threshold: int = None, interval: int = None
+    ):
+        self.expiry_length = timedelta(seconds=expiry_length)
+        self.threshold = timedelta(seconds=threshold)
+        self.interval = interval
+        self._pending: Dict[str, datetime] = {}
+        self._written: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, session_key: str = None, stored_expiry: datetime = None):
+        """
+        Records that a session has been used
+
+        :param session_key: session key from the request
+        :param stored_expiry: session expiry as last read from the
+            database
+        """
+        written = self._written.get(session_key)
+        if written is not None and written > stored_expiry:
+            stored_expiry = written
+        now = datetime.now()
+        if stored_expiry > now + self.expiry_length - self.threshold:
+            return
+        self._pending[session_key] = now + self.expiry_length
+
+    async def flush(self) -> int:
+        """
+        Writes the pending expiry extensions to the database
+
+        :return: number of sessions written
+        """
+        pending, self._pending = self._pending, {}
+        now = datetime.now()
+        self._written = {
+            key: expiry for key, expiry in self._written.items()
+            if expiry > now
+        }
+        if not pending:
+            return 0
+
+        values = []
+        params = []
+        for index, (key, expiry) in enumerate(pending.items()):
+            values.append(
+                f"(:key_{index}, CAST(:expiry_{index} AS TIMESTAMP))"
+            )
+            params.append(bindparam(f"key_{index}", key, type_=String()))
+            params.append(
+                bindparam(f"expiry_{index}", expiry, type_=DateTime())
+            )
+        query = text(
+            "UPDATE tbl_session SET expiry = extended.expiry "
+            f"FROM (VALUES {', '.join(values)}) "
+            "AS extended (session_key, expiry) "
+            "WHERE tbl_session.session_key = extended.session_key"
+        ).bindparams(*params)
+
+        try:
+            async with db.acquire(reuse=False) as conn:
+                await conn.status(query)
+        except Exception:
+            # keep the extensions for the next flush, unless the
+            # session has been touched again since
+            for key, expiry in pending.items():
+                self._pending.setdefault(key, expiry)
+            raise
+        self._written.update(pending)
+        return len(pending)
+
+    def clear(self):
+        """
+        Drops pending extensions without writing them
+        """
+        self._pending.clear()
+        self._written.clear()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Failed to extend session expiries: {e}")
+
+    def start(self):
+        """
+        Starts flushing on an interval in the background
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the background flush and writes anything still pending
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+session_extender = SessionExpiryExtender(
+    expiry_length=int(config['SESSION_EXPIRY_LENGTH']),
+    threshold=int(config.get('SESSION_EXTEND_THRESHOLD', 300)),
+    interval=int(config.get('SESSION_EXTEND_INTERVAL', 30)),
+)
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from config import config
+from models import Session
+from models.db import db
+
+log = logging.getLogger("uvicorn")
+
+
+class ExpiredSessionReaper:
+    """
+    Deletes expired sessions in the background. Each pass deletes in
+    batches of `batch_size`, found through the index on expiry, pausing
+    `pause` seconds between batches so no delete holds locks for long
+    """
+
+    def __init__(
+        self, interval: int = None, batch_size: int = None,
+        pause: float = None
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self._task: Optional[asyncio.Task] = None
+
+    async def delete_batch(self) -> int:
+        """
+        Deletes one batch of expired sessions. Sessions locked by
+        another transaction are left for a later batch
+
+        :return: number of sessions deleted
+        """
+        expired = select([Session.session_key]).where(
+            Session.expiry < datetime.now()
+        ).order_by(
+            Session.expiry
+        ).limit(
+            self.batch_size
+        ).with_for_update(skip_locked=True)
+
+        async with db.acquire(reuse=False) as conn:
+            deleted = await conn.all(
+                Session.delete.where(
+                    Session.session_key.in_(expired)
+                ).returning(Session.session_key)
+            )
+        return len(deleted)
+
+    async def reap(self) -> int:
+        """
+        Deletes expired sessions batch by batch until none are left
+
+        :return: number of sessions deleted
+        """
+        total = 0
+        while True:
+            deleted = await self.delete_batch()
+            total += deleted
+            if deleted < self.batch_size:
+                return total
+            await asyncio.sleep(self.pause)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reap()
+            except Exception as e:
+                log.error(f"Failed to delete expired sessions: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """
+        Starts reaping on an interval in the background
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops reaping
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+session_reaper = ExpiredSessionReaper(
+    interval=int(config.get('SESSION_REAP_INTERVAL', 60)),
+    batch_size=int(config.get('SESSION_REAP_BATCH_SIZE', 500)),
+    pause=float(config.get('SESSION_REAP_PAUSE', 0.1)),
+)
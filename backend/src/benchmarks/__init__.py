@@ -0,0 +1,5 @@
+"""
+Standalone micro-benchmarks, run as modules from the src directory,
+e.g. `python -m benchmarks.authorization`. These are not collected by
+pytest
+"""
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark of resolvers decorated with needsAuthorization.
+Checks stay constant time however many times a resolver is called
+
+    python -m benchmarks.authorization [--calls 100000]
+"""
+import argparse
+from timeit import timeit
+from types import SimpleNamespace
+from ariadne.format_error import GraphQLError
+from SdTypes import Permissions
+from authentication.authentication import (
+    needsAuthorization, SDAuthCredentials
+)
+
+
+@needsAuthorization([Permissions.PATIENT_READ, Permissions.PATHWAY_READ])
+def allowed_resolver(obj=None, info=None):
+    return True
+
+
+@needsAuthorization([Permissions.USER_UPDATE])
+def denied_resolver(obj=None, info=None):
+    return True
+
+
+def make_info(scopes):
+    request = SimpleNamespace(auth=SDAuthCredentials(scopes=scopes))
+    return SimpleNamespace(context={'request': request})
+
+
+def call_denied(info):
+    try:
+        denied_resolver(None, info)
+    except GraphQLError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    info = make_info([
+        Permissions.AUTHENTICATED,
+        Permissions.PATIENT_READ,
+        Permissions.PATHWAY_READ,
+    ])
+    # ensure later rounds do the same amount of work as the first
+    for round in range(1, 4):
+        allowed = timeit(lambda: allowed_resolver(None, info),
+                         number=args.calls)
+        denied = timeit(lambda: call_denied(info), number=args.calls)
+        print(
+            f"round {round}: "
+            f"allowed {allowed / args.calls * 1e9:.0f} ns/call, "
+            f"denied {denied / args.calls * 1e9:.0f} ns/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
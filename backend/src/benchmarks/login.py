@@ -0,0 +1,76 @@
+"""
+Login throughput benchmark. Runs a burst of bcrypt password checks,
+as at shift start, while another task stands in for the rest of the
+app's requests and measures how late the event loop wakes it. Runs
+the burst blocking the loop, then through the password hasher
+
+    python -m benchmarks.login [--logins 20] [--concurrency 4]
+"""
+import argparse
+import asyncio
+from time import perf_counter
+from bcrypt import checkpw, gensalt, hashpw
+from authentication.passwords import PasswordHasher
+
+TICK = 0.01
+
+
+async def measure_latency(stop: asyncio.Event):
+    delays = []
+    while not stop.is_set():
+        started = perf_counter()
+        await asyncio.sleep(TICK)
+        delays.append(perf_counter() - started - TICK)
+    return delays
+
+
+async def run_burst(logins, check):
+    stop = asyncio.Event()
+    latency = asyncio.create_task(measure_latency(stop))
+    await asyncio.sleep(TICK)
+    started = perf_counter()
+    await asyncio.gather(*(check() for _ in range(logins)))
+    elapsed = perf_counter() - started
+    stop.set()
+    delays = sorted(await latency)
+    return elapsed, delays
+
+
+def report(name, logins, elapsed, delays):
+    p50 = delays[len(delays) // 2] * 1000
+    worst = delays[-1] * 1000
+    print(
+        f"{name}: {logins / elapsed:.1f} logins/s, "
+        f"other requests delayed p50 {p50:.1f} ms, max {worst:.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    password = "benchmark-password"
+    hashed = hashpw(password.encode('utf-8'), gensalt()).decode('utf-8')
+
+    async def blocking_check():
+        return checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    hasher = PasswordHasher(max_concurrency=args.concurrency)
+
+    async def hasher_check():
+        return await hasher.check_password(password, hashed)
+
+    report("blocking", args.logins,
+           *await run_burst(args.logins, blocking_check))
+    report("executor", args.logins,
+           *await run_burst(args.logins, hasher_check))
+    print(
+        f"executor queue: max waiting {hasher.stats.max_waiting}, "
+        f"completed {hasher.stats.completed}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+"""
+Micro-benchmark of resolving patients' demographic fields. Compares a
+resolver per field, each awaiting the patient's demographics from the
+request's loader, with merging the demographics once per patient and
+reading the fields as attributes. The loader is primed, so only
+resolver overhead is measured
+
+    python -m benchmarks.patient_demographics [--rows 100] [--runs 50]
+"""
+import argparse
+import asyncio
+from datetime import date
+from time import perf_counter
+from ariadne import (
+    QueryType, ObjectType, make_executable_schema,
+    snake_case_fallback_resolvers
+)
+from graphql import graphql
+from dataloaders import PatientByHospitalNumberFromIELoader
+from gql.types.patient import DEMOGRAPHIC_FIELDS, with_demographics
+from models import Patient
+from trustadapter.trustadapter import Patient_IE
+
+TYPE_DEFS = """
+    type Query {
+        patients: [Patient!]!
+    }
+
+    type Address {
+        line: String!
+        city: String!
+    }
+
+    type Patient {
+        id: ID!
+        hospitalNumber: String!
+        firstName: String!
+        lastName: String!
+        communicationMethod: String!
+        dateOfBirth: String!
+        sex: String!
+        occupation: String!
+        telephoneNumber: String
+        address: Address!
+    }
+"""
+
+QUERY = """
+    query {
+        patients {
+            id
+            hospitalNumber
+            firstName
+            lastName
+            communicationMethod
+            dateOfBirth
+            sex
+            occupation
+            telephoneNumber
+            address { line city }
+        }
+    }
+"""
+
+
+def make_per_field_schema(patients):
+    query = QueryType()
+    patient_type = ObjectType("Patient")
+
+    @query.field("patients")
+    async def resolve_patients(obj=None, info=None):
+        return patients
+
+    def make_resolver(attribute):
+        async def resolve(obj=None, info=None):
+            record = await PatientByHospitalNumberFromIELoader.load_from_id(
+                context=info.context, id=obj.hospital_number
+            )
+            return getattr(record, attribute)
+        return resolve
+
+    for field in DEMOGRAPHIC_FIELDS:
+        attribute = "".join(
+            f"_{c.lower()}" if c.isupper() else c for c in field
+        )
+        patient_type.set_field(field, make_resolver(attribute))
+
+    return make_executable_schema(
+        TYPE_DEFS, query, patient_type, snake_case_fallback_resolvers
+    )
+
+
+def make_read_model_schema(patients):
+    query = QueryType()
+
+    @query.field("patients")
+    async def resolve_patients(obj=None, info=None):
+        return await with_demographics(info, patients)
+
+    return make_executable_schema(
+        TYPE_DEFS, query, snake_case_fallback_resolvers
+    )
+
+
+def make_context(records):
+    context = {}
+    for record in records:
+        PatientByHospitalNumberFromIELoader.prime(
+            key=record.hospital_number, value=record, context=context
+        )
+    return context
+
+
+async def run(schema, records, runs):
+    elapsed = 0
+    for _ in range(runs):
+        context = make_context(records)
+        started = perf_counter()
+        result = await graphql(schema, QUERY, context_value=context)
+        elapsed += perf_counter() - started
+        assert result.errors is None, result.errors
+    return elapsed / runs
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    patients = [
+        Patient(
+            id=i, hospital_number=f"fMRN{i:06}",
+            national_number=f"fNHS{i:09}"
+        )
+        for i in range(args.rows)
+    ]
+    records = [
+        Patient_IE(
+            first_name="First", last_name="Last",
+            hospital_number=p.hospital_number,
+            national_number=p.national_number,
+            communication_method="LETTER",
+            date_of_birth=date(2000, 1, 1), sex="female",
+            occupation="Engineer", telephone_number="0000",
+            address={"line": "1 Street", "city": "City"}
+        )
+        for p in patients
+    ]
+
+    for name, schema in [
+        ("per field", make_per_field_schema(patients)),
+        ("read model", make_read_model_schema(patients)),
+    ]:
+        elapsed = await run(schema, records, args.runs)
+        print(
+            f"{name}: {elapsed * 1000:.2f} ms per query, "
+            f"{elapsed / args.rows * 1e6:.1f} us per row"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
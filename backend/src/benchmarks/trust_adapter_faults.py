@@ -0,0 +1,112 @@
+"""
+Loads patients from a running pseudotie while it injects faults, through
+the circuit breaker, and reports how long the loads take. Each phase
+sets the pseudotie's delay and error rate through /debug/faults/ and
+runs `--calls` loads, `--concurrency` at a time. The circuit is closed
+before each phase but the last, which checks it closes once the
+pseudotie has recovered
+
+    python -m benchmarks.trust_adapter_faults [--calls 200]
+        [--concurrency 10] [--hospital-number fMRN000001]
+"""
+import argparse
+import asyncio
+import math
+from base64 import b64encode
+from random import getrandbits
+from time import perf_counter
+from itsdangerous import TimestampSigner
+from config import config
+from services import TrustAdapterService
+from trustadapter import PseudoTrustAdapter
+from trustadapter.circuitbreaker import CircuitOpenError, CircuitBreaker
+from trustadapter.trustadapter import (
+    HTTPRequestType, TrustIntegrationCommunicationError
+)
+
+PHASES = [
+    ("healthy", {"delay": 0, "error_rate": 0}),
+    ("slow", {"delay": 3, "error_rate": 0}),
+    ("failing", {"delay": 0, "error_rate": 0.8}),
+    ("recovered", {"delay": 0, "error_rate": 0}),
+]
+
+
+async def set_faults(trust_adapter: PseudoTrustAdapter, faults, auth_token):
+    await trust_adapter._request(
+        HTTPRequestType.POST,
+        f"{trust_adapter.TRUST_INTEGRATION_ENGINE_ENDPOINT}/debug/faults/",
+        json=faults, cookies={"SDSESSION": auth_token}
+    )
+
+
+async def run_phase(service, hospital_number, calls, concurrency, token):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    outcomes = {"ok": 0, "failed": 0, "rejected": 0}
+
+    async def load():
+        async with semaphore:
+            started = perf_counter()
+            try:
+                await service.load_many_patients(
+                    hospitalNumbers=[hospital_number], auth_token=token
+                )
+                outcomes["ok"] += 1
+            except CircuitOpenError:
+                outcomes["rejected"] += 1
+            except TrustIntegrationCommunicationError:
+                outcomes["failed"] += 1
+            latencies.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(load() for _ in range(calls)))
+    elapsed = perf_counter() - started
+    latencies.sort()
+    p95 = latencies[math.ceil(len(latencies) * 0.95) - 1]
+    return elapsed, p95, outcomes
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--hospital-number", default="fMRN000001")
+    args = parser.parse_args()
+
+    signer = TimestampSigner(config['SESSION_SECRET_KEY'])
+    token = signer.sign(
+        b64encode(str(getrandbits(64)).encode("utf-8"))
+    ).decode("utf-8")
+
+    trust_adapter = PseudoTrustAdapter()
+    breaker = CircuitBreaker(
+        window=50, min_calls=10, error_rate=0.5, latency_budget=2,
+        reset_timeout=5
+    )
+    service = TrustAdapterService(
+        trust_adapter_client=trust_adapter, circuit_breaker=breaker
+    )
+    try:
+        for name, faults in PHASES:
+            await set_faults(trust_adapter, faults, token)
+            if name == "recovered":
+                # let the circuit go half open
+                await asyncio.sleep(breaker.reset_timeout)
+            else:
+                breaker.reset()
+            elapsed, p95, outcomes = await run_phase(
+                service, args.hospital_number, args.calls,
+                args.concurrency, token
+            )
+            print(
+                f"{name}: {elapsed:.2f} s, p95 {p95 * 1000:.0f} ms, "
+                f"{outcomes}, circuit {breaker.state.value}"
+            )
+    finally:
+        await set_faults(trust_adapter, PHASES[0][1], token)
+        await trust_adapter.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
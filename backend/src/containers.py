@@ -2,6 +2,8 @@ from dependency_injector import containers, providers
 import sdpubsub
 import services
 import trustadapter
+import trustadapter.circuitbreaker
+import trustadapter.healthmonitor
 import email_adapter
 from config import config as SDConfig
 
@@ -33,6 +35,12 @@ class SDContainer(containers.DeclarativeContainer):
     # Gateways
 
     trust_adapter_client = providers.Singleton(trust_adapter)
+    trust_adapter_circuit_breaker = providers.Object(
+        trustadapter.circuitbreaker.trust_adapter_circuit_breaker
+    )
+    trust_adapter_health_monitor = providers.Object(
+        trustadapter.healthmonitor.trust_adapter_health_monitor
+    )
     pubsub_client = providers.Singleton(pubsub)
     email_client = providers.Singleton(email)
 
@@ -40,7 +48,9 @@ class SDContainer(containers.DeclarativeContainer):
 
     trust_adapter_service = providers.Factory(
         services.TrustAdapterService,
-        trust_adapter_client=trust_adapter_client
+        trust_adapter_client=trust_adapter_client,
+        circuit_breaker=trust_adapter_circuit_breaker,
+        health_monitor=trust_adapter_health_monitor
     )
     pubsub_service = providers.Factory(
         services.PubSubService,
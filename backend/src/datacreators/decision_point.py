@@ -14,8 +14,7 @@ from models import (
     Patient,
     UserPathway,
     OnMdt,
-    MDT,
-    db
+    MDT
 )
 from SdTypes import ClinicalRequestState, DecisionTypes
 from typing import List, Dict, Union
@@ -96,6 +95,8 @@ async def CreateDecisionPoint(
         same Pathway
     :raise ClinicalRequestTypeIdNotOnPathway: ClinicalRequestType and
         DecisionPoint not on same Pathway
+    :raise TrustIntegrationCommunicationError: trust integration engine
+        unavailable
     """
 
     if context is None:
@@ -113,9 +114,7 @@ async def CreateDecisionPoint(
 
     errors = MutationUserErrorHandler()
 
-    await trust_adapter.test_connection(
-        auth_token=context['request'].cookies['SDSESSION']
-    )
+    trust_adapter.raise_if_unavailable()
 
     on_pathway_id = int(on_pathway_id)
     clinician_id = int(clinician_id)
@@ -128,8 +127,8 @@ async def CreateDecisionPoint(
     pathway = await PathwayByIdLoader.load_from_id(
         context, on_pathway.pathway_id)
 
-    async with db.acquire(reuse=False) as conn:
-        async with db.transaction():
+    async with context['db'].acquire(reuse=False) as conn:
+        async with conn.transaction():
             user_has_pathway_permission: Union[UserPathway, None] = await conn\
                 .one_or_none(
                     UserPathway
@@ -220,6 +219,7 @@ async def CreateDecisionPoint(
                 str(mT.id) for mT in valid_clinical_request_types
             ]
 
+            milestone_types: List[ClinicalRequestType] = []
             for request_input in clinical_request_requests:
                 milestone_type: ClinicalRequestType = await \
                     ClinicalRequestTypeLoader.load_from_id(
@@ -229,19 +229,26 @@ async def CreateDecisionPoint(
                 if str(milestone_type.id) not in \
                         valid_clinical_request_type_ids:
                     raise ClinicalRequestTypeIdNotOnPathway(milestone_type.id)
+                milestone_types.append(milestone_type)
+
+            # every test result ordered is created in one call
+            test_results = iter(await trust_adapter.create_many_test_results(
+                [
+                    TestResultRequest_IE(
+                        type_id=milestone_type.id,
+                        hospital_number=patient.hospital_number,
+                        pathway_name=pathway.name
+                    )
+                    for milestone_type in milestone_types
+                    if not milestone_type.is_mdt
+                ],
+                auth_token=context['request'].cookies['SDSESSION']
+            ))
 
-                clinical_request_request = TestResultRequest_IE()
-                clinical_request_request.type_id = milestone_type.id
-                clinical_request_request.hospital_number = \
-                    patient.hospital_number
-                clinical_request_request.pathway_name = pathway.name
-
+            for milestone_type in milestone_types:
                 test_result = None
                 if not milestone_type.is_mdt:
-                    test_result = await trust_adapter.create_test_result(
-                        clinical_request_request,
-                        auth_token=context['request'].cookies['SDSESSION']
-                    )
+                    test_result = next(test_results)
                 kwargs_clinical_request = {}
 
                 if test_result is not None and test_result.id:
@@ -252,8 +259,7 @@ async def CreateDecisionPoint(
                 clinical_request: ClinicalRequest = await ClinicalRequest(
                     on_pathway_id=int(decision_point.on_pathway_id),
                     decision_point_id=int(decision_point.id),
-                    clinical_request_type_id=int(
-                        clinical_request_request.type_id),
+                    clinical_request_type_id=int(milestone_type.id),
                     **kwargs_clinical_request
                 ).create()
 
@@ -283,8 +289,9 @@ async def CreateDecisionPoint(
                     )
 
                 clinical_request_type: ClinicalRequestType = await \
-                    ClinicalRequestType.get(
-                        int(clinical_request_request.type_id)
+                    ClinicalRequestTypeLoader.load_from_id(
+                        context=context,
+                        id=int(milestone_type.id)
                     )
                 if clinical_request_type.is_discharge:
                     await OnPathway.update\
@@ -5,6 +5,7 @@ from common import (
     PathwayPayload
 )
 from asyncpg.exceptions import UniqueViolationError
+from referencedata import reference_data
 
 
 async def CreatePathway(
@@ -52,3 +53,7 @@ async def CreatePathway(
             message="A pathway with this name already exists"
         )
         return PathwayPayload(user_errors=errors.errorList)
+    finally:
+        # the pathway may have been created even if linking its clinical
+        # request types failed
+        reference_data.invalidate()
@@ -6,7 +6,8 @@ from datetime import date, datetime
 from dataloaders import (
     PathwayByIdLoader,
     OnPathwaysByPatient,
-    ClinicalRequestTypeLoader
+    ClinicalRequestTypeLoader,
+    PatientReadModel
 )
 from config import config as SdConfig
 from typing import Optional, List, Union
@@ -16,6 +17,7 @@ from trustadapter.trustadapter import (
     TestResultRequestImmediately_IE,
     TrustAdapter
 )
+from trustadapter.patientcache import patient_cache
 from common import (
     MutationUserErrorHandler,
     PatientPayload
@@ -59,6 +61,8 @@ async def CreatePatient(
     :return: PatientPayload object
 
     :raise TypeError: invalid parameter types, object is incorrect type
+    :raise TrustIntegrationCommunicationError: trust integration engine
+        unavailable
     """
 
     if context is None:
@@ -76,9 +80,7 @@ async def CreatePatient(
     if date_of_birth is None:
         raise TypeError("date_of_birth cannot be None type")
 
-    await trust_adapter.test_connection(
-        auth_token=context['request'].cookies['SDSESSION']
-    )
+    trust_adapter.raise_if_unavailable()
 
     # pull session cookie, used to auth w/ trust adapter
     auth_token = context['request'].cookies['SDSESSION']
@@ -224,18 +226,22 @@ async def CreatePatient(
         **on_pathway_details
     )
 
-    for clinical_request in clinical_requests:
-        test_result: TestResult_IE = await trust_adapter\
-            .create_test_result_immediately(
+    # every test result is created in one call
+    test_results: List[TestResult_IE] = await trust_adapter\
+        .create_many_test_results(
+            [
                 TestResultRequestImmediately_IE(
                     type_id=clinical_request["clinicalRequestTypeId"],
                     current_state=clinical_request["currentState"],
                     hospital_number=hospital_number,
                     pathway_name=pathway.name
-                ),
-                auth_token=auth_token
-            )
+                )
+                for clinical_request in clinical_requests
+            ],
+            auth_token=auth_token
+        )
 
+    for clinical_request, test_result in zip(clinical_requests, test_results):
         await ClinicalRequest.create(
             on_pathway_id=int(pathwayInstance.id),
             current_state=clinical_request["currentState"],
@@ -244,6 +250,7 @@ async def CreatePatient(
             test_result_reference_id=str(test_result.id)
         )
 
-    return_patient = pt_trust_adapter
-    return_patient.id = pt_local.id
-    return PatientPayload(patient=return_patient)
+    patient_cache.set(pt_trust_adapter)
+    return PatientPayload(
+        patient=PatientReadModel.merge(pt_local, pt_trust_adapter)
+    )
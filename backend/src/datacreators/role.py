@@ -1,4 +1,5 @@
 from models import Role
+from referencedata import reference_data
 
 
 async def create_role(name: str):
@@ -15,4 +16,6 @@ async def create_role(name: str):
     if name is None:
         raise TypeError("Argument name cannot be None type")
 
-    return await Role.create(name=name)
+    role: Role = await Role.create(name=name)
+    reference_data.invalidate()
+    return role
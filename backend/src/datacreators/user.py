@@ -1,5 +1,5 @@
 from models import User
-from bcrypt import hashpw, gensalt
+from authentication.passwords import password_hasher
 from common import SafeUser
 
 
@@ -43,8 +43,7 @@ async def CreateUser(
     if is_active is None:
         raise TypeError("parameters is_active cannot be None type")
 
-    hashed_password = hashpw(password.encode('utf-8'), gensalt())
-    hashed_password = hashed_password.decode('utf-8')
+    hashed_password = await password_hasher.hash_password(password)
 
     user: User = await User.create(
         username=username.lower(),
@@ -1,14 +1,17 @@
 from .patient import (
     PatientByIdLoader,
     PatientByHospitalNumberLoader,
-    PatientByHospitalNumberFromIELoader
+    PatientByHospitalNumberFromIELoader,
+    PatientsByMdtLoader,
+    PatientReadModel
 )
 from .pathway import (
     PathwayByIdLoader,
     PathwayByNameLoader,
-    PathwayLoaderByClinicalRequestType
+    PathwayLoaderByClinicalRequestType,
+    PathwaysByUserLoader
 )
-from .user import UserByIdLoader, UserByUsernameLoader
+from .user import UserByIdLoader, UserByUsernameLoader, UsersByMdtLoader
 from .decision_point import (
     DecisionPointLoader,
     DecisionPointsByPatient,
@@ -19,6 +22,8 @@ from .clinical_request import (
     ClinicalRequestByDecisionPointLoader,
     ClinicalRequestByOnPathwayIdLoader,
     ClinicalRequestByIdLoader,
+    ClinicalRequestsByDecisionPointIdLoader,
+    ClinicalRequestsByForwardDecisionPointIdLoader,
 )
 from .clinical_request_type import (
     ClinicalRequestTypeLoader,
@@ -26,4 +31,5 @@ from .clinical_request_type import (
 )
 from .test_result import TestResultByReferenceIdFromIELoader
 from .mdt import MdtByIdLoader
-from .on_mdt import OnMdtByIdLoader
+from .on_mdt import OnMdtByIdLoader, OnMdtsByPatientLoader
+from .role import RolesByUserLoader
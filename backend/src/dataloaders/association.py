@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+from sqlalchemy import and_
+from sqlalchemy.sql import ColumnElement
+from models.db import db
+from .base import SdDataLoader
+from .grouped import group_by_id
+
+_PARENT_ID = "_association_parent_id"
+
+
+class AssociationLoader(SdDataLoader):
+    """
+        Base class for loading the records linked to parents through a
+        link table, such as the users on an MDT through UserMDT. Keys
+        are parent IDs, and all parents in a batch are loaded with one
+        join. Subclasses are made by `make_association_loader`.
+
+        Results are not cached between loads, as mutations change these
+        lists during a request
+    """
+
+    cache = False
+    _parent_column: ColumnElement = None
+    _child_model: Any = None
+    _child_column: Optional[ColumnElement] = None
+    _by_id_loader: Any = None
+    _order_by: Sequence[ColumnElement] = None
+
+    async def batch_load_fn(self, keys: List[int]) -> List[List[Any]]:
+        ids = list(set(int(k) for k in keys))
+        conditions = [self._parent_column.in_(ids)]
+        if self._child_column is not None:
+            conditions.append(self._child_column == self._child_model.id)
+
+        query = db.select(
+            [self._child_model, self._parent_column.label(_PARENT_ID)]
+        ).where(
+            and_(*conditions)
+        ).order_by(
+            *self._order_by
+        ).execution_options(
+            loader=self._child_model.load(
+                **{_PARENT_ID: self._parent_column.label(_PARENT_ID)}
+            )
+        )
+        async with self._db.acquire(reuse=False) as conn:
+            records: List[Any] = await conn.all(query)
+
+        grouped = group_by_id(records, ids, _PARENT_ID)
+        return [grouped[int(k)] for k in keys]
+
+    @classmethod
+    async def load_from_id(
+        cls, context=None, id: int = None
+    ) -> List[Any]:
+        """
+            Load the records linked to a parent, priming the child's
+            by-ID loader with them
+
+            :param context: request context
+            :param id: ID of the parent
+
+            :return: List of linked records
+
+            :raise TypeError: invalid argument type
+        """
+
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if id is None:
+            return []
+
+        records: List[Any] = await cls._get_loader_from_context(
+            cls.loader_name, context).load(id)
+
+        if cls._by_id_loader is not None:
+            for record in records:
+                cls._by_id_loader.prime(
+                    key=record.id, value=record, context=context
+                )
+        return records
+
+
+def make_association_loader(
+    loader_name: str = None, parent_column: ColumnElement = None,
+    child_model: Any = None, child_column: ColumnElement = None,
+    by_id_loader: Any = None, order_by: Sequence[ColumnElement] = None
+) -> Type[AssociationLoader]:
+    """
+    Makes a loader for the records linked to parents through a link
+    table
+
+    :param loader_name: unique name of loader to cache data under
+    :param parent_column: link table column holding the parent's ID
+    :param child_model: model of the records to load
+    :param child_column: link table column holding the child's ID, or
+        None when the link records themselves are loaded
+    :param by_id_loader: loader primed with the loaded records, which
+        must have a `prime` classmethod taking a context
+    :param order_by: order of records for each parent, by the child's
+        ID if not given
+
+    :return: AssociationLoader subclass
+    """
+    attributes: Dict[str, Any] = {
+        "loader_name": loader_name,
+        "_parent_column": parent_column,
+        "_child_model": child_model,
+        "_child_column": child_column,
+        "_by_id_loader": by_id_loader,
+        "_order_by": order_by or [child_model.id],
+    }
+    name = "".join(part.title() for part in loader_name.split("_"))
+    return type(name, (AssociationLoader,), attributes)
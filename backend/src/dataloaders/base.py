@@ -0,0 +1,119 @@
+from typing import Any, Dict, Hashable, List, Optional
+from aiodataloader import DataLoader
+
+
+class SdDataLoader(DataLoader):
+
+    def __init__(self, db, loader_name):
+        super().__init__()
+        self._db = db
+        self._loader_name = loader_name
+        self._prefetched: Dict[Hashable, Any] = {}
+
+    def prime_prefetched(self, key: Hashable, value: Any) -> "SdDataLoader":
+        """
+            Stores a value loaded ahead of the resolver needing it. Loads
+            of the key return it instead of loading it, even without a
+            cache, so fields selected more than once under aliases share
+            it. Values are only prefetched by queries, so no mutation
+            changes them during the request
+
+            :param key: key the value will be loaded by
+            :param value: value to return
+
+            :return: SdDataLoader
+        """
+        self._prefetched[key] = value
+        return self
+
+    @classmethod
+    def prime_prefetched_with_context(
+        cls, context: dict = None, key: Hashable = None, value: Any = None
+    ) -> "SdDataLoader":
+        """
+            Stores a value loaded ahead of the resolver needing it in the
+            request's loader
+
+            :param context: request context
+            :param key: key the value will be loaded by
+            :param value: value to return
+
+            :return: SdDataLoader
+
+            :raise TypeError: invalid argument type
+        """
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        return cls._get_loader_from_context(
+            cls.loader_name, context).prime_prefetched(key, value)
+
+    def load(self, key=None):
+        if key is not None and key in self._prefetched:
+            future = self.loop.create_future()
+            future.set_result(self._prefetched[key])
+            return future
+        return super().load(key)
+
+    @classmethod
+    def _get_loader_from_context(
+        cls, loader_name: str, context: dict
+    ) -> "SdDataLoader":
+        if loader_name not in context:
+            context[loader_name] = cls(
+                db=context['db'], loader_name=loader_name
+            )
+        return context[loader_name]
+
+    @classmethod
+    async def _load_from_id(
+        cls, loader_name: str = None,
+        context: dict = None, id: Any = None
+    ) -> Optional[Any]:
+        """
+            Load a single entry from its ID
+
+            :param id: Any hashable value
+            :param context: request context dictionary
+            :param loader_name: name of loader
+            :returns Any
+
+            :raise TypeError: invalid argument type
+        """
+        if loader_name is None:
+            raise TypeError("loader_name cannot be None type")
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if id is None:
+            return None
+
+        return await cls._get_loader_from_context(
+            loader_name, context).load(id)
+
+    @classmethod
+    async def _load_many_from_id(
+        cls, loader_name: str = None,
+        context: dict = None, ids: Any = None
+    ) -> List:
+        """
+            Loads multiple entries from their IDs
+
+            :param loader_name: Name of loader
+            :param context: request context
+            :param ids: IDs to find
+
+            :return: List of items found
+
+            :raise TypeError: invalid argument type
+        """
+        if loader_name is None:
+            raise TypeError("loader_name cannot be None type")
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if ids is None:
+            return []
+
+        return await cls._get_loader_from_context(
+            loader_name, context).load_many(ids)
@@ -1,12 +1,13 @@
-import asyncio
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional
 from aiodataloader import DataLoader
-from operator import and_
-from sqlalchemy import desc
+from sqlalchemy import and_, desc
+from sqlalchemy.sql import Select
 from SdTypes import ClinicalRequestState
 from models import ClinicalRequest
 from typing import Union
+from .base import SdDataLoader
+from .grouped import GroupedDataLoader, group_by_id, in_first_per_group
 
 
 class ClinicalRequestByDecisionPointLoader(DataLoader):
@@ -124,124 +125,87 @@ class ClinicalRequestByDecisionPointLoader(DataLoader):
         return cls._get_loader_from_context(context).prime(id, value)
 
 
-class SdDataLoader(DataLoader):
-
-    def __init__(self, db, loader_name):
-        super().__init__()
-        self._db = db
-        self._loader_name = loader_name
+class ClinicalRequestByOnPathwayIdLoader(GroupedDataLoader):
+    """
+        This is class for loading clinical_requests by their OnPathway,
+        with one query for each combination of filters
+    """
+    loader_name = "_clinical_request_by_on_pathway_loader"
 
-    @classmethod
-    def _get_loader_from_context(
-        cls, loader_name: str, context: dict
-    ) -> "SdDataLoader":
-        if loader_name not in context:
-            context[loader_name] = cls(
-                db=context['db'], loader_name=loader_name
-            )
-        return context[loader_name]
+    @dataclass(frozen=True, eq=True)
+    class ClinicalRequestByOnPathwayKey:
+        id: Optional[int]
+        outstanding: bool
+        limit: Optional[int]
 
     @classmethod
-    async def _load_from_id(
-        cls, loader_name: str = None,
-        context: dict = None, id: Any = None
-    ) -> Optional[Any]:
+    def make_key(
+        cls, id=None, outstanding=False, limit=None
+    ) -> ClinicalRequestByOnPathwayKey:
         """
-            Load a single entry from its ID
+            Makes the key the clinical requests of an OnPathway are
+            loaded by
 
-            :param id: Any hashable value
-            :param context: request context dictionary
-            :param loader_name: name of loader
-            :returns Any
+            :param id: ID of the OnPathway
+            :param outstanding: filter to outstanding clinical requests
+            :param limit: number of records to return
 
-            :raise TypeError: invalid argument type
+            :return: ClinicalRequestByOnPathwayKey
         """
-        if loader_name is None:
-            raise TypeError("loader_name cannot be None type")
-        if context is None:
-            raise TypeError("context cannot be None type")
-
-        if id is None:
-            return None
-
-        return await cls._get_loader_from_context(
-            loader_name, context).load(id)
+        return cls.ClinicalRequestByOnPathwayKey(
+            id=int(id) if id is not None else None,
+            outstanding=bool(outstanding),
+            limit=int(limit) if limit is not None else None
+        )
 
-    @classmethod
-    async def _load_many_from_id(
-        cls, loader_name: str = None,
-        context: dict = None, ids: Any = None
-    ) -> List:
+    @staticmethod
+    def query_group(
+        filters: ClinicalRequestByOnPathwayKey,
+        ids: Union[List[int], Select]
+    ) -> Select:
         """
-            Loads multiple entries from their IDs
-
-            :param loader_name: Name of loader
-            :param context: request context
-            :param ids: IDs to find
+            Builds the query for the clinical requests of many OnPathway
+            records sharing the same filters
 
-            :return: List of items found
+            :param filters: key with its ID set to None
+            :param ids: IDs of the OnPathway records, or a query
+                selecting them
 
-            :raise TypeError: invalid argument type
+            :return: query
         """
-        if loader_name is None:
-            raise TypeError("loader_name cannot be None type")
-        if context is None:
-            raise TypeError("context cannot be None type")
-
-        if ids is None:
-            return []
-
-        return await cls._get_loader_from_context(
-            loader_name, context).load_many(ids)
-
-
-class ClinicalRequestByOnPathwayIdLoader(SdDataLoader):
-    """
-        This is class for loading clinical_requests and
-        caching the result in the request context
-    """
-    loader_name = "_clinical_request_by_on_pathway_loader"
-
-    @dataclass(frozen=True, eq=True)
-    class ClinicalRequestByOnPathwayKey:
-        id: int
-        outstanding: bool
-        limit: int
-
-    async def fetch(
-        self, key: ClinicalRequestByOnPathwayKey
-    ) -> Dict[ClinicalRequestByOnPathwayKey, List[ClinicalRequest]]:
-
+        conditions = [ClinicalRequest.on_pathway_id.in_(ids)]
+        if filters.outstanding:
+            conditions.append(and_(
+                ClinicalRequest.fwd_decision_point_id.is_(None),
+                ClinicalRequest.current_state ==
+                ClinicalRequestState.COMPLETED
+            ))
+        # lists are the most recently updated first, unless the limit is
+        # 0, when they are in the order they were added
+        order_by = [ClinicalRequest.id]
+        if filters.limit != 0:
+            order_by = [
+                desc(ClinicalRequest.updated_at), desc(ClinicalRequest.id)
+            ]
+        if filters.limit:
+            conditions.append(in_first_per_group(
+                ClinicalRequest, and_(*conditions),
+                partition_by=ClinicalRequest.on_pathway_id,
+                order_by=order_by,
+                limit=filters.limit
+            ))
+
+        return ClinicalRequest.query.where(
+            and_(*conditions)
+        ).order_by(*order_by)
+
+    async def fetch_group(
+        self, filters: ClinicalRequestByOnPathwayKey, ids: List[int]
+    ) -> Dict[int, List[ClinicalRequest]]:
+        query = self.query_group(filters, ids)
         async with self._db.acquire(reuse=False) as conn:
-            query = ClinicalRequest.query.where(
-                ClinicalRequest.on_pathway_id == key.id)
-
-            if key.outstanding:
-                query = query.where(and_(
-                    ClinicalRequest.fwd_decision_point_id.is_(None),
-                    ClinicalRequest.current_state ==
-                    ClinicalRequestState.COMPLETED
-                ))
-            if key.limit != 0:
-                query = query.order_by(
-                    desc(ClinicalRequest.updated_at)).limit(key.limit)
-            return await conn.all(query)
-
-    async def batch_load_fn(
-        self, keys: List[ClinicalRequestByOnPathwayKey]
-    ) -> List[List[ClinicalRequest]]:
-        # So this currently queries in a loop, which is very bad.
-        # However, this could be batched into two loads - those
-        # outstanding, and those not, and then filtering.
-        # In case of a limit flag, those might be the greatest-N per
-        # group problem? So there could be a solution involving grouping
-        # and limiting by ID.
-
-        results = await asyncio.gather(*[self.fetch(k) for k in keys])
-        return list(map(
-            lambda r: r if not isinstance(r, Exception) else None,
-            results
-        ))
+            clinical_requests: List[ClinicalRequest] = await conn.all(query)
+        return group_by_id(clinical_requests, ids, "on_pathway_id")
 
     @classmethod
     async def load_from_id(
@@ -265,9 +229,7 @@ class ClinicalRequestByOnPathwayIdLoader(SdDataLoader):
         if id is None:
             return []
 
-        key = cls.ClinicalRequestByOnPathwayKey(
-            id=id, outstanding=outstanding, limit=limit
-        )
+        key = cls.make_key(id=id, outstanding=outstanding, limit=limit)
         return await cls._get_loader_from_context(
             cls.loader_name, context).load(key)
 
@@ -324,3 +286,118 @@ class ClinicalRequestByIdLoader(SdDataLoader):
 
         return await cls._get_loader_from_context(
             cls.loader_name, context).load(id)
+
+
+class _ClinicalRequestsByDecisionPointColumnLoader(SdDataLoader):
+    """
+        Base class for loading the clinical requests linked to decision
+        points through one of the clinical request's columns. Results
+        are not cached between loads, as mutations change these lists
+        during a request
+    """
+
+    cache = False
+    _column_name: str = None
+    _order_by = None
+
+    @classmethod
+    def query_many(cls, ids: Union[List[int], Select]) -> Select:
+        """
+            Builds the query for the clinical requests of many decision
+            points
+
+            :param ids: IDs of the decision points, or a query selecting
+                them
+
+            :return: query
+        """
+        column = getattr(ClinicalRequest, cls._column_name)
+        return ClinicalRequest.query.where(
+            column.in_(ids)
+        ).order_by(*cls._order_by)
+
+    @classmethod
+    def group_many(
+        cls, clinical_requests: List[ClinicalRequest], ids: List[int]
+    ) -> Dict[int, List[ClinicalRequest]]:
+        """
+            Groups clinical requests by their decision point
+
+            :param clinical_requests: clinical requests to group
+            :param ids: IDs of the decision points
+
+            :return: Dict of decision point ID to list of clinical requests
+        """
+        return group_by_id(clinical_requests, ids, cls._column_name)
+
+    async def batch_load_fn(
+        self, keys: List[int]
+    ) -> List[List[ClinicalRequest]]:
+        ids = list(set(int(k) for k in keys))
+        async with self._db.acquire(reuse=False) as conn:
+            clinical_requests: List[ClinicalRequest] = await conn.all(
+                self.query_many(ids)
+            )
+
+        grouped = self.group_many(clinical_requests, ids)
+        return [grouped[int(k)] for k in keys]
+
+    @classmethod
+    async def load_from_id(
+        cls, context=None, id: int = None
+    ) -> List[ClinicalRequest]:
+        """
+            Load the clinical requests of a decision point
+
+            :param context: request context
+            :param id: ID of the decision point
+
+            :return: List[ClinicalRequest]
+
+            :raise TypeError: invalid argument type
+        """
+
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if id is None:
+            return []
+
+        clinical_requests: List[ClinicalRequest] = \
+            await cls._get_loader_from_context(
+                cls.loader_name, context).load(id)
+
+        by_id_loader = ClinicalRequestByIdLoader._get_loader_from_context(
+            ClinicalRequestByIdLoader.loader_name, context
+        )
+        for clinical_request in clinical_requests:
+            by_id_loader.prime(clinical_request.id, clinical_request)
+        return clinical_requests
+
+
+class ClinicalRequestsByDecisionPointIdLoader(
+    _ClinicalRequestsByDecisionPointColumnLoader
+):
+    """
+        This is class for loading the clinical requests made at
+        decision points, newest first
+    """
+
+    loader_name = "_clinical_requests_by_decision_point_id_loader"
+    _column_name = "decision_point_id"
+    _order_by = [
+        desc(ClinicalRequest.added_at), desc(ClinicalRequest.id)
+    ]
+
+
+class ClinicalRequestsByForwardDecisionPointIdLoader(
+    _ClinicalRequestsByDecisionPointColumnLoader
+):
+    """
+        This is class for loading the clinical requests resolved at
+        decision points, newest first
+    """
+
+    loader_name = "_clinical_requests_by_forward_decision_point_id_loader"
+    _column_name = "fwd_decision_point_id"
+    _order_by = [desc(ClinicalRequest.id)]
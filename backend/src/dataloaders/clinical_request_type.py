@@ -1,6 +1,7 @@
 from typing import List, Dict, Optional, Union
 from aiodataloader import DataLoader
-from models import ClinicalRequestType, PathwayClinicalRequestType
+from models import ClinicalRequestType
+from referencedata import reference_data
 
 
 class ClinicalRequestTypeLoader(DataLoader):
@@ -26,16 +27,24 @@ class ClinicalRequestTypeLoader(DataLoader):
         return context[cls.loader_name]
 
     async def fetch(self, keys) -> Dict[int, ClinicalRequestType]:
-        async with self._db.acquire(reuse=False) as conn:
-            query = ClinicalRequestType.query.where(
-                ClinicalRequestType.id.in_(keys))
-            result: List[ClinicalRequestType] = await conn.all(query)
-
-            returnData = {}
+        clinical_request_types = \
+            (await reference_data.get()).clinical_request_types
+        returnData = {}
+        for key in keys:
+            if key in clinical_request_types:
+                returnData[key] = clinical_request_types[key]
+
+        # not cached yet if created outside of this process
+        missing = [key for key in keys if key not in returnData]
+        if missing:
+            async with self._db.acquire(reuse=False) as conn:
+                query = ClinicalRequestType.query.where(
+                    ClinicalRequestType.id.in_(missing))
+                result: List[ClinicalRequestType] = await conn.all(query)
             for clinical_request in result:
                 returnData[clinical_request.id] = clinical_request
 
-            return returnData
+        return returnData
 
     async def batch_load_fn(self, keys) -> List[ClinicalRequestType]:
         fetchDict = await self.fetch([int(i) for i in keys])
@@ -103,8 +112,9 @@ class ClinicalRequestTypeLoader(DataLoader):
         if context is None:
             raise TypeError("context cannot be None type")
 
-        clinical_request_types: List[ClinicalRequestType] = \
-            await ClinicalRequestType.query.gino.all()
+        clinical_request_types: List[ClinicalRequestType] = list(
+            (await reference_data.get()).clinical_request_types.values()
+        )
         for t in clinical_request_types:
             cls._get_loader_from_context(context).prime(t.id, t)
         return clinical_request_types
@@ -143,27 +153,16 @@ class ClinicalRequestTypeLoaderByPathwayId(DataLoader):
         if id is None:
             return []
 
-        _gino = context['db']
-
-        async with _gino.acquire(reuse=False) as conn:
-            query = _gino.select([ClinicalRequestType])\
-                .select_from(
-                    _gino.join(
-                        ClinicalRequestType,
-                        PathwayClinicalRequestType,
-                        ClinicalRequestType.id == PathwayClinicalRequestType.
-                        clinical_request_type_id
-                    )
-                )\
-                .where(PathwayClinicalRequestType.pathway_id == int(id))
-
-            result: List[ClinicalRequestType] = await conn.all(query)
-
-            if ClinicalRequestTypeLoader.loader_name not in context:
-                context[ClinicalRequestTypeLoader.loader_name] = \
-                    ClinicalRequestTypeLoader(db=context['db'])
-            for clinical_request_Type in result:
-                context[ClinicalRequestTypeLoader.loader_name].prime(
-                    clinical_request_Type.id, clinical_request_Type)
-
-            return result
+        reference = await reference_data.get()
+        result: List[ClinicalRequestType] = list(
+            reference.clinical_request_types_by_pathway.get(int(id), [])
+        )
+
+        if ClinicalRequestTypeLoader.loader_name not in context:
+            context[ClinicalRequestTypeLoader.loader_name] = \
+                ClinicalRequestTypeLoader(db=context['db'])
+        for clinical_request_Type in result:
+            context[ClinicalRequestTypeLoader.loader_name].prime(
+                clinical_request_Type.id, clinical_request_Type)
+
+        return result
@@ -1,7 +1,12 @@
 from aiodataloader import DataLoader
+from dataclasses import dataclass
+from sqlalchemy import and_
+from sqlalchemy.sql import Select
 from SdTypes import DecisionTypes
-from models import DecisionPoint
-from typing import List, Union
+from models import DecisionPoint, OnPathway
+from models.db import db
+from typing import Dict, List, Optional, Union
+from .grouped import GroupedDataLoader, group_by_id, in_first_per_group
 
 
 class DecisionPointLoader(DataLoader):
@@ -92,18 +97,75 @@ class DecisionPointLoader(DataLoader):
         return await context[cls.loader_name].load_many(ids)
 
 
-class DecisionPointsByPatient:
+def _prime_decision_points(
+    context=None, decisionPoints: List[DecisionPoint] = None
+):
+    if DecisionPointLoader.loader_name not in context:
+        context[DecisionPointLoader.loader_name] = DecisionPointLoader(
+            db=context['db']
+        )
+    for dP in decisionPoints:
+        context[DecisionPointLoader.loader_name].prime(dP.id, dP)
+
+
+_DECISION_POINT_ORDER = [
+    DecisionPoint.added_at.desc(), DecisionPoint.id.desc()
+]
+
+
+class DecisionPointsByPatient(GroupedDataLoader):
     """
         This is class for loading decision points using
         a patient's ID
 
         Attributes:
-            None
+            loader_name (str): unique name of loader to cache data under
     """
 
-    @staticmethod
+    loader_name = "_decision_points_by_patient_loader"
+
+    @dataclass(frozen=True, eq=True)
+    class DecisionPointsByPatientKey:
+        id: Optional[int]
+        pathwayId: Optional[int]
+        decisionType: Optional[DecisionTypes]
+        limit: Optional[int]
+
+    async def fetch_group(
+        self, filters: DecisionPointsByPatientKey, ids: List[int]
+    ) -> Dict[int, List[DecisionPoint]]:
+        conditions = [
+            DecisionPoint.on_pathway_id == OnPathway.id,
+            OnPathway.patient_id.in_(ids)
+        ]
+        if filters.pathwayId is not None:
+            conditions.append(OnPathway.pathway_id == filters.pathwayId)
+        if filters.decisionType:
+            conditions.append(
+                DecisionPoint.decision_type == filters.decisionType
+            )
+        if filters.limit is not None:
+            conditions.append(in_first_per_group(
+                DecisionPoint, and_(*conditions),
+                partition_by=OnPathway.patient_id,
+                order_by=_DECISION_POINT_ORDER,
+                limit=filters.limit
+            ))
+
+        query = db.select([DecisionPoint, OnPathway.patient_id]).where(
+            and_(*conditions)
+        ).order_by(
+            *_DECISION_POINT_ORDER
+        ).execution_options(
+            loader=DecisionPoint.load(patient_id=OnPathway.patient_id)
+        )
+        async with self._db.acquire(reuse=False) as conn:
+            decisionPoints: List[DecisionPoint] = await conn.all(query)
+        return group_by_id(decisionPoints, ids, "patient_id")
+
+    @classmethod
     async def load_from_id(
-        context=None, id: int = None, pathwayId: int = None,
+        cls, context=None, id: int = None, pathwayId: int = None,
         decisionType: DecisionTypes = None, limit: Union[int, None] = None
     ) -> Union[List[DecisionPoint], None]:
         """
@@ -127,54 +189,108 @@ class DecisionPointsByPatient:
         if not id:
             return None
 
-        query = DecisionPoint.query.where(
-            DecisionPoint.patient == id
-        ).order_by(DecisionPoint.added_at.desc())
-
-        if pathwayId is not None:
-            query = query.where(
-                DecisionPoint.pathway == int(pathwayId)
-            )
-
-        if decisionType:
-            query = query.where(
-                DecisionPoint.decision_type == decisionType
-            )
-
-        if limit is not None:
-            query = query.limit(int(limit))
-
-        _gino = context['db']
-        async with _gino.acquire(reuse=False) as conn:
-            decisionPoints: List[DecisionPoint] = await conn.all(query)
-        if DecisionPointLoader.loader_name not in context:
-            context[DecisionPointLoader.loader_name] = DecisionPointLoader(
-                db=context['db']
-            )
-        for dP in decisionPoints:
-            context[DecisionPointLoader.loader_name].prime(dP.id, dP)
+        key = cls.DecisionPointsByPatientKey(
+            id=int(id),
+            pathwayId=int(pathwayId) if pathwayId is not None else None,
+            decisionType=decisionType,
+            limit=int(limit) if limit is not None else None
+        )
+        decisionPoints: List[DecisionPoint] = \
+            await cls._get_loader_from_context(
+                cls.loader_name, context).load(key)
+        _prime_decision_points(context, decisionPoints)
         return decisionPoints
 
 
-class DecisionPointsByOnPathway:
+class DecisionPointsByOnPathway(GroupedDataLoader):
     """
         This is class for loading decision points using
         an OnPathway id
 
         Attributes:
-            None
+            loader_name (str): unique name of loader to cache data under
     """
 
+    loader_name = "_decision_points_by_on_pathway_loader"
+
+    @dataclass(frozen=True, eq=True)
+    class DecisionPointsByOnPathwayKey:
+        id: Optional[int]
+        decisionType: Optional[DecisionTypes]
+        limit: Optional[int]
+
+    @classmethod
+    def make_key(
+        cls, id=None, decisionType: DecisionTypes = None,
+        limit: Union[int, None] = None
+    ) -> DecisionPointsByOnPathwayKey:
+        """
+            Makes the key the decision points of an OnPathway are loaded by
+
+            :param id: ID of OnPathway record
+            :param decisionType: decision type to filter by
+            :param limit: number of records to return
+
+            :return: DecisionPointsByOnPathwayKey
+        """
+        return cls.DecisionPointsByOnPathwayKey(
+            id=int(id) if id is not None else None,
+            decisionType=decisionType,
+            limit=int(limit) if limit is not None else None
+        )
+
     @staticmethod
+    def query_group(
+        filters: DecisionPointsByOnPathwayKey,
+        ids: Union[List[int], Select]
+    ) -> Select:
+        """
+            Builds the query for the decision points of many OnPathway
+            records sharing the same filters
+
+            :param filters: key with its ID set to None
+            :param ids: IDs of the OnPathway records, or a query selecting
+                them
+
+            :return: query
+        """
+        conditions = [DecisionPoint.on_pathway_id.in_(ids)]
+        if filters.decisionType:
+            conditions.append(
+                DecisionPoint.decision_type == filters.decisionType
+            )
+        if filters.limit is not None:
+            conditions.append(in_first_per_group(
+                DecisionPoint, and_(*conditions),
+                partition_by=DecisionPoint.on_pathway_id,
+                order_by=_DECISION_POINT_ORDER,
+                limit=filters.limit
+            ))
+
+        return DecisionPoint.query.where(
+            and_(*conditions)
+        ).order_by(*_DECISION_POINT_ORDER)
+
+    async def fetch_group(
+        self, filters: DecisionPointsByOnPathwayKey, ids: List[int]
+    ) -> Dict[int, List[DecisionPoint]]:
+        query = self.query_group(filters, ids)
+        async with self._db.acquire(reuse=False) as conn:
+            decisionPoints: List[DecisionPoint] = await conn.all(query)
+        return group_by_id(decisionPoints, ids, "on_pathway_id")
+
+    @classmethod
     async def load_many_from_id(
-        context=None,
-        id=None
+        cls, context=None, id=None,
+        decisionType: DecisionTypes = None, limit: Union[int, None] = None
     ) -> Union[List[DecisionPoint], None]:
         """
             Load all decision points by an OnPathway id
 
             :param context: request context
-            :param id: IDs of OnPathway records
+            :param id: ID of OnPathway record
+            :param decisionType: decision type to filter by
+            :param limit: number of records to return
 
             :return: List[DecisionPoint]
 
@@ -187,17 +303,9 @@ class DecisionPointsByOnPathway:
         if not id:
             return None
 
-        query = DecisionPoint.query.where(
-            DecisionPoint.on_pathway_id == id
-        ).order_by(DecisionPoint.added_at.desc())
-
-        _gino = context['db']
-        async with _gino.acquire(reuse=False) as conn:
-            decisionPoints: List[DecisionPoint] = await conn.all(query)
-        if DecisionPointLoader.loader_name not in context:
-            context[DecisionPointLoader.loader_name] = DecisionPointLoader(
-                db=context['db']
-            )
-        for dP in decisionPoints:
-            context[DecisionPointLoader.loader_name].prime(dP.id, dP)
+        key = cls.make_key(id=id, decisionType=decisionType, limit=limit)
+        decisionPoints: List[DecisionPoint] = \
+            await cls._get_loader_from_context(
+                cls.loader_name, context).load(key)
+        _prime_decision_points(context, decisionPoints)
         return decisionPoints
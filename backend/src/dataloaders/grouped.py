@@ -0,0 +1,96 @@
+import asyncio
+import dataclasses
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Sequence
+from sqlalchemy import func
+from sqlalchemy.sql import ClauseElement, ColumnElement
+from models.db import db
+from .base import SdDataLoader
+
+
+def in_first_per_group(
+    model: Any = None, where: ClauseElement = None,
+    partition_by: ColumnElement = None,
+    order_by: Sequence[ColumnElement] = None, limit: int = None
+) -> ClauseElement:
+    """
+    Builds a condition matching the first `limit` records of each group,
+    ranking records within their group with ROW_NUMBER()
+
+    :param model: model being queried, must have an `id` column
+    :param where: filter applied before ranking
+    :param partition_by: column records are grouped by
+    :param order_by: order of records within each group
+    :param limit: number of records to match per group
+
+    :return: condition on the model's ID
+    """
+    row_number = func.row_number().over(
+        partition_by=partition_by, order_by=order_by
+    ).label("row_number")
+    ranked = db.select([model.id, row_number]).where(where).alias("ranked")
+    return model.id.in_(
+        db.select([ranked.c.id]).where(ranked.c.row_number <= limit)
+    )
+
+
+class GroupedDataLoader(SdDataLoader, ABC):
+    """
+        Base class for loaders returning a list of records per key, where
+        keys are frozen dataclasses with an `id` field and filter fields.
+        Keys with the same filters are loaded together by `fetch_group`.
+
+        Results are not cached between loads, as mutations change these
+        lists during a request
+    """
+
+    cache = False
+
+    @abstractmethod
+    async def fetch_group(
+        self, filters: Hashable, ids: List[int]
+    ) -> Dict[int, List[Any]]:
+        """
+            Loads records for many IDs sharing the same filters
+
+            :param filters: key with its ID set to None
+            :param ids: IDs to find
+
+            :return: Dict of ID to list of records
+        """
+
+    async def batch_load_fn(self, keys: List[Any]) -> List[List[Any]]:
+        groups: Dict[Any, List[int]] = {}
+        for key in keys:
+            filters = dataclasses.replace(key, id=None)
+            groups.setdefault(filters, []).append(key.id)
+
+        results = await asyncio.gather(*[
+            self.fetch_group(filters, list(set(ids)))
+            for filters, ids in groups.items()
+        ])
+
+        records: Dict[Any, List[Any]] = {}
+        for filters, result in zip(groups.keys(), results):
+            for id in groups[filters]:
+                records[dataclasses.replace(filters, id=id)] = \
+                    result.get(id, [])
+        return [records[key] for key in keys]
+
+
+def group_by_id(
+    records: List[Any], ids: List[int], id_attribute: str
+) -> Dict[int, List[Any]]:
+    """
+    Groups records by one of their attributes, keeping their order
+
+    :param records: records to group
+    :param ids: IDs to return groups for
+    :param id_attribute: attribute to group by
+
+    :return: Dict of ID to list of records
+    """
+    grouped: Dict[int, List[Any]] = {id: [] for id in ids}
+    for record in records:
+        grouped[getattr(record, id_attribute)].append(record)
+    return grouped
@@ -1,6 +1,7 @@
 from aiodataloader import DataLoader
 from models import OnMdt
 from typing import List, Union
+from .association import make_association_loader
 
 
 class OnMdtByIdLoader(DataLoader):
@@ -111,3 +112,11 @@ class OnMdtByIdLoader(DataLoader):
         return super(OnMdtByIdLoader, context[cls.loader_name]).prime(
             key=key, value=value
         )
+
+
+OnMdtsByPatientLoader = make_association_loader(
+    loader_name="_on_mdts_by_patient_loader",
+    parent_column=OnMdt.patient_id,
+    child_model=OnMdt,
+    by_id_loader=OnMdtByIdLoader
+)
@@ -1,6 +1,11 @@
 from aiodataloader import DataLoader
+from dataclasses import dataclass
+from sqlalchemy import and_
+from sqlalchemy.sql import Select
+from SdTypes import DecisionTypes
 from models import OnPathway
-from typing import List, Union
+from typing import Dict, List, Optional, Union
+from .grouped import GroupedDataLoader, group_by_id, in_first_per_group
 
 
 class OnPathwayByIdLoader(DataLoader):
@@ -90,24 +95,103 @@ class OnPathwayByIdLoader(DataLoader):
         return await context[cls.loader_name].load_many(ids)
 
 
-class OnPathwaysByPatient:
+class OnPathwaysByPatient(GroupedDataLoader):
     """
         This is class for loading OnPathway records
         by their Patient ID
 
         Attributes:
-            None
+            loader_name (str): unique name of loader to cache data under
     """
+
+    loader_name = "_on_pathways_by_patient_loader"
+
+    @dataclass(frozen=True, eq=True)
+    class OnPathwaysByPatientKey:
+        id: Optional[int]
+        pathwayId: Optional[int]
+        includeDischarged: bool
+        awaitingDecisionType: Optional[DecisionTypes]
+        limit: Optional[int]
+
+    @classmethod
+    def make_key(
+        cls, id=None, pathwayId=None, includeDischarged=None,
+        awaitingDecisionType=None, limit=None
+    ) -> OnPathwaysByPatientKey:
+        """
+            Makes the key the OnPathway records of a patient are loaded by
+
+            :param id: ID of the patient
+            :param pathwayId: filter by OnPathway ID
+            :param includeDischarged: filter to include discharged patients
+            :param awaitingDecisionType: filter by awaiting_decision_types
+            :param limit: number of records to return
+
+            :return: OnPathwaysByPatientKey
+        """
+        return cls.OnPathwaysByPatientKey(
+            id=int(id) if id is not None else None,
+            pathwayId=int(pathwayId) if pathwayId is not None else None,
+            includeDischarged=bool(includeDischarged),
+            awaitingDecisionType=awaitingDecisionType,
+            limit=int(limit) if limit is not None else None
+        )
+
     @staticmethod
+    def query_group(
+        filters: OnPathwaysByPatientKey,
+        ids: Union[List[int], Select]
+    ) -> Select:
+        """
+            Builds the query for the OnPathway records of many patients
+            sharing the same filters
+
+            :param filters: key with its ID set to None
+            :param ids: IDs of the patients, or a query selecting them
+
+            :return: query
+        """
+        conditions = [OnPathway.patient_id.in_(ids)]
+        if filters.pathwayId is not None:
+            conditions.append(OnPathway.pathway_id == filters.pathwayId)
+        if not filters.includeDischarged:
+            conditions.append(OnPathway.is_discharged.is_(False))
+        if filters.awaitingDecisionType is not None:
+            conditions.append(
+                OnPathway.awaiting_decision_type ==
+                filters.awaitingDecisionType
+            )
+
+        if filters.limit is not None:
+            conditions = [in_first_per_group(
+                OnPathway, and_(*conditions),
+                partition_by=OnPathway.patient_id,
+                order_by=[OnPathway.id],
+                limit=filters.limit
+            )]
+        return OnPathway.query.where(
+            and_(*conditions)
+        ).order_by(OnPathway.id)
+
+    async def fetch_group(
+        self, filters: OnPathwaysByPatientKey, ids: List[int]
+    ) -> Dict[int, List[OnPathway]]:
+        query = self.query_group(filters, ids)
+        async with self._db.acquire(reuse=False) as conn:
+            onPathways: List[OnPathway] = await conn.all(query)
+        return group_by_id(onPathways, ids, "patient_id")
+
+    @classmethod
     async def load_from_id(
-        context=None, id=None, pathwayId=None, includeDischarged=None,
+        cls, context=None, id=None, pathwayId=None, includeDischarged=None,
         awaitingDecisionType=None, limit=None
     ) -> List[OnPathway]:
         """
             Loads OnPathway records by their Patient ID
 
             :param context: request context
-            :param ids: ID to find
+            :param id: ID to find
             :param pathwayId: filter by OnPathway ID
             :param includeDischarged: filter to include discharged patients
             :param awaitingDecisionType: filter by awaiting_decision_types
@@ -119,30 +203,20 @@ class OnPathwaysByPatient:
         """
 
         if context is None:
-            return TypeError("context cannot be None type")
+            raise TypeError("context cannot be None type")
 
         if id is None:
             return []
 
-        _gino = context['db']
-        query = OnPathway.query.where(
-            OnPathway.patient_id == int(id)
+        key = cls.make_key(
+            id=id,
+            pathwayId=pathwayId,
+            includeDischarged=includeDischarged,
+            awaitingDecisionType=awaitingDecisionType,
+            limit=limit
         )
-        if pathwayId is not None:
-            query = query.where(OnPathway.pathway_id == int(pathwayId))
-
-        if includeDischarged is None or includeDischarged is False:
-            query = query.where(OnPathway.is_discharged.is_(False))
-
-        if awaitingDecisionType is not None:
-            query = query.where(
-                OnPathway.awaiting_decision_type == awaitingDecisionType
-            )
-        if limit is not None:
-            query = query.limit(int(limit))
-
-        async with _gino.acquire(reuse=False) as conn:
-            onPathways: List[OnPathway] = await conn.all(query)
+        onPathways: List[OnPathway] = await cls._get_loader_from_context(
+            cls.loader_name, context).load(key)
 
         if OnPathwayByIdLoader.loader_name not in context:
             context[OnPathwayByIdLoader.loader_name] = OnPathwayByIdLoader(
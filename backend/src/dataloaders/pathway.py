@@ -1,6 +1,8 @@
 from aiodataloader import DataLoader
-from models import Pathway, PathwayClinicalRequestType
+from models import Pathway, UserPathway
 from typing import List, Union
+from referencedata import reference_data
+from .association import make_association_loader
 
 
 class PathwayByIdLoader(DataLoader):
@@ -19,15 +21,19 @@ class PathwayByIdLoader(DataLoader):
         self._db = db
 
     async def fetch(self, keys) -> List[Pathway]:
-        result = None
-        async with self._db.acquire(reuse=False) as conn:
-            query = Pathway.query.where(Pathway.id.in_(keys))
-            result: List[Pathway] = await conn.all(query)
+        pathways = (await reference_data.get()).pathways
         returnData = {}
         for key in keys:
-            returnData[key] = None
-        for row in result:
-            returnData[row.id] = row
+            returnData[key] = pathways.get(key)
+
+        # not cached yet if created outside of this process
+        missing = [key for key in keys if returnData[key] is None]
+        if missing:
+            async with self._db.acquire(reuse=False) as conn:
+                query = Pathway.query.where(Pathway.id.in_(missing))
+                result: List[Pathway] = await conn.all(query)
+            for row in result:
+                returnData[row.id] = row
 
         return returnData
 
@@ -97,6 +103,29 @@ class PathwayByIdLoader(DataLoader):
             context[cls.loader_name] = cls(db=context['db'])
         return await context[cls.loader_name].load_many(ids)
 
+    @classmethod
+    def prime(cls, key=None, value=None, context=None):
+        """
+            Primes the dataloader with new data using kvp
+
+            :param context: request context
+            :param key: ID of object
+            :param value: object
+
+            :raise TypeError:
+        """
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if key is None:
+            raise TypeError("key cannot be None type")
+
+        if cls.loader_name not in context:
+            context[cls.loader_name] = cls(db=context['db'])
+        return super(PathwayByIdLoader, context[cls.loader_name]).prime(
+            key=key, value=value
+        )
+
     @classmethod
     async def load_all(cls, context) -> Union[List[Pathway], None]:
         """
@@ -108,12 +137,7 @@ class PathwayByIdLoader(DataLoader):
         if context is None:
             raise TypeError("context cannot be None type")
 
-        db = context['db']
-        result = None
-        async with db.acquire(reuse=False) as conn:
-            result: List[Pathway] = await conn.all(Pathway.query)
-
-        return result
+        return list((await reference_data.get()).pathways.values())
 
 
 class PathwayByNameLoader(DataLoader):
@@ -134,15 +158,19 @@ class PathwayByNameLoader(DataLoader):
         self._db = db
 
     async def fetch(self, keys) -> List[Pathway]:
-        result = None
-        async with self._db.acquire(reuse=False) as conn:
-            query = Pathway.query.where(Pathway.name.in_(keys))
-            result: List[Pathway] = await conn.all(query)
+        pathways = (await reference_data.get()).pathways_by_name
         returnData = {}
         for key in keys:
-            returnData[key] = None
-        for row in result:
-            returnData[row.name] = row
+            returnData[key] = pathways.get(key)
+
+        # not cached yet if created outside of this process
+        missing = [key for key in keys if returnData[key] is None]
+        if missing:
+            async with self._db.acquire(reuse=False) as conn:
+                query = Pathway.query.where(Pathway.name.in_(missing))
+                result: List[Pathway] = await conn.all(query)
+            for row in result:
+                returnData[row.name] = row
 
         return returnData
 
@@ -177,11 +205,7 @@ class PathwayByNameLoader(DataLoader):
         pathway: Union[Pathway, None] = await context[cls.loader_name].load(id)
 
         if pathway is not None:
-            if PathwayByIdLoader.loader_name not in context:
-                context[PathwayByIdLoader.loader_name] = PathwayByIdLoader(
-                    db=context['db']
-                )
-            context[PathwayByIdLoader.loader_name].prime(pathway.id, pathway)
+            PathwayByIdLoader.prime(pathway.id, pathway, context=context)
 
         return pathway
 
@@ -244,29 +268,21 @@ class PathwayLoaderByClinicalRequestType(DataLoader):
         if id is None:
             return None
 
-        _gino = context['db']
-
-        async with _gino.acquire(reuse=False) as conn:
-            query = _gino.select([Pathway])\
-                .select_from(
-                    _gino.join(
-                        Pathway,
-                        PathwayClinicalRequestType,
-                        Pathway.id == PathwayClinicalRequestType.pathway_id
-                    )
-                )\
-                .where(
-                    PathwayClinicalRequestType.clinical_request_type_id ==
-                    int(id)
-                )
+        reference = await reference_data.get()
+        result: List[Pathway] = list(
+            reference.pathways_by_clinical_request_type.get(int(id), [])
+        )
 
-            result: List[Pathway] = await conn.all(query)
+        for pW in result:
+            PathwayByIdLoader.prime(pW.id, pW, context=context)
+
+        return result
 
-            if PathwayByIdLoader.loader_name not in context:
-                context[PathwayByIdLoader.loader_name] = PathwayByIdLoader(
-                    db=context['db']
-                )
-            for pW in result:
-                context[PathwayByIdLoader.loader_name].prime(pW.id, pW)
 
-            return result
+PathwaysByUserLoader = make_association_loader(
+    loader_name="_pathways_by_user_loader",
+    parent_column=UserPathway.user_id,
+    child_model=Pathway,
+    child_column=UserPathway.pathway_id,
+    by_id_loader=PathwayByIdLoader
+)
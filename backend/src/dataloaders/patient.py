@@ -1,10 +1,14 @@
 from aiodataloader import DataLoader
 from dependency_injector.wiring import Provide, inject
 from containers import SDContainer
-from models import Patient
+from models import Patient, OnMdt
+from dataclasses import dataclass, fields
 from datetime import date
 from typing import List, Union, Dict, Optional
 from trustadapter import TrustAdapter
+from trustadapter.trustadapter import Patient_IE
+from trustadapter.patientcache import patient_cache
+from .association import make_association_loader
 
 
 class PatientByIdLoader(DataLoader):
@@ -238,7 +242,8 @@ class PatientByHospitalNumberFromIELoader(DataLoader):
     """
         This is class for loading patients by their
         hospital numbers and caching the result in
-        the request context from the TrustAdapter
+        the request context from the TrustAdapter,
+        through the process-wide patient cache
 
         Attributes:
             loader_name (str): unique name of loader to cache data under
@@ -256,14 +261,11 @@ class PatientByHospitalNumberFromIELoader(DataLoader):
             SDContainer.trust_adapter_service
         ]
     ) -> Dict[str, ReferencePatient]:
-        result = await trust_adapter.load_many_patients(
-            hospitalNumbers=keys,
+        return await patient_cache.load_many(
+            hospital_numbers=keys,
+            trust_adapter=trust_adapter,
             auth_token=self._context['request'].cookies['SDSESSION']
         )
-        returnData = {}
-        for patient in result:
-            returnData[patient.hospital_number] = patient
-        return returnData
 
     async def batch_load_fn(self, keys) -> List[Patient]:
         patientDict = await self.fetch(keys)
@@ -351,3 +353,77 @@ class PatientByHospitalNumberFromIELoader(DataLoader):
         loader = cls._get_loader_from_context(context)
         return super(PatientByHospitalNumberFromIELoader, loader).prime(
             key=key, value=value)
+
+
+PatientsByMdtLoader = make_association_loader(
+    loader_name="_patients_by_mdt_loader",
+    parent_column=OnMdt.mdt_id,
+    child_model=Patient,
+    child_column=OnMdt.patient_id,
+    by_id_loader=PatientByIdLoader
+)
+
+
+@dataclass
+class PatientReadModel(Patient_IE):
+    """
+        A patient's record merged with their demographics from the
+        TrustAdapter, so the Patient type's fields are read as
+        attributes rather than each loading the demographics
+    """
+    id: int = None
+
+    @classmethod
+    def merge(
+        cls, patient: Patient = None, record: Optional[Patient_IE] = None
+    ) -> "PatientReadModel":
+        """
+            Merges a patient's record with their demographics
+
+            :param patient: patient's record
+            :param record: patient's demographics, None if not found
+
+            :return: PatientReadModel
+        """
+        read_model = cls()
+        if record is not None:
+            for field in fields(Patient_IE):
+                setattr(read_model, field.name, getattr(record, field.name))
+        read_model.id = patient.id
+        read_model.hospital_number = patient.hospital_number
+        read_model.national_number = patient.national_number
+        return read_model
+
+    @classmethod
+    async def load_many(
+        cls, context=None, patients: List[Optional[Patient]] = None
+    ) -> List[Optional["PatientReadModel"]]:
+        """
+            Loads the demographics of many patients in one batch
+
+            :param context: request context
+            :param patients: patients' records
+
+            :return: List[PatientReadModel/None]
+
+            :raise TypeError:
+        """
+
+        if context is None:
+            raise TypeError("context cannot be None type")
+
+        if patients is None:
+            return []
+
+        records = await PatientByHospitalNumberFromIELoader.load_many_from_id(
+            context=context,
+            ids=[p.hospital_number for p in patients if p is not None]
+        )
+        records_by_hospital_number = {
+            r.hospital_number: r for r in records if r is not None
+        }
+        return [
+            cls.merge(p, records_by_hospital_number.get(p.hospital_number))
+            if p is not None else None
+            for p in patients
+        ]
@@ -0,0 +1,9 @@
+from models import Role, UserRole
+from .association import make_association_loader
+
+RolesByUserLoader = make_association_loader(
+    loader_name="_roles_by_user_loader",
+    parent_column=UserRole.user_id,
+    child_model=Role,
+    child_column=UserRole.role_id
+)
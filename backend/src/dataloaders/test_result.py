@@ -3,13 +3,15 @@ from aiodataloader import DataLoader
 from trustadapter.trustadapter import TrustAdapter, TestResult_IE
 from dependency_injector.wiring import Provide, inject
 from containers import SDContainer
+from trustadapter.testresultcache import test_result_cache
 
 
 class TestResultByReferenceIdFromIELoader(DataLoader):
     """
         This is class for loading test results by their
         reference IDs and caching the result in
-        the request context
+        the request context. Completed test results
+        are also kept in the process-wide cache
 
         Attributes:
             loader_name (str): unique name of loader to cache data under
@@ -26,11 +28,16 @@ class TestResultByReferenceIdFromIELoader(DataLoader):
                 SDContainer.trust_adapter_service
             ]
     ) -> Dict[int, TestResult_IE]:
+        returnData = await test_result_cache.get_many(keys)
+        missing = [key for key in keys if key not in returnData]
+        if not missing:
+            return returnData
+
         result = await trust_adapter.load_many_test_results(
-            recordIds=keys,
+            recordIds=missing,
             auth_token=self._context['request'].cookies['SDSESSION']
         )
-        returnData = {}
+        await test_result_cache.set_many(result)
         for clinical_request in result:
             returnData[clinical_request.id] = clinical_request
         return returnData
@@ -1,6 +1,7 @@
 from aiodataloader import DataLoader
-from models import User
+from models import User, UserMDT
 from typing import List, Union
+from .association import make_association_loader
 
 
 class UserByIdLoader(DataLoader):
@@ -204,3 +205,12 @@ class UserByUsernameLoader(DataLoader):
         if cls.loader_name not in context:
             context[cls.loader_name] = cls(db=context['db'])
         return await context[cls.loader_name].load_many(ids)
+
+
+UsersByMdtLoader = make_association_loader(
+    loader_name="_users_by_mdt_loader",
+    parent_column=UserMDT.mdt_id,
+    child_model=User,
+    child_column=UserMDT.user_id,
+    by_id_loader=UserByIdLoader
+)
@@ -1,6 +1,5 @@
 from common import MutationUserErrorHandler, OnMdtPayload
 from models import MDT, OnMdt, UserPathway
-from models.db import db
 from gino.engine import GinoConnection
 
 
@@ -52,8 +51,8 @@ async def UpdateOnMDT(
         .execution_options(loader=OnMdt)
 
     if conn is None:
-        async with db.acquire(reuse=False) as conn:
-            on_mdt: OnMdt = await conn.one_or_none(query)
+        async with context['db'].acquire(reuse=False) as acquired:
+            on_mdt: OnMdt = await acquired.one_or_none(query)
     else:
         on_mdt: OnMdt = await conn.one_or_none(query)
 
@@ -77,6 +76,7 @@ async def UpdateOnMDT(
         update_values['order'] = order
 
     if len(update_values.keys()) > 0:
-        await on_mdt.update(**update_values).apply()
+        # within the caller's transaction, if given its connection
+        await on_mdt.update(**update_values).apply(bind=conn)
 
     return OnMdtPayload(on_mdt=on_mdt)
@@ -2,6 +2,7 @@ from sqlalchemy import and_
 from typing import Dict, List, Set
 from models import Pathway, PathwayClinicalRequestType
 from common import MutationUserErrorHandler, PathwayPayload
+from referencedata import reference_data
 from asyncpg.exceptions import UniqueViolationError
 
 
@@ -33,39 +34,45 @@ async def UpdatePathway(
     try:
         pathway: Pathway = await Pathway.get(int(id))
         await pathway.update(name=name).apply()
-    except UniqueViolationError:
-        userErrors.addError("Name", "A pathway with this name already exists")
-        return PathwayPayload(user_errors=userErrors.errorList)
 
-    current_clinical_request_types = await PathwayClinicalRequestType.query\
-        .where(PathwayClinicalRequestType.pathway_id == int(id)).gino.all()
+        current_clinical_request_types = await PathwayClinicalRequestType\
+            .query.where(PathwayClinicalRequestType.pathway_id == int(id))\
+            .gino.all()
 
-    current_clinical_request_type_ids: Set[int] = set(
-        [int(
-            mT.clinical_request_type_id
-        ) for mT in current_clinical_request_types]
-    )
+        current_clinical_request_type_ids: Set[int] = set(
+            [int(
+                mT.clinical_request_type_id
+            ) for mT in current_clinical_request_types]
+        )
 
-    input_clinical_request_type_ids: Set[int] = set(
-        [int(mT['id']) for mT in clinical_request_types]
-    ) if clinical_request_types else set()
+        input_clinical_request_type_ids: Set[int] = set(
+            [int(mT['id']) for mT in clinical_request_types]
+        ) if clinical_request_types else set()
 
-    toRemove = current_clinical_request_type_ids - \
-        input_clinical_request_type_ids
-    toAdd = input_clinical_request_type_ids - \
-        current_clinical_request_type_ids
+        toRemove = current_clinical_request_type_ids - \
+            input_clinical_request_type_ids
+        toAdd = input_clinical_request_type_ids - \
+            current_clinical_request_type_ids
 
-    await PathwayClinicalRequestType.delete.where(
-        and_(
-            PathwayClinicalRequestType.clinical_request_type_id.in_(toRemove),
-            PathwayClinicalRequestType.pathway_id == int(id)
-        )
-    ).gino.status()
+        await PathwayClinicalRequestType.delete.where(
+            and_(
+                PathwayClinicalRequestType.clinical_request_type_id
+                .in_(toRemove),
+                PathwayClinicalRequestType.pathway_id == int(id)
+            )
+        ).gino.status()
 
-    for mT_ID in toAdd:
-        await PathwayClinicalRequestType.create(
-            pathway_id=int(id),
-            clinical_request_type_id=mT_ID
-        )
+        for mT_ID in toAdd:
+            await PathwayClinicalRequestType.create(
+                pathway_id=int(id),
+                clinical_request_type_id=mT_ID
+            )
+
+        return PathwayPayload(pathway=pathway)
 
-    return PathwayPayload(pathway=pathway)
+    except UniqueViolationError:
+        userErrors.addError("Name", "A pathway with this name already exists")
+        return PathwayPayload(user_errors=userErrors.errorList)
+    finally:
+        # the name may have been updated even if a later step failed
+        reference_data.invalidate()
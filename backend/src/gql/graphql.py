@@ -2,11 +2,16 @@ from ariadne.asgi import GraphQL
 
 from SdTypes import Permissions
 from authentication.authentication import needsAuthenticated
+from authentication.permissionchanges import permission_changes
+from authentication.sessioncache import session_cache
+from config import config
+from .requestconnections import RequestConnections
 from .schema import schema
 import logging
 from models import db, Session, User, RolePermission, Role, UserRole
 from datetime import datetime
 from starlette.requests import Request
+from starlette.responses import Response
 from starlette.websockets import HTTPConnection, WebSocket
 
 from typing import List
@@ -15,11 +20,50 @@ from pydantic import BaseModel
 
 log = logging.getLogger("uvicorn")
 
+REQUEST_CONNECTIONS = int(config.get('GRAPHQL_REQUEST_CONNECTIONS', 4))
+
 
 class SdWebsocketConnectionParams(BaseModel):
     token: str
 
 
+async def _load_websocket_auth(websocket: WebSocket = None, user_query=None):
+    """
+    Reads a websocket connection's user and scopes, keeping them on the
+    connection scope until a permission change is published in this
+    process, or for at most the session cache's TTL, which bounds how
+    long changes made by other processes go unseen
+
+    :param websocket: websocket connection
+    :param user_query: query for the user, which must be active
+
+    :return: user, or None if not found
+    """
+    version = permission_changes.version
+    async with db.acquire(reuse=False) as conn:
+        user = await conn.one_or_none(
+            user_query.where(User.is_active.is_(True))
+        )
+        auth_scopes = []
+        if user is not None:
+            query = RolePermission.outerjoin(Role) \
+                .outerjoin(UserRole) \
+                .outerjoin(User) \
+                .select() \
+                .where(User.id == user.id)
+            permissions: List[RolePermission] = await conn.all(query)
+            auth_scopes.append(Permissions.AUTHENTICATED)
+            for p in permissions:
+                auth_scopes.append(p.permission)
+
+    if user is not None:
+        websocket.scope["user"] = user
+    websocket.scope["auth_scopes"] = frozenset(auth_scopes)
+    websocket.scope["auth_version"] = version
+    websocket.scope["auth_read_at"] = datetime.now()
+    return user
+
+
 async def ws_on_connect(
         websocket: WebSocket = None, params: SdWebsocketConnectionParams = None
 ):
@@ -30,49 +74,65 @@ async def ws_on_connect(
     if not token:
         raise WebSocketConnectionError("Missing auth")
 
-    async with db.acquire(reuse=False) as conn:
-        session = db.select([User, Session]).where(
+    user = await _load_websocket_auth(
+        websocket,
+        db.select([User]).where(
             Session.session_key == token
         ).where(
             Session.user_id == User.id
         ).where(
             Session.expiry > datetime.now()
-        ).where(
-            User.is_active.is_(True)
         )
-        user = await conn.one_or_none(session)
-
-        if user is None:
-            raise WebSocketConnectionError("Invalid token")
+    )
 
-        websocket.scope["user"] = user
+    if user is None:
+        raise WebSocketConnectionError("Invalid token")
 
 
 async def get_context_values(request: HTTPConnection):
     context = {}
 
     if request.scope["type"] == "websocket":
-        context["user"] = request.scope["user"]
-
-        async with db.acquire(reuse=False) as conn:
-            query = RolePermission.outerjoin(Role) \
-                .outerjoin(UserRole) \
-                .outerjoin(User) \
-                .select() \
-                .where(User.id == context["user"].id)
-            permissions: List[RolePermission] = await conn.all(query)
-            auth_scopes = [Permissions.AUTHENTICATED]
-            for p in permissions:
-                auth_scopes.append(p.permission)
+        user = request.scope["user"]
+        if permission_changes.changed_since(
+            user.id, request.scope["auth_version"]
+        ) or datetime.now() - request.scope["auth_read_at"] \
+                >= session_cache.ttl:
+            await _load_websocket_auth(
+                request, db.select([User]).where(User.id == user.id)
+            )
 
-            request.auth.scopes = auth_scopes
+        context["user"] = request.scope["user"]
+        request.auth.scopes = request.scope["auth_scopes"]
 
     context['request'] = request
-    context['db'] = db
+    if request.scope["type"] == "websocket":
+        # subscriptions outlive the request, so must not hold connections
+        context['db'] = db
+    else:
+        request.state.db_connections = RequestConnections(
+            db=db, max_connections=REQUEST_CONNECTIONS
+        )
+        context['db'] = request.state.db_connections
     return context
 
 
-_graphql = GraphQL(
+class SdGraphQL(GraphQL):
+    """
+    Returns a request's connections to the pool once it has been
+    executed
+    """
+
+    async def graphql_http_server(self, request: Request) -> Response:
+        try:
+            return await super().graphql_http_server(request)
+        finally:
+            connections = getattr(request.state, "db_connections", None)
+            if connections is not None:
+                await connections.close()
+
+
+_graphql = SdGraphQL(
     schema=schema,
     debug=True,
     context_value=get_context_values
@@ -0,0 +1,211 @@
+import asyncio
+import dataclasses
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from graphql.execution.values import get_argument_values
+from graphql.language import FieldNode
+from graphql.type import GraphQLResolveInfo
+from sqlalchemy.sql import Select
+from dataloaders import (
+    ClinicalRequestByOnPathwayIdLoader,
+    ClinicalRequestsByDecisionPointIdLoader,
+    ClinicalRequestsByForwardDecisionPointIdLoader,
+    DecisionPointsByOnPathway,
+    OnPathwaysByPatient,
+    UserByIdLoader,
+)
+from dataloaders.grouped import group_by_id
+from models import DecisionPoint, OnPathway, User
+from referencedata import reference_data
+from gql.selection import selected_field_nodes
+
+_DECISION_POINT_CLINICAL_REQUESTS = {
+    "clinicalRequests": ClinicalRequestsByDecisionPointIdLoader,
+    "clinicalRequestResolutions":
+        ClinicalRequestsByForwardDecisionPointIdLoader,
+}
+
+
+@dataclasses.dataclass
+class _Prefetch:
+    query: Select
+    prime: Callable[["_Prefetch"], None]
+    records: Optional[List[Any]] = None
+
+
+def _ids_of(query: Select, model: Any) -> Select:
+    return query.with_only_columns([model.id]).order_by(None)
+
+
+def _nodes_by_arguments(
+    info: GraphQLResolveInfo, type_name: str, name: str,
+    field_nodes: Iterable[FieldNode], make_key: Callable[..., Any]
+) -> Dict[Any, List[FieldNode]]:
+    field = info.schema.get_type(type_name).fields[name]
+    nodes_by_key: Dict[Any, List[FieldNode]] = {}
+    for node in selected_field_nodes(info, name, field_nodes):
+        arguments = get_argument_values(field, node, info.variable_values)
+        nodes_by_key.setdefault(make_key(**arguments), []).append(node)
+    return nodes_by_key
+
+
+async def prefetch_patient_relations(
+    info: GraphQLResolveInfo = None, patient_ids: List[int] = None,
+    field_nodes: Iterable[FieldNode] = None
+):
+    """
+    Loads the OnPathway records, their clinical requests, lock users
+    and decision points, and the decision points' clinical requests
+    selected below patients ahead of their resolvers, and primes the
+    loaders those resolvers use. Each level is queried through a
+    subquery on the level above, so every level is loaded at once
+    rather than one level after the other
+
+    :param info: resolve info of the root field
+    :param patient_ids: IDs of the patients being returned
+    :param field_nodes: nodes of the Patient fields, defaults to the
+        nodes of the field being resolved
+    """
+    if not patient_ids:
+        return
+    context = info.context
+    patient_ids = [int(id) for id in patient_ids]
+    prefetches: List[_Prefetch] = []
+    load_reference_data = False
+
+    on_pathway_nodes = _nodes_by_arguments(
+        info, "Patient", "onPathways", field_nodes,
+        OnPathwaysByPatient.make_key
+    )
+    for filters, nodes in on_pathway_nodes.items():
+        def prime_on_pathways(prefetch: _Prefetch, filters=filters):
+            grouped = group_by_id(prefetch.records, patient_ids, "patient_id")
+            for id, on_pathways in grouped.items():
+                OnPathwaysByPatient.prime_prefetched_with_context(
+                    context, dataclasses.replace(filters, id=id), on_pathways
+                )
+
+        on_pathways = _Prefetch(
+            query=OnPathwaysByPatient.query_group(filters, patient_ids),
+            prime=prime_on_pathways
+        )
+        prefetches.append(on_pathways)
+        on_pathway_ids = _ids_of(on_pathways.query, OnPathway)
+
+        clinical_request_nodes = _nodes_by_arguments(
+            info, "OnPathway", "clinicalRequests", nodes,
+            ClinicalRequestByOnPathwayIdLoader.make_key
+        )
+        for clinical_request_filters, clinical_request_nodes in \
+                clinical_request_nodes.items():
+            if selected_field_nodes(
+                info, "clinicalRequestType", clinical_request_nodes
+            ):
+                load_reference_data = True
+
+            def prime_on_pathway_clinical_requests(
+                prefetch: _Prefetch, filters=clinical_request_filters,
+                on_pathways: _Prefetch = on_pathways
+            ):
+                ids = [on_pathway.id for on_pathway in on_pathways.records]
+                grouped = group_by_id(prefetch.records, ids, "on_pathway_id")
+                for id, clinical_requests in grouped.items():
+                    ClinicalRequestByOnPathwayIdLoader\
+                        .prime_prefetched_with_context(
+                            context, dataclasses.replace(filters, id=id),
+                            clinical_requests
+                        )
+
+            prefetches.append(_Prefetch(
+                query=ClinicalRequestByOnPathwayIdLoader.query_group(
+                    clinical_request_filters, on_pathway_ids
+                ),
+                prime=prime_on_pathway_clinical_requests
+            ))
+
+        if selected_field_nodes(info, "lockUser", nodes):
+            def prime_lock_users(prefetch: _Prefetch):
+                for user in prefetch.records:
+                    UserByIdLoader.prime(
+                        key=user.id, value=user, context=context
+                    )
+
+            prefetches.append(_Prefetch(
+                query=User.query.where(User.id.in_(
+                    on_pathways.query.with_only_columns(
+                        [OnPathway.lock_user_id]
+                    ).order_by(None)
+                )),
+                prime=prime_lock_users
+            ))
+
+        decision_point_nodes = selected_field_nodes(
+            info, "decisionPoints", nodes
+        )
+        if not decision_point_nodes:
+            continue
+
+        def prime_decision_points(
+            prefetch: _Prefetch, on_pathways: _Prefetch = on_pathways
+        ):
+            ids = [on_pathway.id for on_pathway in on_pathways.records]
+            grouped = group_by_id(prefetch.records, ids, "on_pathway_id")
+            for id, decision_points in grouped.items():
+                DecisionPointsByOnPathway.prime_prefetched_with_context(
+                    context, DecisionPointsByOnPathway.make_key(id=id),
+                    decision_points
+                )
+
+        decision_points = _Prefetch(
+            query=DecisionPointsByOnPathway.query_group(
+                DecisionPointsByOnPathway.make_key(),
+                on_pathway_ids
+            ),
+            prime=prime_decision_points
+        )
+        prefetches.append(decision_points)
+
+        for name, loader in _DECISION_POINT_CLINICAL_REQUESTS.items():
+            clinical_request_nodes = selected_field_nodes(
+                info, name, decision_point_nodes
+            )
+            if not clinical_request_nodes:
+                continue
+            if selected_field_nodes(
+                info, "clinicalRequestType", clinical_request_nodes
+            ):
+                load_reference_data = True
+
+            def prime_clinical_requests(
+                prefetch: _Prefetch, loader=loader,
+                decision_points: _Prefetch = decision_points
+            ):
+                ids = [
+                    decision_point.id
+                    for decision_point in decision_points.records
+                ]
+                grouped = loader.group_many(prefetch.records, ids)
+                for id, clinical_requests in grouped.items():
+                    loader.prime_prefetched_with_context(
+                        context, id, clinical_requests
+                    )
+
+            prefetches.append(_Prefetch(
+                query=loader.query_many(
+                    _ids_of(decision_points.query, DecisionPoint)
+                ),
+                prime=prime_clinical_requests
+            ))
+
+    async def fetch(prefetch: _Prefetch):
+        async with context['db'].acquire(reuse=False) as conn:
+            prefetch.records = await conn.all(prefetch.query)
+
+    fetches = [fetch(prefetch) for prefetch in prefetches]
+    if load_reference_data:
+        # clinical request types are served from the reference data
+        fetches.append(reference_data.get())
+    await asyncio.gather(*fetches)
+
+    # parents are primed first, as their children are grouped by them
+    for prefetch in prefetches:
+        prefetch.prime(prefetch)
@@ -4,7 +4,6 @@ from models import MDT, OnMdt, UserPathway
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
-from models.db import db
 
 
 @mutation.field("deleteOnMdt")
@@ -24,7 +23,7 @@ async def resolve_remove_pt_from_mdt(
         ).distinct(UserPathway.user_id)\
         .execution_options(loader=OnMdt)
 
-    async with db.acquire(reuse=False) as conn:
+    async with info.context['db'].acquire(reuse=False) as conn:
         on_mdt: OnMdt = await conn.one_or_none(query)
 
     if on_mdt is None:
@@ -5,6 +5,7 @@ from .mutation_type import mutation
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from common import MutationUserErrorHandler, DeletePayload
+from referencedata import reference_data
 
 
 @mutation.field("deletePathway")
@@ -17,15 +18,19 @@ async def resolve_delete_pathway(
 ) -> Pathway:
     userErrors = MutationUserErrorHandler()
 
-    async with db.transaction():
-        try:
-            await PathwayClinicalRequestType.delete.where(
-                PathwayClinicalRequestType.pathway_id == int(id)
-            ).gino.status()
-            pathway: Pathway = await Pathway.get(int(id))
-            await pathway.delete()
-            return DeletePayload(success=True)
-        except ForeignKeyViolationError:
-            userErrors.addError(
-                "id", "You cannot remove a pathway with a relation")
-            return DeletePayload(user_errors=userErrors.errorList)
+    try:
+        async with db.transaction():
+            try:
+                await PathwayClinicalRequestType.delete.where(
+                    PathwayClinicalRequestType.pathway_id == int(id)
+                ).gino.status()
+                pathway: Pathway = await Pathway.get(int(id))
+                await pathway.delete()
+                return DeletePayload(success=True)
+            except ForeignKeyViolationError:
+                userErrors.addError(
+                    "id", "You cannot remove a pathway with a relation")
+                return DeletePayload(user_errors=userErrors.errorList)
+    finally:
+        # once the transaction has ended
+        reference_data.invalidate()
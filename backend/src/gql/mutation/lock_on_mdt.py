@@ -1,5 +1,5 @@
 from typing import Union
-from models import UserPathway, OnMdt, MDT, db
+from models import UserPathway, OnMdt, MDT
 from .mutation_type import mutation
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
@@ -31,7 +31,7 @@ async def resolve_lock_on_mdt(
         ).distinct(UserPathway.user_id)\
         .execution_options(loader=OnMdt)
 
-    async with db.acquire(reuse=False) as conn:
+    async with info.context['db'].acquire(reuse=False) as conn:
         on_mdt: OnMdt = await conn.one_or_none(query)
 
     if on_mdt is None:
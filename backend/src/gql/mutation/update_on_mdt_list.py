@@ -1,6 +1,5 @@
 from SdTypes import Permissions
 from common import BaseMutationPayload
-from models import db
 from dataupdaters import UpdateOnMDT
 from .mutation_type import mutation
 from authentication.authentication import needsAuthorization
@@ -14,7 +13,7 @@ async def resolve_update_on_mdt_list(
     info: GraphQLResolveInfo = None,
     input: dict = None,
 ):
-    async with db.acquire(reuse=False) as conn:
+    async with info.context['db'].acquire(reuse=False) as conn:
         async with conn.transaction():
             results = []
             for i in input['onMdtList']:
@@ -1,12 +1,11 @@
 from typing import List
 from dataloaders import MdtByIdLoader
-from .pagination import make_connection, validate_parameters
+from .pagination import make_sql_connection
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
 from models import MDT
 from .query_type import query
-from models.db import db
 
 
 @query.field("getMdtConnection")
@@ -15,16 +14,15 @@ async def get_mdt_connection(
     obj=None, info: GraphQLResolveInfo = None, first=None,
     after=None, last=None, before=None, pathwayId=None
 ):
-    validate_parameters(first, after, last, before)
+    async def prime_mdts(mdt_list: List[MDT]) -> List[MDT]:
+        for mdt in mdt_list:
+            MdtByIdLoader.prime(mdt.id, mdt, context=info.context)
+        return mdt_list
 
-    async with db.acquire(reuse=False) as conn:
-        mdt_list: List[MDT] = await conn.all(
-            MDT.query.where(
-                MDT.pathway_id == int(pathwayId)
-            ).order_by(MDT.planned_at.asc())
-        )
-
-    for mdt in mdt_list:
-        MdtByIdLoader.prime(mdt.id, mdt, context=info.context)
-
-    return make_connection(mdt_list, before, after, first, last)
+    return await make_sql_connection(
+        MDT.query.where(MDT.pathway_id == int(pathwayId)),
+        [MDT.planned_at, MDT.id],
+        before, after, first, last,
+        load_nodes=prime_mdts,
+        info=info
+    )
@@ -23,7 +23,8 @@ async def resolve_get_mdts(
         query = query.where(
             MDT.planned_at >= date.today()
         )
-    result: List[MDT] = await query.gino.all()
+    async with info.context['db'].acquire(reuse=False) as conn:
+        result: List[MDT] = await conn.all(query)
 
     for mdt in result:
         MdtByIdLoader.prime(mdt.id, mdt, info.context)
@@ -1,11 +1,10 @@
 from typing import List
 from dataloaders import OnMdtByIdLoader
-from .pagination import make_connection, validate_parameters
+from .pagination import make_sql_connection, validate_parameters
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
-from models import OnMdt, Patient, MDT
-from models.db import db
+from models import OnMdt, MDT
 from .query_type import query
 
 
@@ -24,15 +23,18 @@ async def get_mdt_connection(
     if mdtId:
         query: str = OnMdt.query.where(OnMdt.mdt_id == int(mdtId))
     else:
-        query: str = Patient.join(OnMdt, Patient.id == OnMdt.patient_id)\
-            .join(MDT, OnMdt.mdt_id == MDT.id).select()\
-            .where(Patient.id == int(patientId))\
-            .where(MDT.pathway_id == int(pathwayId))\
-            .execution_options(loader=OnMdt)
+        query: str = OnMdt.query.where(OnMdt.mdt_id == MDT.id)\
+            .where(OnMdt.patient_id == int(patientId))\
+            .where(MDT.pathway_id == int(pathwayId))
 
-    async with db.acquire(reuse=False) as conn:
-        on_mdt_list: List[OnMdt] = await conn.all(query)
-    for on_mdt in on_mdt_list:
-        OnMdtByIdLoader.prime(on_mdt.id, on_mdt, context=info.context)
+    async def prime_on_mdts(on_mdt_list: List[OnMdt]) -> List[OnMdt]:
+        for on_mdt in on_mdt_list:
+            OnMdtByIdLoader.prime(on_mdt.id, on_mdt, context=info.context)
+        return on_mdt_list
 
-    return make_connection(on_mdt_list, before, after, first, last)
+    return await make_sql_connection(
+        query, [OnMdt.order, OnMdt.id],
+        before, after, first, last,
+        load_nodes=prime_on_mdts,
+        info=info
+    )
@@ -1,8 +1,11 @@
+import asyncio
 from .query_type import query
 from dataloaders import PatientByIdLoader, PatientByHospitalNumberLoader
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
+from gql.lookahead import prefetch_patient_relations
+from gql.types.patient import with_demographics
 
 
 @query.field("getPatient")
@@ -14,11 +17,18 @@ async def resolve_get_patient(
     hospitalNumber: str = None
 ):
     if id:
-        return await PatientByIdLoader.load_from_id(info.context, id)
+        patient, _ = await asyncio.gather(
+            PatientByIdLoader.load_from_id(info.context, id),
+            prefetch_patient_relations(info, [id])
+        )
+        return (await with_demographics(info, [patient]))[0]
     elif hospitalNumber:
-        return await PatientByHospitalNumberLoader.load_from_id(
+        patient = await PatientByHospitalNumberLoader.load_from_id(
             info.context,
             hospitalNumber
         )
+        if patient is not None:
+            await prefetch_patient_relations(info, [patient.id])
+        return (await with_demographics(info, [patient]))[0]
     else:
         return None
@@ -1,9 +1,13 @@
+import asyncio
 from sqlalchemy import or_, and_
 from dataloaders import PatientByIdLoader
 from .query_type import query
 from models import OnPathway, DecisionPoint, ClinicalRequest, db
 from SdTypes import ClinicalRequestState
-from .pagination import make_connection, validate_parameters
+from .pagination import make_sql_connection, validate_parameters
+from gql.lookahead import prefetch_patient_relations
+from gql.selection import selected_field_nodes
+from gql.types.patient import with_demographics
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
@@ -19,8 +23,8 @@ async def get_patient_connection(
 ):
     validate_parameters(first, after, last, before)
 
-    db_query = db.select([OnPathway.patient_id.label("patient_id")])\
-        .where(OnPathway.pathway_id == int(pathwayId))\
+    db_query = db.select([OnPathway.id, OnPathway.patient_id])\
+        .where(OnPathway.pathway_id == int(pathwayId))
 
     if includeDischarged is False:
         db_query = db_query.where(
@@ -65,12 +69,24 @@ async def get_patient_connection(
             )
         )
 
-    db_query = db_query.order_by(OnPathway.id)
-    all_patients_on_pathways = await db_query.gino.all()
-    patients_ids = [pp.patient_id for pp in all_patients_on_pathways]
-    patients = await PatientByIdLoader.load_many_from_id(
-        info.context,
-        patients_ids
-    )
+    async def load_patients(rows):
+        patient_ids = [row.patient_id for row in rows]
+        node_field_nodes = selected_field_nodes(
+            info, "node", selected_field_nodes(info, "edges")
+        )
+        patients, _ = await asyncio.gather(
+            PatientByIdLoader.load_many_from_id(info.context, patient_ids),
+            prefetch_patient_relations(
+                info, patient_ids, field_nodes=node_field_nodes
+            )
+        )
+        return await with_demographics(
+            info, patients, field_nodes=node_field_nodes
+        )
 
-    return make_connection(patients, before, after, first, last)
+    return await make_sql_connection(
+        db_query, [OnPathway.id],
+        before, after, first, last,
+        load_nodes=load_patients,
+        info=info
+    )
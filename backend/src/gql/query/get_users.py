@@ -2,7 +2,6 @@ from .query_type import query
 from authentication.authentication import needsAuthorization
 from SdTypes import Permissions
 from models import User, UserPathway
-from models.db import db
 
 
 @query.field("getUsers")
@@ -19,7 +18,7 @@ async def resolve_get_user(
             .where(UserPathway.pathway_id == int(pathwayId))\
             .execution_options(loader=User)
 
-    async with db.acquire(reuse=False) as conn:
+    async with info.context['db'].acquire(reuse=False) as conn:
         result = await conn.all(query)
 
     return result
@@ -1,5 +1,6 @@
+from typing import List
 from dataloaders import UserByIdLoader
-from .pagination import make_connection, validate_parameters
+from .pagination import make_sql_connection
 from authentication.authentication import needsAuthorization
 from graphql.type import GraphQLResolveInfo
 from SdTypes import Permissions
@@ -13,10 +14,14 @@ async def get_patient_connection(
         obj=None, info: GraphQLResolveInfo = None,
         first=None, after=None, last=None, before=None
 ):
-    validate_parameters(first, after, last, before)
-    users = await User.query.gino.all()
+    async def prime_users(users: List[User]) -> List[User]:
+        for u in users:
+            UserByIdLoader.prime(u.id, u, context=info.context)
+        return users
 
-    for u in users:
-        UserByIdLoader.prime(u.id, u, context=info.context)
-
-    return make_connection(users, before, after, first, last)
+    return await make_sql_connection(
+        User.query, [User.id],
+        before, after, first, last,
+        load_nodes=prime_users,
+        info=info
+    )
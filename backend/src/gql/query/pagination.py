@@ -1,3 +1,15 @@
+import asyncio
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64DecodeError
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import func, tuple_
+from sqlalchemy.sql import ColumnElement, Select
+from graphql.type import GraphQLResolveInfo
+from gql.selection import is_field_selected
+from models.db import db
 
 
 def validate_parameters(first=None, after=None, last=None, before=None):
@@ -15,113 +27,264 @@ def validate_parameters(first=None, after=None, last=None, before=None):
     if before is None and after is None and first is None:
         raise ValueError("Require first argument if no cursors present")
 
+    if first is not None and first < 0:
+        raise ValueError("First must be greater than 0")
 
-# Pagination
-def edges_to_return(
-        all_edges=None, before=None, after=None, first=None, last=None
-):
-    edges = apply_cursors_to_edges(all_edges, before, after)
-    if first is not None:
-        if first < 0:
-            raise ValueError("First must be greater than 0")
-        if len(edges) > first:
-            edges = edges[:first]
-    if last is not None:
-        if last < 0:
-            raise ValueError("Last must be greater than 0")
-        edges_len = len(edges)
-        if edges_len > last:
-            edges = edges[edges_len - last:]
-    return edges
-
-
-def apply_cursors_to_edges(all_edges=None, before=None, after=None):
-    edges = all_edges
-    pos = 1  # slicing stops at pos - 1
+    if last is not None and last < 0:
+        raise ValueError("Last must be greater than 0")
+
+
+# Cursors
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes the sort key values of a row into an opaque cursor
+
+    :param values: values of the row's ordering columns, in order
+
+    :return: cursor string
+    """
+    payload = json.dumps(
+        list(values), separators=(",", ":"),
+        default=lambda v: v.isoformat()
+    )
+    return urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str = None) -> List[Any]:
+    """
+    Decodes a cursor created by `encode_cursor`
+
+    :param cursor: cursor string
+
+    :return: list of sort key values
+
+    :raise ValueError: cursor is malformed
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode("utf-8")))
+    except (AttributeError, Base64DecodeError, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# Keyset pagination
+@dataclass
+class KeysetPage:
+    """
+    A single page of rows fetched by a keyset query
+    """
+    rows: List[Any]
+    has_previous_page: bool = False
+    has_next_page: bool = False
+
+
+def _cursor_value(column: ColumnElement, value: Any) -> Any:
+    # dates and times are stored in cursors as ISO strings
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def _keyset_condition(
+    order_by: Sequence[ColumnElement], values: List[Any], forwards: bool
+) -> ColumnElement:
+    if len(values) != len(order_by):
+        raise ValueError("Invalid cursor")
+    values = [_cursor_value(c, v) for c, v in zip(order_by, values)]
+    if len(order_by) == 1:
+        left, right = order_by[0], values[0]
+    else:
+        left, right = tuple_(*order_by), tuple_(*values)
+    return left > right if forwards else left < right
+
+
+def keyset_query(
+    query: Select = None, order_by: Sequence[ColumnElement] = None,
+    before: str = None, after: str = None,
+    first: int = None, last: int = None
+) -> Select:
+    """
+    Applies cursor conditions, ordering and a limit to a query. The
+    limit is one more than the page size, the extra row is used to
+    tell whether there is another page
+
+    :param query: query to paginate
+    :param order_by: columns the query is ordered by, the last must be
+        unique
+    :param before: cursor to page backwards from
+    :param after: cursor to page forwards from
+    :param first: number of rows to return paging forwards
+    :param last: number of rows to return paging backwards
+
+    :return: paginated query
+    """
     if after is not None:
-        for e in edges:
-            if e['cursor'] == after:
-                edges = edges[pos:]
-            else:
-                pos += 1
-    pos = 1  # reset
+        query = query.where(
+            _keyset_condition(order_by, decode_cursor(after), True))
     if before is not None:
-        for e in edges:
-            if e['cursor'] == before:
-                edges = edges[:pos]
-            else:
-                pos += 1
-    return edges
-
-
-#  PageInfo
-def has_previous_page(
-    all_edges=None,
-    before=None,
-    after=None,
-    first=None,
-    last=None
-):
-    if last is not None:
-        edges = apply_cursors_to_edges(all_edges, before, after)
-        if len(edges) > last:
-            return True
-        else:
-            return False
-    if after is not None:
-        pass
-        # if we can find elements before after, return true
-    return False
+        query = query.where(
+            _keyset_condition(order_by, decode_cursor(before), False))
 
+    if before is not None:
+        return query.order_by(*[c.desc() for c in order_by])\
+            .limit(last + 1)
+    return query.order_by(*[c.asc() for c in order_by]).limit(first + 1)
 
-def has_next_page(
-    all_edges=None,
-    before=None,
-    after=None,
-    first=None,
-    last=None
-):
-    if first is not None:
-        edges = apply_cursors_to_edges(all_edges, before, after)
-        if len(edges) > first:
-            return True
-        else:
-            return False
+
+def keyset_page(
+    rows: List[Any] = None, before: str = None,
+    first: int = None, last: int = None
+) -> KeysetPage:
+    """
+    Trims the rows returned by a `keyset_query` to the page size and
+    works out whether there are further pages from the extra row
+
+    :param rows: rows returned from the query
+    :param before: cursor to page backwards from
+    :param first: number of rows to return paging forwards
+    :param last: number of rows to return paging backwards
+
+    :return: KeysetPage
+    """
+    page = KeysetPage(rows=list(rows))
     if before is not None:
-        pass
-        # if we can find elements following before, return true
-    return False
+        page.has_previous_page = len(page.rows) > last
+        page.rows = page.rows[:last]
+        page.rows.reverse()
+        if first is not None and len(page.rows) > first:
+            page.has_next_page = True
+            page.rows = page.rows[:first]
+    else:
+        page.has_next_page = len(page.rows) > first
+        page.rows = page.rows[:first]
+        if last is not None and len(page.rows) > last:
+            page.has_previous_page = True
+            page.rows = page.rows[len(page.rows) - last:]
+    return page
+
+
+def make_keyset_connection(
+    page: KeysetPage = None, nodes: List[Any] = None,
+    cursors: List[str] = None, total_count: Optional[int] = None
+):
+    """
+    Creates a connection from a page of rows
 
+    :param page: KeysetPage
+    :param nodes: node for each row of the page
+    :param cursors: cursor for each row of the page
+    :param total_count: number of rows matching the query, ignoring
+        pagination
 
-def make_connection(models, before, after, first, last):
-    total_count = len(models)
-    all_edges = list(map(lambda c: ({'node': c, 'cursor': str(c.id)}), models))
-    edges = edges_to_return(all_edges, before, after, first, last)
+    :return: connection dict
+    """
+    edges = [
+        {'node': node, 'cursor': cursor}
+        for node, cursor in zip(nodes, cursors)
+    ]
 
-    if not edges or not edges[0]:
+    if not edges:
         start_cursor = 0
         end_cursor = 0
     else:
         start_cursor = edges[0]['cursor']
         end_cursor = edges[len(edges) - 1]['cursor']
 
-    page_info = {
-        "has_previous_page": has_previous_page(
-            all_edges,
-            before,
-            after,
-            first,
-            last
-        ),
-        "has_next_page": has_next_page(all_edges, before, after, first, last),
-        "start_cursor": start_cursor,
-        "end_cursor": end_cursor
-    }
-
-    connection = {
-        "page_info": page_info,
+    return {
+        "page_info": {
+            "has_previous_page": page.has_previous_page,
+            "has_next_page": page.has_next_page,
+            "start_cursor": start_cursor,
+            "end_cursor": end_cursor
+        },
         "total_count": total_count,
         "edges": edges
     }
 
-    return connection
+
+def row_cursor(row: Any = None, order_by: Sequence[ColumnElement] = None):
+    """
+    Creates the cursor for a row from its ordering column values. The
+    row can be a model instance or a result row, as long as each
+    ordering column is available as an attribute under its key
+
+    :param row: model or result row
+    :param order_by: columns the query is ordered by
+
+    :return: cursor string
+    """
+    return encode_cursor([getattr(row, c.key) for c in order_by])
+
+
+async def make_sql_connection(
+    query: Select = None, order_by: Sequence[ColumnElement] = None,
+    before: str = None, after: str = None,
+    first: int = None, last: int = None,
+    load_nodes: Callable[[List[Any]], Awaitable[List[Any]]] = None,
+    info: GraphQLResolveInfo = None
+) -> Dict[str, Any]:
+    """
+    Creates a connection from a query, only fetching the requested page
+    from the database
+
+    :param query: query selecting the rows of the connection
+    :param order_by: columns to order by, e.g. `[MDT.planned_at, MDT.id]`.
+        The combination must be unique, so the last column is usually
+        the primary key
+    :param before: cursor to page backwards from
+    :param after: cursor to page forwards from
+    :param first: number of rows to return paging forwards
+    :param last: number of rows to return paging backwards
+    :param load_nodes: coroutine mapping the page's rows to nodes, the
+        rows are used as nodes if this is not given
+    :param info: resolve info of the connection field. If given, rows
+        are only counted when `totalCount` is selected, and are fetched
+        through the request's connections
+
+    :return: connection dict
+
+    :raise ValueError: invalid pagination arguments or cursor
+    """
+    validate_parameters(first, after, last, before)
+
+    page_query = keyset_query(query, order_by, before, after, first, last)
+    connections = info.context['db'] if info is not None else db
+
+    async def fetch_page():
+        async with connections.acquire(reuse=False) as conn:
+            return await conn.all(page_query)
+
+    async def fetch_count():
+        count_query = db.select([func.count()]).select_from(
+            query.alias("connection_rows"))
+        async with connections.acquire(reuse=False) as conn:
+            return await conn.scalar(count_query)
+
+    if info is None or is_field_selected(info, "totalCount"):
+        rows, total_count = await asyncio.gather(
+            fetch_page(), fetch_count()
+        )
+    else:
+        rows, total_count = await fetch_page(), None
+    page = keyset_page(rows, before, first, last)
+
+    if load_nodes is not None:
+        nodes = await load_nodes(page.rows)
+    else:
+        nodes = page.rows
+    cursors = [row_cursor(row, order_by) for row in page.rows]
+
+    return make_keyset_connection(page, nodes, cursors, total_count)
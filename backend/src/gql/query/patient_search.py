@@ -12,7 +12,9 @@ from SdTypes import Permissions
 from models import Patient, OnPathway
 from containers import SDContainer
 from trustadapter import TrustAdapter
+from trustadapter.patientcache import patient_cache
 from dependency_injector.wiring import Provide, inject
+from gql.types.patient import with_demographics
 
 
 @query.field("patientSearch")
@@ -37,18 +39,21 @@ async def resolve_patient_search(
     )"""
     logging.warning(query)
     if pathwayId is not None:
-        join_query = Patient.join(OnPathway)\
+        patients_query = Patient.join(OnPathway)\
             .select()\
             .where(OnPathway.pathway_id == int(pathwayId))\
             .execution_options(loader=Patient)
-        patients_query = join_query.gino.all()
     else:
-        patients_query = Patient.query.gino.all()
+        patients_query = Patient.query
+
+    async def load_patients():
+        async with info.context['db'].acquire(reuse=False) as conn:
+            return await conn.all(patients_query)
 
     search_request = trust_adapter.patient_search(query)
 
     [patients_results, search_results] = await asyncio.gather(
-        patients_query, search_request)
+        load_patients(), search_request)
     for patient in patients_results:
         PatientByIdLoader.prime(
             key=patient.id, value=patient,
@@ -58,6 +63,7 @@ async def resolve_patient_search(
             context=info.context)
 
     for patient_ie in search_results:
+        patient_cache.set(patient_ie)
         PatientByHospitalNumberFromIELoader.prime(
             key=patient_ie.hospital_number,
             value=patient_ie, context=info.context
@@ -73,4 +79,4 @@ async def resolve_patient_search(
         patient_hospital_numbers)
     patients = await PatientByHospitalNumberLoader.load_many_from_id(
         info.context, [*valid_hospital_numbers])
-    return patients
+    return await with_demographics(info, patients)
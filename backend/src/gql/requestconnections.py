@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List
+from gino import Gino
+from gino.engine import GinoConnection
+
+
+class RequestConnections:
+    """
+    Shares a few pool connections between the loaders and resolvers of
+    one GraphQL request. It stands in for `db` in the request context:
+    `acquire` hands out one of at most `max_connections` connections,
+    checked out from the pool when first needed and kept until `close`.
+    Callers beyond the cap wait for a connection to be handed back.
+
+    Connections are not made reusable, so they never join gino's
+    contextual stack, which the request's loader tasks share. Queries
+    must run on the connection handed out, not through an implicit bind.
+
+    Anything other than `acquire` is passed through to `db`
+    """
+
+    def __init__(self, db: Gino = None, max_connections: int = None):
+        self._db = db
+        self.max_connections = max_connections
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: List[GinoConnection] = []
+        self._closed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._db, name)
+
+    @asynccontextmanager
+    async def acquire(self, **_) -> AsyncIterator[GinoConnection]:
+        """
+        Borrows one of the request's connections. Accepts and ignores
+        `db.acquire`'s options, as connections are never shared with
+        anything outside the request
+
+        :return: connection, returned to the request on exit
+        """
+        async with self._semaphore:
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = await self._db.acquire(
+                    reuse=False, reusable=False
+                )
+            try:
+                yield conn
+            except BaseException:
+                # the connection may be left mid-query, e.g. if the
+                # caller was cancelled, so give it back to the pool
+                await conn.release()
+                raise
+            if self._closed:
+                await conn.release()
+            else:
+                self._idle.append(conn)
+
+    async def close(self):
+        """
+        Returns the request's connections to the pool
+        """
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.release()
@@ -0,0 +1,81 @@
+from typing import Iterable, List, Set
+from graphql.language import (
+    FieldNode, FragmentSpreadNode, InlineFragmentNode, SelectionSetNode
+)
+from graphql.type import GraphQLResolveInfo
+
+
+def _collect_field_nodes(
+    info: GraphQLResolveInfo, selection_set: SelectionSetNode,
+    nodes: List[FieldNode]
+):
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            nodes.append(selection)
+        elif isinstance(selection, InlineFragmentNode):
+            _collect_field_nodes(info, selection.selection_set, nodes)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments.get(selection.name.value)
+            if fragment is not None:
+                _collect_field_nodes(info, fragment.selection_set, nodes)
+
+
+def selected_field_nodes(
+    info: GraphQLResolveInfo = None,
+    name: str = None,
+    field_nodes: Iterable[FieldNode] = None
+) -> List[FieldNode]:
+    """
+    Finds the nodes of a field selected on the field being resolved,
+    including those selected through fragments or under aliases
+
+    :param info: resolve info of the field
+    :param name: name of the field in the schema, e.g. `edges`
+    :param field_nodes: nodes to inspect, defaults to the nodes of the
+        field being resolved
+
+    :return: list of field nodes
+    """
+    if field_nodes is None:
+        field_nodes = info.field_nodes
+    nodes = []
+    for field_node in field_nodes:
+        _collect_field_nodes(info, field_node.selection_set, nodes)
+    return [node for node in nodes if node.name.value == name]
+
+
+def selected_field_names(
+    info: GraphQLResolveInfo = None,
+    field_nodes: Iterable[FieldNode] = None
+) -> Set[str]:
+    """
+    Finds the names of the fields selected on the field being resolved,
+    including those selected through fragments
+
+    :param info: resolve info of the field
+    :param field_nodes: nodes to inspect, defaults to the nodes of the
+        field being resolved
+
+    :return: set of field names
+    """
+    if field_nodes is None:
+        field_nodes = info.field_nodes
+    nodes = []
+    for field_node in field_nodes:
+        _collect_field_nodes(info, field_node.selection_set, nodes)
+    return {node.name.value for node in nodes}
+
+
+def is_field_selected(info: GraphQLResolveInfo = None, name: str = None):
+    """
+    Checks whether the client selected a field on the field being
+    resolved
+
+    :param info: resolve info of the field
+    :param name: name of the field in the schema, e.g. `totalCount`
+
+    :return: bool
+    """
+    return name in selected_field_names(info)
@@ -1,12 +1,13 @@
-from typing import List
 from ariadne.objects import ObjectType
 from dataloaders import (
     UserByIdLoader,
-    PathwayByIdLoader
+    PathwayByIdLoader,
+    PatientsByMdtLoader,
+    UsersByMdtLoader
 )
 from graphql.type import GraphQLResolveInfo
-from models import MDT, Patient, OnMdt, User, UserMDT
-from models.db import db
+from models import MDT
+from .patient import with_demographics
 
 MDTObjectType = ObjectType("MDT")
 
@@ -38,13 +39,11 @@ async def resolve_mdt_patients(
     obj: MDT = None,
     info: GraphQLResolveInfo = None,
 ):
-    async with db.acquire(reuse=False) as conn:
-        patients: List[Patient] = await conn.all(
-            Patient.join(OnMdt).select()
-            .where(OnMdt.mdt_id == obj.id)
-            .execution_options(loader=Patient)
-        )
-        return patients
+    patients = await PatientsByMdtLoader.load_from_id(
+        context=info.context,
+        id=obj.id
+    )
+    return await with_demographics(info, patients)
 
 
 @MDTObjectType.field("clinicians")
@@ -52,10 +51,7 @@ async def resolve_mdt_clinicians(
     obj: MDT = None,
     info: GraphQLResolveInfo = None,
 ):
-    async with db.acquire(reuse=False) as conn:
-        clinicians: List[User] = await conn.all(
-            User.join(UserMDT).select()
-            .where(UserMDT.mdt_id == obj.id)
-            .execution_options(loader=User)
-        )
-        return clinicians
+    return await UsersByMdtLoader.load_from_id(
+        context=info.context,
+        id=obj.id
+    )
@@ -7,6 +7,7 @@ from dataloaders import (
     ClinicalRequestByIdLoader
 )
 from graphql.type import GraphQLResolveInfo
+from .patient import with_demographics
 
 OnMdtObjectType = ObjectType("OnMdt")
 
@@ -15,8 +16,9 @@ OnMdtObjectType = ObjectType("OnMdt")
 async def resolve_on_mdt_patient(
     obj: OnMdt = None, info: GraphQLResolveInfo = None, *_
 ):
-    return await PatientByIdLoader.load_from_id(
+    patient = await PatientByIdLoader.load_from_id(
         context=info.context, id=obj.patient_id)
+    return (await with_demographics(info, [patient]))[0]
 
 
 @OnMdtObjectType.field("clinician")
@@ -8,6 +8,7 @@ from dataloaders import (
     ClinicalRequestByOnPathwayIdLoader
 )
 from graphql.type import GraphQLResolveInfo
+from .patient import with_demographics
 
 OnPathwayObjectType = ObjectType("OnPathway")
 
@@ -24,8 +25,9 @@ async def resolve_on_pathway_pathway(
 async def resolve_on_pathway_patient(
     obj: OnPathway = None, info: GraphQLResolveInfo = None, *_
 ):
-    return await PatientByIdLoader.load_from_id(
+    patient = await PatientByIdLoader.load_from_id(
         context=info.context, id=obj.patient_id)
+    return (await with_demographics(info, [patient]))[0]
 
 
 @OnPathwayObjectType.field("decisionPoints")
@@ -1,18 +1,54 @@
-from typing import List
+from typing import Iterable, List, Optional, Union
 from ariadne.objects import ObjectType
 from dataloaders import (
     OnPathwaysByPatient,
-    PatientByHospitalNumberFromIELoader,
-    OnMdtByIdLoader
+    OnMdtsByPatientLoader,
+    PatientReadModel
 )
+from graphql.language import FieldNode
 from graphql.type import GraphQLResolveInfo
 from models import Patient, MDT, OnMdt
-from trustadapter.trustadapter import Patient_IE
-from models.db import db
+from gql.selection import selected_field_names
 
 
 PatientObjectType = ObjectType("Patient")
 
+# fields read from the patient's demographics in the TrustAdapter
+DEMOGRAPHIC_FIELDS = frozenset([
+    "firstName",
+    "lastName",
+    "communicationMethod",
+    "dateOfBirth",
+    "sex",
+    "occupation",
+    "telephoneNumber",
+    "address",
+])
+
+
+async def with_demographics(
+    info: GraphQLResolveInfo = None,
+    patients: List[Optional[Patient]] = None,
+    field_nodes: Iterable[FieldNode] = None
+) -> List[Union[Patient, PatientReadModel, None]]:
+    """
+    Merges patients being returned with their demographics, loaded in
+    one batch, if the client selected any of them. The Patient type's
+    demographic fields are then read as attributes
+
+    :param info: resolve info of the field returning the patients
+    :param patients: patients' records
+    :param field_nodes: nodes of the Patient fields, defaults to the
+        nodes of the field being resolved
+
+    :return: List[Patient/PatientReadModel/None]
+    """
+    if DEMOGRAPHIC_FIELDS.isdisjoint(
+        selected_field_names(info, field_nodes)
+    ):
+        return patients
+    return await PatientReadModel.load_many(info.context, patients)
+
 
 @PatientObjectType.field("onPathways")
 async def resolve_patient_pathways(
@@ -33,99 +69,17 @@ async def resolve_patient_pathways(
     )
 
 
-@PatientObjectType.field("firstName")
-async def resolve_first_name(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.first_name
-
-
-@PatientObjectType.field("lastName")
-async def resolve_last_name(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.last_name
-
-
-@PatientObjectType.field("communicationMethod")
-async def resolve_communication_method(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.communication_method
-
-
-@PatientObjectType.field("dateOfBirth")
-async def resolve_date_of_birth(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.date_of_birth
-
-
-@PatientObjectType.field("sex")
-async def resolve_sex(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.sex
-
-
-@PatientObjectType.field("occupation")
-async def resolve_occupation(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.occupation
-
-
-@PatientObjectType.field("telephoneNumber")
-async def resolve_telephone_number(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.telephone_number
-
-
-@PatientObjectType.field("address")
-async def resolve_address(
-    obj: Patient = None, info: GraphQLResolveInfo = None, *_
-):
-    record: Patient_IE = await PatientByHospitalNumberFromIELoader.\
-        load_from_id(
-            context=info.context, id=obj.hospital_number)
-    return record.address
-
-
 @PatientObjectType.field("onMdts")
 async def resolve_mdt_clinicians(
     obj: Patient = None,
     info: GraphQLResolveInfo = None,
     id: int = None
 ):
-    async with db.acquire(reuse=False) as conn:
-        query: str = OnMdt.query.where(OnMdt.patient_id == obj.id)
-        if id is not None:
-            query = query.where(OnMdt.mdt_id == int(id))
-        on_mdt_list: List[OnMdt] = await conn.all(query)
-        for on_mdt in on_mdt_list:
-            OnMdtByIdLoader.prime(
-                context=info.context, key=on_mdt.id, value=on_mdt
-            )
-        return on_mdt_list
+    on_mdt_list: List[OnMdt] = await OnMdtsByPatientLoader.load_from_id(
+        context=info.context, id=obj.id
+    )
+    if id is not None:
+        on_mdt_list = [
+            on_mdt for on_mdt in on_mdt_list if on_mdt.mdt_id == int(id)
+        ]
+    return on_mdt_list
@@ -1,7 +1,6 @@
-from typing import List
 from ariadne.objects import ObjectType
-from models import Role, RolePermission
-from models.db import db
+from models import Role
+from referencedata import reference_data
 RoleObjectType = ObjectType("Role")
 
 
@@ -9,13 +8,5 @@ RoleObjectType = ObjectType("Role")
 async def resolve_role_permissions(
     obj: Role = None, *_
 ):
-    async with db.acquire(reuse=False) as conn:
-        role_permissions_query = db.select([RolePermission]).where(
-            Role.id == RolePermission.role_id
-        ).where(
-            obj.id == RolePermission.role_id
-        )
-        role_permissions: List[RolePermission] = await conn.all(
-            role_permissions_query
-        )
-    return [p.permission for p in role_permissions]
+    role_permissions = (await reference_data.get()).role_permissions
+    return list(role_permissions.get(obj.id, []))
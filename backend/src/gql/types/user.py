@@ -1,8 +1,11 @@
 from ariadne.objects import ObjectType
-from dataloaders import PathwayByIdLoader
-from models import User, Role, UserRole, Pathway, UserPathway
+from dataloaders import (
+    PathwayByIdLoader,
+    PathwaysByUserLoader,
+    RolesByUserLoader
+)
+from models import User
 from graphql.type import GraphQLResolveInfo
-from models.db import db
 
 UserObjectType = ObjectType("User")
 
@@ -17,19 +20,13 @@ async def resolver(obj: User = None, info: GraphQLResolveInfo = None, *_):
 async def resolve_roles(
     obj: User = None, info: GraphQLResolveInfo = None, *_
 ):
-    async with db.acquire(reuse=False) as conn:
-        query = Role.join(UserRole).select()\
-            .where(UserRole.user_id == obj.id)
-        roles = await conn.all(query)
-    return roles
+    return await RolesByUserLoader.load_from_id(
+        context=info.context, id=obj.id)
 
 
 @UserObjectType.field("pathways")
 async def resolve_pathways(
     obj: User = None, info: GraphQLResolveInfo = None, *_
 ):
-    async with db.acquire(reuse=False) as conn:
-        query = Pathway.join(UserPathway).select()\
-            .where(UserPathway.user_id == obj.id)
-        pathways = await conn.all(query)
-    return pathways
+    return await PathwaysByUserLoader.load_from_id(
+        context=info.context, id=obj.id)
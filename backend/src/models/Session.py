@@ -10,5 +10,6 @@ class Session(db.Model):
         db.Integer(), db.ForeignKey('tbl_user.id'), nullable=False
     )
     expiry = db.Column(
-        db.DateTime(), server_default=func.now(), nullable=False
+        db.DateTime(), server_default=func.now(), nullable=False,
+        index=True
     )
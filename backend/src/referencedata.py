@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, TypeVar
+from config import config
+from models import (
+    ClinicalRequestType,
+    Pathway,
+    PathwayClinicalRequestType,
+    Role,
+    RolePermission
+)
+from models.db import db
+
+log = logging.getLogger("uvicorn")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class _ReferenceRows:
+    version: int
+    loaded_at: float
+    pathways: List[Pathway]
+    clinical_request_types: List[ClinicalRequestType]
+    # (pathway ID, clinical request type ID)
+    links: List[Tuple[int, int]]
+    roles: List[Role]
+    # (role ID, permission)
+    role_permissions: List[Tuple[int, str]]
+
+
+def _copy(row: T) -> T:
+    copy = row.__class__()
+    copy.__values__.update(row.__values__)
+    return copy
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """
+    A snapshot of the rarely changing tables, in ID order. Each snapshot
+    has its own copies of the rows, so changing one does not change the
+    cache
+    """
+    version: int
+    pathways: Dict[int, Pathway] = field(default_factory=dict)
+    pathways_by_name: Dict[str, Pathway] = field(default_factory=dict)
+    clinical_request_types: Dict[int, ClinicalRequestType] = field(
+        default_factory=dict
+    )
+    clinical_request_types_by_pathway: Dict[
+        int, List[ClinicalRequestType]
+    ] = field(default_factory=dict)
+    pathways_by_clinical_request_type: Dict[int, List[Pathway]] = field(
+        default_factory=dict
+    )
+    roles: Dict[int, Role] = field(default_factory=dict)
+    role_permissions: Dict[int, List[str]] = field(default_factory=dict)
+
+
+class ReferenceDataCache:
+    """
+    Process-wide cache of pathways, clinical request types, roles and
+    their links. Mutations changing these tables call `invalidate`
+    once their changes are committed, and the next read loads them
+    again. Rows live for at most `ttl` seconds, which bounds how long
+    changes made by other processes go unseen. Rows loaded while an
+    invalidation happened are used by the read that loaded them, but
+    not kept
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl
+        self._version = 0
+        self._rows: Optional[_ReferenceRows] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def version(self) -> int:
+        """
+        The current version, increased by each invalidation
+        """
+        return self._version
+
+    def invalidate(self):
+        """
+        Drops the cached rows
+        """
+        self._version += 1
+        self._rows = None
+
+    def _current(self) -> Optional[_ReferenceRows]:
+        rows = self._rows
+        if rows is None or rows.version != self._version:
+            return None
+        if monotonic() - rows.loaded_at >= self.ttl:
+            return None
+        return rows
+
+    async def get(self) -> ReferenceData:
+        """
+        Gets a snapshot of the cached rows, loading them if needed
+
+        :return: ReferenceData
+        """
+        rows = self._current()
+        if rows is not None:
+            return self._snapshot(rows)
+
+        # created lazily so it belongs to the running event loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+
+        async with self._lock:
+            rows = self._current()
+            if rows is None:
+                version = self._version
+                rows = await self._load(version)
+                if version == self._version:
+                    self._rows = rows
+        return self._snapshot(rows)
+
+    async def get_clinical_request_type(
+        self, id: int = None
+    ) -> Optional[ClinicalRequestType]:
+        """
+        Gets a clinical request type, reading it from the database if it
+        was created outside of this process since the snapshot was loaded
+
+        :param id: ID of the clinical request type
+
+        :return: ClinicalRequestType/None
+        """
+        clinical_request_types = (await self.get()).clinical_request_types
+        clinical_request_type = clinical_request_types.get(id)
+        if clinical_request_type is None:
+            clinical_request_type = await ClinicalRequestType.get(id)
+        return clinical_request_type
+
+    async def warm(self):
+        """
+        Loads a snapshot ahead of the first request
+        """
+        try:
+            await self.get()
+        except Exception as e:
+            log.error(f"Failed to load reference data: {e}")
+
+    async def _load(self, version: int) -> _ReferenceRows:
+        async with db.acquire(reuse=False) as conn:
+            pathways: List[Pathway] = await conn.all(
+                Pathway.query.order_by(Pathway.id)
+            )
+            clinical_request_types: List[ClinicalRequestType] = \
+                await conn.all(
+                    ClinicalRequestType.query.order_by(ClinicalRequestType.id)
+                )
+            links: List[PathwayClinicalRequestType] = await conn.all(
+                PathwayClinicalRequestType.query.order_by(
+                    PathwayClinicalRequestType.pathway_id,
+                    PathwayClinicalRequestType.clinical_request_type_id
+                )
+            )
+            roles: List[Role] = await conn.all(Role.query.order_by(Role.id))
+            role_permissions: List[RolePermission] = await conn.all(
+                RolePermission.query.order_by(
+                    RolePermission.role_id, RolePermission.permission
+                )
+            )
+
+        return _ReferenceRows(
+            version=version,
+            loaded_at=monotonic(),
+            pathways=pathways,
+            clinical_request_types=clinical_request_types,
+            links=[
+                (link.pathway_id, link.clinical_request_type_id)
+                for link in links
+            ],
+            roles=roles,
+            role_permissions=[
+                (role_permission.role_id, role_permission.permission)
+                for role_permission in role_permissions
+            ],
+        )
+
+    @staticmethod
+    def _snapshot(rows: _ReferenceRows) -> ReferenceData:
+        pathways = [_copy(p) for p in rows.pathways]
+        data = ReferenceData(
+            version=rows.version,
+            pathways={p.id: p for p in pathways},
+            pathways_by_name={p.name: p for p in pathways},
+            clinical_request_types={
+                t.id: _copy(t) for t in rows.clinical_request_types
+            },
+            roles={r.id: _copy(r) for r in rows.roles},
+        )
+        for pathway_id, clinical_request_type_id in rows.links:
+            pathway = data.pathways[pathway_id]
+            clinical_request_type = data.clinical_request_types[
+                clinical_request_type_id
+            ]
+            data.clinical_request_types_by_pathway.setdefault(
+                pathway.id, []
+            ).append(clinical_request_type)
+            data.pathways_by_clinical_request_type.setdefault(
+                clinical_request_type.id, []
+            ).append(pathway)
+        for role_id, permission in rows.role_permissions:
+            data.role_permissions.setdefault(role_id, []).append(permission)
+        return data
+
+
+reference_data = ReferenceDataCache(
+    ttl=float(config.get('REFERENCE_DATA_TTL', 60)),
+)
@@ -9,3 +9,5 @@ from .createrole import _FastAPI
 from .updaterole import _FastAPI
 from .deleterole import _FastAPI
 from .updateuser import _FastAPI
+from .trustadapterstatus import _FastAPI
+from .passwordhasherstatus import _FastAPI
@@ -7,6 +7,9 @@ from starlette.responses import JSONResponse
 from fastapi import Request
 from pydantic import BaseModel
 from authentication.authentication import needsAuthorization
+from authentication.sessioncache import session_cache
+from authentication.permissionchanges import permission_changes
+from referencedata import reference_data
 
 
 class DeleteRoleInput(BaseModel):
@@ -31,6 +34,9 @@ async def create_role(request: Request, input: DeleteRoleInput):
         RolePermission.role_id == input.id
     ).gino.status()
     await role.delete()
+    reference_data.invalidate()
+    session_cache.clear()
+    permission_changes.publish()
 
     return JSONResponse({
         "success": True
@@ -0,0 +1,17 @@
+import dataclasses
+from .api import _FastAPI
+from fastapi import Request
+from authentication.authentication import needsAuthorization
+from authentication.passwords import password_hasher
+from SdTypes import Permissions
+
+
+@_FastAPI.get("/passwordhasher/status/")
+@needsAuthorization([Permissions.AUTHENTICATED])
+async def password_hasher_status(request: Request):
+    """
+    Reports how many password hashes and checks are waiting for and
+    running in the hashing pool, the most that have waited at once, and
+    how many have completed
+    """
+    return dataclasses.asdict(password_hasher.stats)
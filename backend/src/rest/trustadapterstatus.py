@@ -0,0 +1,21 @@
+import dataclasses
+from .api import _FastAPI
+from fastapi import Request
+from authentication.authentication import needsAuthorization
+from SdTypes import Permissions
+from trustadapter.circuitbreaker import trust_adapter_circuit_breaker
+from trustadapter.patientcache import patient_cache
+
+
+@_FastAPI.get("/trustadapter/status/")
+@needsAuthorization([Permissions.AUTHENTICATED])
+async def trust_adapter_status(request: Request):
+    """
+    Reports the state of the circuit to the trust integration engine,
+    with the error rate and p95 latency in seconds it is judged by, and
+    the hit and refresh counts of the patient cache in front of it
+    """
+    return {
+        **dataclasses.asdict(trust_adapter_circuit_breaker.stats),
+        "patient_cache": dataclasses.asdict(patient_cache.stats),
+    }
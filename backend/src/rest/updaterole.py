@@ -8,6 +8,9 @@ from .api import _FastAPI
 from fastapi import Request
 from pydantic import BaseModel
 from authentication.authentication import needsAuthorization
+from authentication.sessioncache import session_cache
+from authentication.permissionchanges import permission_changes
+from referencedata import reference_data
 from asyncpg.exceptions import UniqueViolationError
 from .restexceptions import ConflictHTTPException, NotFoundHTTPException
 
@@ -60,3 +63,9 @@ async def update_role(request: Request, input: UpdateRoleInput):
 
     except UniqueViolationError:
         raise ConflictHTTPException("Role with that name already exists")
+    finally:
+        # once the transaction has ended, so no request caches what it
+        # held before again
+        reference_data.invalidate()
+        session_cache.clear()
+        permission_changes.publish()
@@ -9,13 +9,15 @@ from .api import _FastAPI
 from fastapi import Request
 from pydantic import BaseModel
 from authentication.authentication import needsAuthorization
+from authentication.sessioncache import session_cache
+from authentication.permissionchanges import permission_changes
+from authentication.passwords import password_hasher
 from .restexceptions import (
     NotFoundHTTPException,
     ConflictHTTPException,
     UnprocessableHTTPException
 )
 from asyncpg.exceptions import UniqueViolationError
-from bcrypt import hashpw, gensalt
 
 
 class UpdateUserInput(BaseModel):
@@ -42,10 +44,7 @@ async def update_user(request: Request, input: UpdateUserInput):
     if user is None:
         raise NotFoundHTTPException("User does not exist")
 
-    updated_password = hashpw(
-        input.password.encode('utf-8'),
-        gensalt()
-    ).decode('utf-8')
+    updated_password = await password_hasher.hash_password(input.password)
 
     try:
         async with db.acquire() as conn:
@@ -147,3 +146,8 @@ async def update_user(request: Request, input: UpdateUserInput):
                 }
     except UniqueViolationError:
         raise ConflictHTTPException("Unique violation error")
+    finally:
+        # once the transaction has ended, so no request caches the old
+        # permissions again
+        session_cache.invalidate_user(user.id)
+        permission_changes.publish(user.id)
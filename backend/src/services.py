@@ -2,9 +2,12 @@ import logging
 from typing import Optional, List, Any, Union
 
 from trustadapter import TrustAdapter
+from trustadapter.circuitbreaker import CircuitBreaker
+from trustadapter.healthmonitor import HealthMonitor
 from sdpubsub import SdPubSub
 from trustadapter.trustadapter import (
-    Patient_IE, TestResult_IE, TestResultRequest_IE
+    Patient_IE, TestResult_IE, TestResultRequest_IE,
+    TestResultRequestImmediately_IE, TrustIntegrationCommunicationError
 )
 from email_adapter import EmailAdapter
 from exchangelib import FileAttachment, HTMLBody
@@ -54,17 +57,57 @@ class PubSubService(BaseService):
 
 
 class TrustAdapterService(BaseService):
-    def __init__(self, trust_adapter_client: TrustAdapter = None):
+    def __init__(
+        self, trust_adapter_client: TrustAdapter = None,
+        circuit_breaker: CircuitBreaker = None,
+        health_monitor: HealthMonitor = None
+    ):
         if trust_adapter_client is None:
             raise Exception("No TrustAdapter supplied")
         self._trust_adapter_client = trust_adapter_client
+        self._circuit_breaker = circuit_breaker
+        self._health_monitor = health_monitor
         super().__init__()
 
+    async def _call(self, func, *args, **kwargs):
+        try:
+            if self._circuit_breaker is None:
+                result = await func(*args, **kwargs)
+            else:
+                result = await self._circuit_breaker.call(
+                    func, *args, **kwargs
+                )
+        except TrustIntegrationCommunicationError as e:
+            if self._health_monitor is not None:
+                self._health_monitor.record_failure(e)
+            raise
+        if self._health_monitor is not None:
+            self._health_monitor.record_success()
+        return result
+
+    def raise_if_unavailable(self):
+        """
+        Raises if the trust integration engine was last found
+        unavailable, without calling it
+
+        :raise TrustIntegrationCommunicationError: the trust integration
+            engine is unavailable
+        """
+        if self._health_monitor is not None:
+            self._health_monitor.raise_if_unhealthy()
+
     async def test_connection(self, auth_token: str = None):
         """
         Tests the connection to the trust integration engine
         :return: Boolean success state of connection
+
+        :raise TrustIntegrationCommunicationError: the connection failed
         """
+        await self._call(
+            self._trust_adapter_client.test_connection,
+            auth_token=auth_token
+        )
+        return True
 
     async def create_patient(
         self, patient: Patient_IE, auth_token: str = None
@@ -75,7 +118,8 @@ class TrustAdapterService(BaseService):
         :param patient: Patient to input
         :return: String ID of created patient
         """
-        return await self._trust_adapter_client.create_patient(
+        return await self._call(
+            self._trust_adapter_client.create_patient,
             patient=patient, auth_token=auth_token)
 
     async def load_patient(
@@ -87,7 +131,8 @@ class TrustAdapterService(BaseService):
         :param hospitalNumber: String ID of patient
         :return: Patient if found, null if not
         """
-        return await self._trust_adapter_client.load_patient(
+        return await self._call(
+            self._trust_adapter_client.load_patient,
             hospitalNumber=hospitalNumber, auth_token=auth_token)
 
     async def load_many_patients(
@@ -99,7 +144,8 @@ class TrustAdapterService(BaseService):
         :param hospitalNumbers: List of patient ids to load
         :return: List of patients, or empty list if none found
         """
-        return await self._trust_adapter_client.load_many_patients(
+        return await self._call(
+            self._trust_adapter_client.load_many_patients,
             hospitalNumbers=hospitalNumbers, auth_token=auth_token
         )
 
@@ -112,7 +158,8 @@ class TrustAdapterService(BaseService):
         :param testResult: Test result to create
         :return: String ID of created test result
         """
-        return await self._trust_adapter_client.create_test_result(
+        return await self._call(
+            self._trust_adapter_client.create_test_result,
             testResult=testResult, auth_token=auth_token)
 
     async def load_test_result(
@@ -124,7 +171,8 @@ class TrustAdapterService(BaseService):
         :param recordId: ID of test result to load
         :return: Test result, or null if test result not found
         """
-        return await self._trust_adapter_client.load_test_result(
+        return await self._call(
+            self._trust_adapter_client.load_test_result,
             recordId=recordId, auth_token=auth_token)
 
     async def load_many_test_results(
@@ -136,7 +184,8 @@ class TrustAdapterService(BaseService):
         :param recordIds: IDs of test results to load
         :return: List of test results, or empty list if none found
         """
-        return await self._trust_adapter_client.load_many_test_results(
+        return await self._call(
+            self._trust_adapter_client.load_many_test_results,
             recordIds=recordIds, auth_token=auth_token)
 
     async def patient_search(self, query: str) -> List[Patient_IE]:
@@ -145,14 +194,16 @@ class TrustAdapterService(BaseService):
         :param query: free-form text string
         :return: List of patients
         """
-        return await self._trust_adapter_client.patient_search(query)
+        return await self._call(
+            self._trust_adapter_client.patient_search, query)
 
     async def clear_database(self) -> bool:
         """
         Clears pseudotie database
         :return: boolean success
         """
-        return await self._trust_adapter_client.clear_database()
+        return await self._call(
+            self._trust_adapter_client.clear_database)
 
     async def create_test_result_immediately(
         self, testResult: TestResultRequest_IE = None, auth_token: str = None
@@ -163,5 +214,24 @@ class TrustAdapterService(BaseService):
         :param testResult: Test result to create
         :return: String ID of created test result
         """
-        return await self._trust_adapter_client.create_test_result_immediately(
+        return await self._call(
+            self._trust_adapter_client.create_test_result_immediately,
             testResult=testResult, auth_token=auth_token)
+
+    async def create_many_test_results(
+        self,
+        testResults: List[
+            Union[TestResultRequest_IE, TestResultRequestImmediately_IE]
+        ] = None,
+        auth_token: str = None
+    ) -> List[TestResult_IE]:
+        """
+        Create many test results in one call
+        :param auth_token: Auth token string to pass to backend
+        :param testResults: Test results to create, immediately if given
+            as TestResultRequestImmediately_IE
+        :return: List of created test results, in the order requested
+        """
+        return await self._call(
+            self._trust_adapter_client.create_many_test_results,
+            testResults=testResults, auth_token=auth_token)
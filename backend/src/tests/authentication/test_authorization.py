@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+from ariadne.format_error import GraphQLError
+from hamcrest import assert_that, equal_to
+
+from SdTypes import Permissions
+from authentication.authentication import (
+    needsAuthorization, SDAuthCredentials
+)
+
+
+def make_info(scopes):
+    request = SimpleNamespace(auth=SDAuthCredentials(scopes=scopes))
+    return SimpleNamespace(context={'request': request})
+
+
+def test_needs_authorization_does_not_modify_required_scopes():
+    """
+    Given a resolver decorated with a list of permissions
+    When it is called repeatedly
+    Then the list is left as it was
+    """
+    required_scopes = [Permissions.PATIENT_READ]
+
+    @needsAuthorization(required_scopes)
+    def resolver(obj=None, info=None):
+        return True
+
+    info = make_info([Permissions.AUTHENTICATED, Permissions.PATIENT_READ])
+    for _ in range(3):
+        assert_that(resolver(None, info), equal_to(True))
+
+    assert_that(required_scopes, equal_to([Permissions.PATIENT_READ]))
+
+
+def test_needs_authorization_requires_authenticated():
+    """
+    Given a resolver decorated with a permission
+    When the user has the permission but is not authenticated
+    Then an error is raised
+    """
+    @needsAuthorization([Permissions.PATIENT_READ])
+    def resolver(obj=None, info=None):
+        return True
+
+    with pytest.raises(GraphQLError):
+        resolver(None, make_info([Permissions.PATIENT_READ]))
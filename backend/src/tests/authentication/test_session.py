@@ -1,18 +1,24 @@
 import datetime
 
 import pytest
-from hamcrest import assert_that, equal_to, is_not
+from hamcrest import assert_that, equal_to, greater_than
 
 from tests.conftest import UserFixture
 from models import Session
+from authentication.sessionextender import session_extender
+from authentication.sessionreaper import ExpiredSessionReaper
 
 
 async def test_session_valid(login_user, test_user: UserFixture, test_client, role_create_permission):
     """
-    Test valid session. Just assert that this operation succeeds, we'll pick creating
-    roles because we need an endpoint
+    Test valid session. Just assert that this operation succeeds, we'll
+    pick creating roles because we need an endpoint. Expiry extensions are
+    written behind, so flush them before checking the session
     """
     session = await Session.query.where(Session.user_id == test_user.user.id).gino.one_or_none()
+    await session.update(
+        expiry=datetime.datetime.now() + datetime.timedelta(seconds=60)
+    ).apply()
     role_name = "new-test-role"
     res = await test_client.post(
         path="/rest/createrole/",
@@ -20,15 +26,40 @@ async def test_session_valid(login_user, test_user: UserFixture, test_client, ro
             "name": role_name
         }
     )
-    updated_session = await Session.query.where(Session.user_id == test_user.user.id).gino.one_or_none()
+    assert_that(await session_extender.flush(), equal_to(1))
+    updated_session = await Session.query.where(
+        Session.user_id == test_user.user.id).gino.one_or_none()
 
     assert_that(res.status_code, equal_to(200))
     assert_that(
         updated_session.expiry.timestamp(),
-        is_not(equal_to(session.expiry.timestamp()))
+        greater_than(session.expiry.timestamp())
     )
 
 
+async def test_session_recent_expiry_not_written(
+    login_user, test_user: UserFixture, test_client, role_create_permission
+):
+    """
+    Given a session that was extended moments ago, at login
+    When it is used
+    Then its expiry is not written again
+    """
+    session = await Session.query.where(
+        Session.user_id == test_user.user.id).gino.one_or_none()
+    res = await test_client.post(
+        path="/rest/createrole/",
+        json={
+            "name": "new-test-role"
+        }
+    )
+    assert_that(res.status_code, equal_to(200))
+    assert_that(await session_extender.flush(), equal_to(0))
+    updated_session = await Session.query.where(
+        Session.user_id == test_user.user.id).gino.one_or_none()
+    assert_that(updated_session.expiry, equal_to(session.expiry))
+
+
 async def test_session_invalid(login_user, test_user: UserFixture, test_client, role_create_permission):
     """
     Invalid the session in the database
@@ -62,3 +93,58 @@ async def test_session_timeout(login_user, test_user: UserFixture, test_client,
     )
 
     assert_that(res.status_code, equal_to(403))
+
+
+async def test_session_logout_invalidates_cache(
+    login_user, test_user: UserFixture, test_client, role_create_permission
+):
+    """
+    Given a session that has been cached by an earlier request
+    When the user logs out
+    Then the session is no longer accepted
+    """
+    res = await test_client.post(
+        path="/rest/createrole/",
+        json={
+            "name": "new-test-role"
+        }
+    )
+    assert_that(res.status_code, equal_to(200))
+
+    cookie = test_client.cookie_jar.get("SDSESSION")
+    await test_client.post(path="/rest/logout/")
+    test_client.cookie_jar["SDSESSION"] = cookie
+
+    res = await test_client.post(
+        path="/rest/createrole/",
+        json={
+            "name": "another-test-role"
+        }
+    )
+    assert_that(res.status_code, equal_to(403))
+
+
+async def test_session_reaper_deletes_expired(test_user: UserFixture):
+    """
+    Given more expired sessions than fit in one batch, and a live session
+    When the reaper runs
+    Then only the expired sessions are deleted
+    """
+    now = datetime.datetime.now()
+    await Session.insert().gino.all([
+        {
+            "session_key": f"expired-{i}",
+            "user_id": test_user.user.id,
+            "expiry": now - datetime.timedelta(minutes=1),
+        } for i in range(5)
+    ] + [{
+        "session_key": "live",
+        "user_id": test_user.user.id,
+        "expiry": now + datetime.timedelta(minutes=10),
+    }])
+
+    reaper = ExpiredSessionReaper(interval=60, batch_size=2, pause=0)
+    assert_that(await reaper.reap(), equal_to(5))
+
+    remaining = await Session.query.gino.all()
+    assert_that([s.session_key for s in remaining], equal_to(["live"]))
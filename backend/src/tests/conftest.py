@@ -31,6 +31,13 @@ from models import (
     ClinicalRequest
 )
 from api import app
+from authentication.sessioncache import session_cache
+from authentication.sessionextender import session_extender
+from referencedata import reference_data
+from trustadapter.patientcache import patient_cache
+from trustadapter.testresultcache import test_result_cache
+from trustadapter.circuitbreaker import trust_adapter_circuit_breaker
+from trustadapter.healthmonitor import trust_adapter_health_monitor
 from sqlalchemy_utils import database_exists, create_database, drop_database
 from trustadapter import TrustAdapter
 from email_adapter import EmailAdapter
@@ -65,6 +72,13 @@ async def create_test_database() -> Gino:
     engine = await db.set_bind(TEST_DATABASE_URL)
     await db.gino.create_all()
     yield engine
+    session_cache.clear()
+    session_extender.clear()
+    reference_data.invalidate()
+    patient_cache.clear()
+    await test_result_cache.clear()
+    trust_adapter_circuit_breaker.reset()
+    trust_adapter_health_monitor.reset()
     drop_database(TEST_DATABASE_URL)
 
 
@@ -0,0 +1,83 @@
+import asyncio
+from typing import List
+
+from hamcrest import assert_that, equal_to
+
+from models import db, MDT, OnMdt, UserMDT
+from dataloaders import (
+    OnMdtsByPatientLoader,
+    PatientByIdLoader,
+    PathwaysByUserLoader,
+    PatientsByMdtLoader,
+    RolesByUserLoader,
+    UsersByMdtLoader,
+)
+
+
+async def test_association_loaders_by_mdt(
+    test_user, test_mdts: List[MDT], test_on_mdts: List[OnMdt]
+):
+    """
+    Given patients on one MDT and a clinician on the other
+    When the MDTs' patients and clinicians are loaded together
+    Then each MDT gets its own, and the patients are primed in
+    PatientByIdLoader
+    """
+    await UserMDT.create(mdt_id=test_mdts[1].id, user_id=test_user.user.id)
+
+    context = {'db': db}
+    patient_lists, clinician_lists = await asyncio.gather(
+        asyncio.gather(*[
+            PatientsByMdtLoader.load_from_id(context=context, id=mdt.id)
+            for mdt in test_mdts
+        ]),
+        asyncio.gather(*[
+            UsersByMdtLoader.load_from_id(context=context, id=mdt.id)
+            for mdt in test_mdts
+        ])
+    )
+
+    expected_patient_ids = sorted(om.patient_id for om in test_on_mdts)
+    assert_that(
+        [[p.id for p in patients] for patients in patient_lists],
+        equal_to([expected_patient_ids, []])
+    )
+    assert_that(
+        [[u.id for u in users] for users in clinician_lists],
+        equal_to([[], [test_user.user.id]])
+    )
+
+    by_id_loader = context[PatientByIdLoader.loader_name]
+    assert_that(
+        [by_id_loader._cache[p.id].result() for p in patient_lists[0]],
+        equal_to(patient_lists[0])
+    )
+
+
+async def test_association_loaders_by_user_and_patient(
+    test_user, test_role, test_pathway, test_on_mdts: List[OnMdt]
+):
+    """
+    Given a user with a role and pathway, and patients on an MDT
+    When the user's roles and pathways and the patients' OnMdts are loaded
+    Then each parent gets its own linked records
+    """
+    context = {'db': db}
+    roles, pathways, on_mdt_lists = await asyncio.gather(
+        RolesByUserLoader.load_from_id(context=context, id=test_user.user.id),
+        PathwaysByUserLoader.load_from_id(
+            context=context, id=test_user.user.id
+        ),
+        asyncio.gather(*[
+            OnMdtsByPatientLoader.load_from_id(
+                context=context, id=om.patient_id
+            ) for om in test_on_mdts
+        ])
+    )
+
+    assert_that([r.id for r in roles], equal_to([test_role.id]))
+    assert_that([p.id for p in pathways], equal_to([test_pathway.id]))
+    assert_that(
+        [[om.id for om in on_mdts] for on_mdts in on_mdt_lists],
+        equal_to([[om.id] for om in test_on_mdts])
+    )
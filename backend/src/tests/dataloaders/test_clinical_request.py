@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from SdTypes import ClinicalRequestState, DecisionTypes
+from models import db, ClinicalRequest, DecisionPoint, OnPathway
+from dataloaders import (
+    ClinicalRequestByIdLoader,
+    ClinicalRequestByOnPathwayIdLoader,
+    ClinicalRequestsByDecisionPointIdLoader,
+    ClinicalRequestsByForwardDecisionPointIdLoader,
+)
+
+
+@pytest.fixture
+async def test_clinical_requests(
+    test_patients_on_pathway: List[OnPathway], test_clinical_request_type
+) -> List[ClinicalRequest]:
+    """
+    Three clinical requests per OnPathway, the middle one outstanding
+    """
+    clinical_requests = []
+    updated_at = datetime(2022, 1, 1)
+    for on_pathway in test_patients_on_pathway:
+        for state in [
+            ClinicalRequestState.INIT,
+            ClinicalRequestState.COMPLETED,
+            ClinicalRequestState.INIT,
+        ]:
+            updated_at += timedelta(minutes=1)
+            clinical_requests.append(await ClinicalRequest.create(
+                on_pathway_id=on_pathway.id,
+                current_state=state,
+                clinical_request_type_id=test_clinical_request_type.id,
+                updated_at=updated_at
+            ))
+    return clinical_requests
+
+
+async def test_clinical_requests_by_on_pathway(
+    test_patients_on_pathway, test_clinical_requests
+):
+    """
+    Given OnPathways with clinical requests
+    When they are loaded together with different filters
+    Then each OnPathway gets its own, most recently updated first unless
+    the limit is 0
+    """
+    context = {'db': db}
+
+    async def load_all(**kwargs):
+        return await asyncio.gather(*[
+            ClinicalRequestByOnPathwayIdLoader.load_from_id(
+                context=context, id=op.id, **kwargs
+            ) for op in test_patients_on_pathway
+        ])
+
+    all_lists, added_lists, limited_lists, outstanding_lists = \
+        await asyncio.gather(
+            load_all(), load_all(limit=0), load_all(limit=2),
+            load_all(outstanding=True, limit=2)
+        )
+
+    for index, op in enumerate(test_patients_on_pathway):
+        expected = [
+            cr.id for cr in reversed(test_clinical_requests)
+            if cr.on_pathway_id == op.id
+        ]
+        assert_that([cr.id for cr in all_lists[index]], equal_to(expected))
+        assert_that(
+            [cr.id for cr in added_lists[index]],
+            equal_to(list(reversed(expected)))
+        )
+        assert_that(
+            [cr.id for cr in limited_lists[index]], equal_to(expected[:2])
+        )
+        assert_that(
+            [cr.id for cr in outstanding_lists[index]],
+            equal_to([expected[1]])
+        )
+
+
+async def test_clinical_requests_by_decision_point(
+    test_patients_on_pathway, test_clinical_request_type, test_user
+):
+    """
+    Given decision points with clinical requests made and resolved at them
+    When they are loaded together
+    Then each decision point gets its own, newest first, and the clinical
+    requests are primed in ClinicalRequestByIdLoader
+    """
+    expected = {}
+    added_at = datetime(2022, 1, 1)
+    for on_pathway in test_patients_on_pathway:
+        triage, clinic = [
+            await DecisionPoint.create(
+                clinician_id=test_user.user.id,
+                on_pathway_id=on_pathway.id,
+                decision_type=decision_type,
+                clinic_history="history",
+                comorbidities="comorbidities",
+            ) for decision_type in [DecisionTypes.TRIAGE, DecisionTypes.CLINIC]
+        ]
+        made = []
+        for resolved_at in [clinic, None]:
+            added_at += timedelta(minutes=1)
+            made.append(await ClinicalRequest.create(
+                on_pathway_id=on_pathway.id,
+                decision_point_id=triage.id,
+                fwd_decision_point_id=resolved_at and resolved_at.id,
+                clinical_request_type_id=test_clinical_request_type.id,
+                added_at=added_at
+            ))
+        expected[triage.id] = ([cr.id for cr in reversed(made)], [])
+        expected[clinic.id] = ([], [made[0].id])
+
+    context = {'db': db}
+    made_lists, resolved_lists = await asyncio.gather(
+        asyncio.gather(*[
+            ClinicalRequestsByDecisionPointIdLoader.load_from_id(
+                context=context, id=id
+            ) for id in expected
+        ]),
+        asyncio.gather(*[
+            ClinicalRequestsByForwardDecisionPointIdLoader.load_from_id(
+                context=context, id=id
+            ) for id in expected
+        ])
+    )
+
+    for id, made, resolved in zip(expected, made_lists, resolved_lists):
+        assert_that(
+            ([cr.id for cr in made], [cr.id for cr in resolved]),
+            equal_to(expected[id])
+        )
+
+    by_id_loader = context[ClinicalRequestByIdLoader.loader_name]
+    primed = [cr for made in made_lists for cr in made]
+    assert_that(
+        [by_id_loader._cache[cr.id].result().id for cr in primed],
+        equal_to([cr.id for cr in primed])
+    )
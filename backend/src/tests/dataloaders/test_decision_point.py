@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from SdTypes import DecisionTypes
+from models import db, DecisionPoint, OnPathway
+from dataloaders import DecisionPointsByOnPathway, DecisionPointsByPatient
+
+
+@pytest.fixture
+async def test_decision_points(
+    test_patients_on_pathway: List[OnPathway], test_user
+) -> List[DecisionPoint]:
+    """
+    Three decision points per OnPathway, the last a clinic decision
+    """
+    decision_points = []
+    added_at = datetime(2022, 1, 1)
+    for on_pathway in test_patients_on_pathway:
+        for decision_type in [
+            DecisionTypes.TRIAGE, DecisionTypes.TRIAGE, DecisionTypes.CLINIC
+        ]:
+            added_at += timedelta(minutes=1)
+            decision_points.append(await DecisionPoint.create(
+                clinician_id=test_user.user.id,
+                on_pathway_id=on_pathway.id,
+                decision_type=decision_type,
+                clinic_history="history",
+                comorbidities="comorbidities",
+                added_at=added_at
+            ))
+    return decision_points
+
+
+async def test_decision_points_by_on_pathway(
+    test_patients_on_pathway, test_decision_points
+):
+    """
+    Given OnPathways with decision points
+    When they are loaded together, with and without a limit
+    Then each OnPathway gets its own, newest first
+    """
+    context = {'db': db}
+    all_lists, limited_lists = await asyncio.gather(
+        asyncio.gather(*[
+            DecisionPointsByOnPathway.load_many_from_id(
+                context=context, id=op.id
+            ) for op in test_patients_on_pathway
+        ]),
+        asyncio.gather(*[
+            DecisionPointsByOnPathway.load_many_from_id(
+                context=context, id=op.id, limit=2
+            ) for op in test_patients_on_pathway
+        ])
+    )
+
+    for op, all_dps, limited_dps in zip(
+        test_patients_on_pathway, all_lists, limited_lists
+    ):
+        expected = sorted(
+            [dp.id for dp in test_decision_points
+                if dp.on_pathway_id == op.id],
+            reverse=True
+        )
+        assert_that([dp.id for dp in all_dps], equal_to(expected))
+        assert_that([dp.id for dp in limited_dps], equal_to(expected[:2]))
+
+
+async def test_decision_points_by_patient(
+    test_patients_on_pathway, test_pathway, test_decision_points
+):
+    """
+    Given patients with decision points
+    When they are loaded together, filtered by type and limited
+    Then each patient gets their own newest matching decision point
+    """
+    context = {'db': db}
+    results = await asyncio.gather(*[
+        DecisionPointsByPatient.load_from_id(
+            context=context, id=op.patient_id, pathwayId=test_pathway.id,
+            decisionType=DecisionTypes.TRIAGE, limit=1
+        ) for op in test_patients_on_pathway
+    ])
+
+    for op, decision_points in zip(test_patients_on_pathway, results):
+        expected = [
+            dp.id for dp in test_decision_points
+            if dp.on_pathway_id == op.id
+            and dp.decision_type == DecisionTypes.TRIAGE
+        ][-1:]
+        assert_that([dp.id for dp in decision_points], equal_to(expected))
@@ -0,0 +1,147 @@
+from unittest.mock import patch
+
+import pytest
+from hamcrest import assert_that, equal_to, is_, same_instance
+
+from datacreators import CreatePathway
+from dataloaders import (
+    ClinicalRequestTypeLoaderByPathwayId,
+    PathwayByIdLoader,
+    PathwayLoaderByClinicalRequestType,
+)
+from dataupdaters import UpdatePathway
+from models import (
+    db, ClinicalRequestType, Pathway, PathwayClinicalRequestType
+)
+from referencedata import reference_data
+
+
+async def test_reference_data_invalidated_by_create_pathway(
+    test_pathway, test_clinical_request_type
+):
+    """
+    Given reference data has been loaded
+    When a pathway is created
+    Then the next read loads the rows again including it, which later
+    reads share
+    """
+    await reference_data.get()
+    rows = reference_data._rows
+    await reference_data.get()
+    assert_that(reference_data._rows, same_instance(rows))
+
+    payload = await CreatePathway(
+        context={'db': db},
+        name="new pathway",
+        clinical_request_types=[{'id': test_clinical_request_type.id}]
+    )
+    created: Pathway = payload.pathway
+
+    context = {'db': db}
+    pathways = await PathwayLoaderByClinicalRequestType.load_from_id(
+        context=context, id=test_clinical_request_type.id
+    )
+    clinical_request_types = await ClinicalRequestTypeLoaderByPathwayId.\
+        load_from_id(context=context, id=created.id)
+
+    assert_that(
+        [p.id for p in pathways], equal_to([test_pathway.id, created.id])
+    )
+    assert_that(
+        [t.id for t in clinical_request_types],
+        equal_to([test_clinical_request_type.id])
+    )
+    assert_that(
+        (await reference_data.get()).version,
+        equal_to(reference_data.version)
+    )
+
+
+async def test_reference_data_falls_back_for_uncached_pathway(test_pathway):
+    """
+    Given reference data has been loaded
+    When a pathway is created outside of this process
+    Then it can still be loaded by ID
+    """
+    await reference_data.get()
+    pathway: Pathway = await Pathway.create(name="created elsewhere")
+
+    loaded = await PathwayByIdLoader.load_from_id(
+        context={'db': db}, id=pathway.id
+    )
+    assert_that(loaded.name, is_("created elsewhere"))
+
+
+async def test_reference_data_invalidated_by_failed_pathway_changes(
+    test_pathway, test_clinical_request_type
+):
+    """
+    Given reference data has been loaded
+    When a pathway is created, and another renamed, but linking their
+    clinical request types fails
+    Then the next read loads a new snapshot with the pathway as written
+    """
+    other_type: ClinicalRequestType = await ClinicalRequestType.create(
+        name="Other ClinicalRequest", ref_name="ref_other_clinical_request"
+    )
+    await reference_data.get()
+
+    with patch.object(
+        PathwayClinicalRequestType, "create", side_effect=RuntimeError
+    ):
+        with pytest.raises(RuntimeError):
+            await CreatePathway(
+                context={'db': db},
+                name="new pathway",
+                clinical_request_types=[{'id': test_clinical_request_type.id}]
+            )
+        with pytest.raises(RuntimeError):
+            await UpdatePathway(
+                context={'db': db},
+                id=test_pathway.id,
+                name="renamed pathway",
+                clinical_request_types=[{'id': other_type.id}]
+            )
+
+    snapshot = await reference_data.get()
+    assert_that(
+        sorted(snapshot.pathways_by_name),
+        equal_to(["new pathway", "renamed pathway"])
+    )
+
+
+async def test_reference_data_expires(test_pathway):
+    """
+    Given reference data has been loaded
+    When a pathway is renamed by another process, so nothing is
+    invalidated in this one, and the rows outlive their TTL
+    Then the next read loads them again
+    """
+    await reference_data.get()
+    await test_pathway.update(name="renamed elsewhere").apply()
+
+    with patch.object(reference_data, "ttl", 0):
+        snapshot = await reference_data.get()
+
+    assert_that(
+        snapshot.pathways[test_pathway.id].name, equal_to("renamed elsewhere")
+    )
+
+
+async def test_reference_data_snapshots_do_not_share_rows(test_pathway):
+    """
+    Given reference data has been loaded
+    When a request changes a pathway it was given
+    Then other reads are not affected
+    """
+    snapshot = await reference_data.get()
+    snapshot.pathways[test_pathway.id].name = "changed"
+
+    snapshot = await reference_data.get()
+    assert_that(
+        snapshot.pathways[test_pathway.id].name, equal_to(test_pathway.name)
+    )
+    assert_that(
+        snapshot.pathways_by_name[test_pathway.name],
+        same_instance(snapshot.pathways[test_pathway.id])
+    )
@@ -164,8 +164,8 @@ async def test_add_decision_point_to_patient(
         type_reference_name=test_clinical_request_type.ref_name,
     )
 
-    async def create_test_result(**kwargs):
-        return SECOND_TEST_RESULT
+    async def create_many_test_results(testResults, **kwargs):
+        return [SECOND_TEST_RESULT for _ in testResults]
 
     async def load_test_result(recordId, **kwargs):
         if recordId == 1000:
@@ -181,7 +181,7 @@ async def test_add_decision_point_to_patient(
             retVal.append(SECOND_TEST_RESULT)
         return retVal
 
-    mock_trust_adapter.create_test_result = create_test_result
+    mock_trust_adapter.create_many_test_results = create_many_test_results
     mock_trust_adapter.load_test_result = load_test_result
     mock_trust_adapter.load_many_test_results = load_many_test_results
 
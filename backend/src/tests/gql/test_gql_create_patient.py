@@ -2,6 +2,7 @@ import json
 import pytest
 from datetime import datetime
 from models import Patient
+from trustadapter.healthmonitor import trust_adapter_health_monitor
 from trustadapter.trustadapter import Patient_IE, TestResult_IE
 from SdTypes import DecisionTypes, ClinicalRequestState, Sex
 from hamcrest import assert_that, equal_to, not_none, none, contains_string
@@ -162,8 +163,9 @@ async def test_add_new_patient_to_system(
         sex=Sex.MALE
     )
 
-    mock_trust_adapter.create_test_result_immediately.return_value = (
-        TEST_RESULT)
+    mock_trust_adapter.create_many_test_results.return_value = [
+        TEST_RESULT
+    ]
     mock_trust_adapter.load_test_result.return_value = TEST_RESULT
     mock_trust_adapter.load_many_test_results.return_value = [
         TEST_RESULT
@@ -281,6 +283,8 @@ async def test_add_new_patient_to_system(
         onPathway['clinicalRequests'][0]['testResult']['typeReferenceName'],
         equal_to(TEST_RESULT.type_reference_name)
     )
+    # the connection is not tested before each mutation
+    mock_trust_adapter.test_connection.assert_not_called()
 
 
 async def test_user_lacks_permission(
@@ -314,3 +318,46 @@ async def test_user_lacks_permission(
         payload['errors'][0]['message'],
         contains_string("Missing one or many permissions")
     )
+
+
+async def test_create_patient_with_trust_adapter_unavailable(
+    patient_create_permission,
+    patient_create_query,
+    mock_trust_adapter,
+    httpx_test_client,
+    httpx_login_user,
+    test_clinical_request_type,
+    test_pathway
+):
+    """
+    Given the last call to the trust integration engine failed
+    When we run the GraphQL mutation to add a patient
+    Then it fails without calling the trust integration engine
+    """
+    trust_adapter_health_monitor.record_failure(Exception("timed out"))
+
+    res = await httpx_test_client.post(
+        url="graphql",
+        json={
+            "query": patient_create_query,
+            "variables": {
+                "firstName": "Test",
+                "lastName": "User",
+                "hospitalNumber": "MRN123456",
+                "nationalNumber": "NHS123456789",
+                "dateOfBirth": "2000-01-01",
+                "sex": Sex.MALE,
+                "pathwayId": test_pathway.id,
+                "clinicalRequestTypeId": test_clinical_request_type.id
+            }
+        },
+    )
+
+    payload = res.json()
+    assert_that(
+        payload['errors'][0]['message'],
+        contains_string("Trust system is unavailable")
+    )
+    mock_trust_adapter.test_connection.assert_not_called()
+    mock_trust_adapter.load_patient.assert_not_called()
+    mock_trust_adapter.create_patient.assert_not_called()
@@ -185,8 +185,8 @@ async def test_search_for_patient(
         type_reference_name=test_clinical_request_type.ref_name,
     )
 
-    async def create_test_result(**kwargs):
-        return SECOND_TEST_RESULT
+    async def create_many_test_results(testResults, **kwargs):
+        return [SECOND_TEST_RESULT for _ in testResults]
 
     async def load_test_result(recordId, **kwargs):
         if recordId == 1000:
@@ -202,7 +202,7 @@ async def test_search_for_patient(
             retVal.append(SECOND_TEST_RESULT)
         return retVal
 
-    mock_trust_adapter.create_test_result = create_test_result
+    mock_trust_adapter.create_many_test_results = create_many_test_results
     mock_trust_adapter.load_test_result = load_test_result
     mock_trust_adapter.load_many_test_results = load_many_test_results
 
@@ -408,3 +408,55 @@ async def test_user_lacks_permission(
         payload['errors'][0]['message'],
         contains_string("Missing one or many permissions")
     )
+
+
+async def test_get_patient_loads_demographics_once_when_selected(
+    patient_read_permission, test_patients, mock_trust_adapter,
+    httpx_test_client, httpx_login_user,
+):
+    """
+    Given a patient
+    When the patient is queried without, then with, demographic fields
+    Then the trust adapter is only called for the query selecting them,
+    once for all of them
+    """
+    patient: Patient = test_patients[0]
+    mock_trust_adapter.load_many_patients.return_value = [Patient_IE(
+        first_name="Test",
+        last_name="User",
+        hospital_number=patient.hospital_number,
+        national_number=patient.national_number,
+        date_of_birth=datetime(year=2000, month=1, day=1).date(),
+        communication_method="LETTER"
+    )]
+    query = """
+        query getPatient($id: ID!){
+            getPatient(id: $id){ id %s }
+        }
+    """
+
+    result = await httpx_test_client.post(
+        url="graphql",
+        json={"query": query % "", "variables": {"id": patient.id}}
+    )
+    assert_that(
+        json.loads(result.text)['data']['getPatient'],
+        equal_to({'id': str(patient.id)})
+    )
+    mock_trust_adapter.load_many_patients.assert_not_called()
+
+    result = await httpx_test_client.post(
+        url="graphql",
+        json={
+            "query": query % "firstName lastName dateOfBirth",
+            "variables": {"id": patient.id}
+        }
+    )
+    assert_that(
+        json.loads(result.text)['data']['getPatient'],
+        equal_to({
+            'id': str(patient.id), 'firstName': "Test",
+            'lastName': "User", 'dateOfBirth': "2000-01-01"
+        })
+    )
+    mock_trust_adapter.load_many_patients.assert_called_once()
@@ -267,3 +267,166 @@ async def test_user_lacks_permission(
         payload['errors'][0]['message'],
         contains_string("Missing one or many permissions")
     )
+
+
+# Scenario: the connection is paged forwards and backwards using cursors
+async def test_get_patient_on_pathway_connection_page_info(
+    patient_read_permission, on_pathway_read_permission,
+    test_patients_on_pathway,
+    test_pathway, httpx_test_client, httpx_login_user
+):
+    """
+    Given: we have ten patients on a pathway
+    """
+    query = """
+        query getPatientOnPathwayConnection(
+            $pathwayId: ID!, $first: Int, $after: String,
+            $last: Int, $before: String
+        ){
+            getPatientOnPathwayConnection(
+                pathwayId: $pathwayId, first: $first, after: $after,
+                last: $last, before: $before
+            ){
+                totalCount
+                pageInfo{
+                    hasPreviousPage
+                    hasNextPage
+                    startCursor
+                    endCursor
+                }
+                edges{
+                    cursor
+                    node{
+                        id
+                    }
+                }
+            }
+        }
+    """
+    patient_ids = [str(op.patient_id) for op in test_patients_on_pathway]
+
+    """
+    When: we page forwards through the connection
+    """
+    first_page = (await httpx_test_client.post(url="graphql", json={
+        "query": query,
+        "variables": {"pathwayId": test_pathway.id, "first": 4}
+    })).json()['data']['getPatientOnPathwayConnection']
+    second_page = (await httpx_test_client.post(url="graphql", json={
+        "query": query,
+        "variables": {
+            "pathwayId": test_pathway.id, "first": 8,
+            "after": first_page['pageInfo']['endCursor']
+        }
+    })).json()['data']['getPatientOnPathwayConnection']
+
+    """
+    Then: the extra row tells us whether there is a next page
+    """
+    assert_that(first_page['totalCount'], equal_to(10))
+    assert_that(first_page['pageInfo']['hasNextPage'], equal_to(True))
+    assert_that(
+        [e['node']['id'] for e in first_page['edges']],
+        equal_to(patient_ids[:4])
+    )
+    assert_that(second_page['pageInfo']['hasNextPage'], equal_to(False))
+    assert_that(
+        [e['node']['id'] for e in second_page['edges']],
+        equal_to(patient_ids[4:])
+    )
+
+    """
+    When: we page backwards from the last patient
+    """
+    previous_page = (await httpx_test_client.post(url="graphql", json={
+        "query": query,
+        "variables": {
+            "pathwayId": test_pathway.id, "last": 3,
+            "before": second_page['pageInfo']['endCursor']
+        }
+    })).json()['data']['getPatientOnPathwayConnection']
+
+    """
+    Then: we get the three patients before it, in order
+    """
+    assert_that(previous_page['pageInfo']['hasPreviousPage'], equal_to(True))
+    assert_that(
+        [e['node']['id'] for e in previous_page['edges']],
+        equal_to(patient_ids[6:9])
+    )
+
+
+# Scenario: each patient's onPathways are loaded for a page of patients
+async def test_get_patient_on_pathway_connection_on_pathways(
+    patient_read_permission, on_pathway_read_permission,
+    test_patients_on_pathway,
+    test_pathway, httpx_test_client, httpx_login_user
+):
+    """
+    Given: every patient has a second, discharged, OnPathway and the
+    first patient has a third, open, one
+    """
+    discharged = {}
+    for op in test_patients_on_pathway:
+        discharged[op.patient_id] = await OnPathway.create(
+            patient_id=op.patient_id,
+            pathway_id=test_pathway.id,
+            is_discharged=True
+        )
+    first_patient_id = test_patients_on_pathway[0].patient_id
+    extra = await OnPathway.create(
+        patient_id=first_patient_id,
+        pathway_id=test_pathway.id
+    )
+
+    """
+    When: we query each patient's OnPathways, with and without filters
+    """
+    result = (await httpx_test_client.post(url="graphql", json={
+        "query": """
+            query getPatientOnPathwayConnection($pathwayId: ID!){
+                getPatientOnPathwayConnection(
+                    pathwayId: $pathwayId, first: 10
+                ){
+                    edges{
+                        node{
+                            id
+                            open: onPathways(pathwayId: $pathwayId){
+                                id
+                            }
+                            all: onPathways(
+                                pathwayId: $pathwayId,
+                                includeDischarged: true
+                            ){
+                                id
+                            }
+                            first: onPathways(
+                                pathwayId: $pathwayId, limit: 1
+                            ){
+                                id
+                            }
+                        }
+                    }
+                }
+            }
+        """,
+        "variables": {"pathwayId": test_pathway.id}
+    })).json()['data']['getPatientOnPathwayConnection']
+
+    """
+    Then: every patient gets only their own OnPathways, filtered and
+    limited
+    """
+    for op, edge in zip(test_patients_on_pathway, result['edges']):
+        node = edge['node']
+        open_ids = [str(op.id)]
+        if op.patient_id == first_patient_id:
+            open_ids.append(str(extra.id))
+        assert_that([o['id'] for o in node['open']], equal_to(open_ids))
+        assert_that(
+            sorted(int(o['id']) for o in node['all']),
+            equal_to(sorted(
+                [int(i) for i in open_ids] + [discharged[op.patient_id].id]
+            ))
+        )
+        assert_that([o['id'] for o in node['first']], equal_to([str(op.id)]))
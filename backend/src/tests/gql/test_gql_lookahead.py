@@ -0,0 +1,262 @@
+import json
+from datetime import date
+from typing import List
+from unittest.mock import patch
+
+from hamcrest import assert_that, equal_to
+
+import dataloaders
+from gino.dialects.asyncpg import DBAPICursor
+from models import ClinicalRequest, DecisionPoint, OnPathway
+from referencedata import reference_data
+from SdTypes import ClinicalRequestState, DecisionTypes
+from trustadapter.trustadapter import Patient_IE
+
+
+async def test_get_patient_on_pathway_connection_prefetches_relations(
+    patient_read_permission, on_pathway_read_permission,
+    test_pathway, test_user, test_clinical_request_type,
+    test_patients_on_pathway: List[OnPathway],
+    httpx_test_client, httpx_login_user,
+):
+    """
+    Given patients on a pathway with decision points and clinical
+    requests
+    When their decision points' clinical requests are selected through a
+    fragment of the connection
+    Then they are returned without the loaders querying per level
+    """
+    on_pathway = test_patients_on_pathway[0]
+    decision_point: DecisionPoint = await DecisionPoint.create(
+        clinician_id=test_user.user.id,
+        on_pathway_id=on_pathway.id,
+        decision_type=DecisionTypes.TRIAGE,
+        clinic_history="history",
+        comorbidities="comorbidities"
+    )
+    clinical_request: ClinicalRequest = await ClinicalRequest.create(
+        on_pathway_id=on_pathway.id,
+        decision_point_id=decision_point.id,
+        current_state=ClinicalRequestState.WAITING,
+        clinical_request_type_id=test_clinical_request_type.id
+    )
+
+    with patch.object(
+        dataloaders.OnPathwaysByPatient, "fetch_group"
+    ) as fetch_on_pathways, patch.object(
+        dataloaders.DecisionPointsByOnPathway, "fetch_group"
+    ) as fetch_decision_points, patch.object(
+        dataloaders.ClinicalRequestsByDecisionPointIdLoader, "batch_load_fn"
+    ) as load_clinical_requests:
+        result = await httpx_test_client.post(
+            url="graphql",
+            json={
+                "query": """
+                    fragment PatientFields on Patient {
+                        id
+                        onPathways(pathwayId: $pathwayId) {
+                            id
+                            decisionPoints {
+                                id
+                                clinicalRequests {
+                                    id
+                                    clinicalRequestType { id }
+                                }
+                            }
+                        }
+                    }
+                    query getPatientOnPathwayConnection($pathwayId: ID!) {
+                        getPatientOnPathwayConnection(
+                            pathwayId: $pathwayId, first: 2,
+                            outstanding: false
+                        ) {
+                            edges { node { ...PatientFields } }
+                        }
+                    }
+                """,
+                "variables": {"pathwayId": test_pathway.id}
+            }
+        )
+
+    assert_that(result.status_code, equal_to(200))
+    edges = json.loads(result.text)['data'][
+        'getPatientOnPathwayConnection']['edges']
+    assert_that(
+        edges[0]['node']['onPathways'],
+        equal_to([{
+            'id': str(on_pathway.id),
+            'decisionPoints': [{
+                'id': str(decision_point.id),
+                'clinicalRequests': [{
+                    'id': str(clinical_request.id),
+                    'clinicalRequestType': {
+                        'id': str(test_clinical_request_type.id)
+                    }
+                }]
+            }]
+        }])
+    )
+    assert_that(
+        edges[1]['node']['onPathways'],
+        equal_to([{
+            'id': str(test_patients_on_pathway[1].id), 'decisionPoints': []
+        }])
+    )
+    fetch_on_pathways.assert_not_called()
+    fetch_decision_points.assert_not_called()
+    load_clinical_requests.assert_not_called()
+
+
+_WRAPPED_PATIENT_LIST_QUERY = """
+    query getPatientOnPathwayConnection(
+        $pathwayId: ID!, $first: Int, $includeDischarged: Boolean
+    ) {
+        getPatientOnPathwayConnection(
+            outstanding: false, pathwayId: $pathwayId, first: $first,
+            includeDischarged: $includeDischarged
+        ) {
+            totalCount
+            pageInfo { hasNextPage endCursor }
+            edges {
+                cursor
+                node {
+                    id
+                    firstName
+                    lastName
+                    hospitalNumber
+                    dateOfBirth
+                    onPathways(
+                        pathwayId: $pathwayId,
+                        includeDischarged: $includeDischarged
+                    ) {
+                        id
+                        outstandingClinicalRequest: clinicalRequests(
+                            outstanding: true, limit: 1
+                        ) {
+                            id
+                            currentState
+                            clinicalRequestType { name }
+                        }
+                        clinicalRequest: clinicalRequests(
+                            outstanding: false, limit: 1
+                        ) {
+                            id
+                            currentState
+                            clinicalRequestType { name }
+                        }
+                        lastClinicalRequest: clinicalRequests(
+                            outstanding: false, limit: 1
+                        ) {
+                            id
+                        }
+                        lockEndTime
+                        lockUser { id firstName lastName }
+                        updatedAt
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+async def test_wrapped_patient_list_prefetches_relations(
+    patient_read_permission, on_pathway_read_permission,
+    test_pathway, test_user, test_clinical_request_type,
+    test_patients_on_pathway: List[OnPathway], test_patients,
+    mock_trust_adapter, httpx_test_client, httpx_login_user,
+):
+    """
+    Given patients on a pathway with clinical requests, one of them
+    locked by a user
+    When the patient list's query is run, selecting their clinical
+    requests under aliases and lock users
+    Then they are returned with one query per level and clinical
+    request filters, without the loaders querying per patient
+    """
+    on_pathway = test_patients_on_pathway[0]
+    await on_pathway.update(lock_user_id=test_user.user.id).apply()
+    decision_point: DecisionPoint = await DecisionPoint.create(
+        clinician_id=test_user.user.id,
+        on_pathway_id=on_pathway.id,
+        decision_type=DecisionTypes.TRIAGE,
+        clinic_history="history",
+        comorbidities="comorbidities"
+    )
+    outstanding: ClinicalRequest = await ClinicalRequest.create(
+        on_pathway_id=on_pathway.id,
+        decision_point_id=decision_point.id,
+        current_state=ClinicalRequestState.COMPLETED,
+        clinical_request_type_id=test_clinical_request_type.id
+    )
+
+    async def load_many_patients(hospitalNumbers=None, **kwargs):
+        return [
+            Patient_IE(
+                first_name="First", last_name="Last",
+                hospital_number=patient.hospital_number,
+                national_number=patient.national_number,
+                date_of_birth=date.fromisoformat("2000-01-01"),
+            )
+            for patient in test_patients
+            if patient.hospital_number in hospitalNumbers
+        ]
+
+    mock_trust_adapter.load_many_patients = load_many_patients
+    await reference_data.get()
+    statements: List[str] = []
+    async_execute = DBAPICursor.async_execute
+
+    async def record_async_execute(self, query, *args, **kwargs):
+        statements.append(query)
+        return await async_execute(self, query, *args, **kwargs)
+
+    with patch.object(
+        DBAPICursor, "async_execute", record_async_execute
+    ), patch.object(
+        dataloaders.ClinicalRequestByOnPathwayIdLoader, "fetch_group"
+    ) as fetch_clinical_requests, patch.object(
+        dataloaders.UserByIdLoader, "fetch"
+    ) as fetch_users:
+        result = await httpx_test_client.post(
+            url="graphql",
+            json={
+                "query": _WRAPPED_PATIENT_LIST_QUERY,
+                "variables": {
+                    "pathwayId": test_pathway.id, "first": 20,
+                    "includeDischarged": False
+                }
+            }
+        )
+
+    assert_that(result.status_code, equal_to(200))
+    edges = json.loads(result.text)['data'][
+        'getPatientOnPathwayConnection']['edges']
+    locked = next(
+        edge['node']['onPathways'][0] for edge in edges
+        if edge['node']['onPathways'][0]['id'] == str(on_pathway.id)
+    )
+    clinical_request = {
+        'id': str(outstanding.id),
+        'currentState': 'COMPLETED',
+        'clinicalRequestType': {'name': test_clinical_request_type.name}
+    }
+    assert_that(
+        locked['outstandingClinicalRequest'], equal_to([clinical_request])
+    )
+    assert_that(locked['clinicalRequest'], equal_to([clinical_request]))
+    assert_that(
+        locked['lastClinicalRequest'],
+        equal_to([{'id': str(outstanding.id)}])
+    )
+    assert_that(locked['lockUser'], equal_to({
+        'id': str(test_user.user.id),
+        'firstName': test_user.user.first_name,
+        'lastName': test_user.user.last_name,
+    }))
+    fetch_clinical_requests.assert_not_called()
+    fetch_users.assert_not_called()
+    # the session's user and permissions, the page of OnPathway IDs and
+    # its count, then the OnPathway records, their clinical requests for
+    # each of the two filters, their lock users and the patients
+    assert_that(len(statements), equal_to(9))
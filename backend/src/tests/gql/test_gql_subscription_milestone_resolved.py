@@ -1,11 +1,17 @@
 import pytest
 import asyncio
+from datetime import timedelta
+from unittest.mock import patch
 from httpx import Response
 from hamcrest import assert_that, equal_to, contains_string
 from ariadne.asgi import (
     GQL_CONNECTION_INIT,
     GQL_START
 )
+from SdTypes import Permissions
+from models import RolePermission
+from authentication.permissionchanges import permission_changes
+from authentication.sessioncache import session_cache
 
 
 @pytest.fixture
@@ -37,12 +43,13 @@ async def subscription_ws(login_user: Response, test_client):
 
 
 async def test_clinical_request_resolved(
-        subscription_ws, test_sdpubsub,
         clinical_request_read_permission,
+        subscription_ws, test_sdpubsub,
         clinical_request_resolved_query
 ):
     """
-    It should return the clinical_request with a valid user
+    It should return the clinical_request with a valid user. Scopes are
+    read when the websocket connects, so the permission is granted first
     """
     await subscription_ws.send_json(clinical_request_resolved_query)
     TEST_MILESTONE = {
@@ -72,3 +79,72 @@ async def test_clinical_request_resolved_invalid_permissions(
         res['payload']['message'],
         contains_string("Missing one or many permissions")
     )
+
+
+async def test_clinical_request_resolved_permission_change(
+    subscription_ws, test_sdpubsub, test_role,
+    clinical_request_resolved_query
+):
+    """
+    Given a websocket connected before the user was granted a permission
+    When a permission change is published
+    Then the connection's scopes are read again
+    """
+    await RolePermission.create(
+        role_id=test_role.id,
+        permission=Permissions.MILESTONE_READ
+    )
+    permission_changes.publish()
+
+    await subscription_ws.send_json(clinical_request_resolved_query)
+    TEST_MILESTONE = {
+        "id": '1'
+    }
+    receive_task = asyncio.create_task(subscription_ws.receive_json())
+    await asyncio.sleep(0.01)  # advance the event loop
+    asyncio.create_task(
+        test_sdpubsub.publish(
+            "clinicalRequest-resolutions",
+            TEST_MILESTONE
+        )
+    )
+    res = await receive_task
+    assert_that(
+        res['payload']['data']['clinicalRequestResolved'],
+        equal_to(TEST_MILESTONE)
+    )
+
+
+async def test_clinical_request_resolved_permission_change_elsewhere(
+    subscription_ws, test_sdpubsub, test_role,
+    clinical_request_resolved_query
+):
+    """
+    Given a websocket connected before the user was granted a permission
+    by another process, so no change was published in this one
+    When the connection's scopes are older than the session cache's TTL
+    Then they are read again
+    """
+    await RolePermission.create(
+        role_id=test_role.id,
+        permission=Permissions.MILESTONE_READ
+    )
+
+    with patch.object(session_cache, "ttl", timedelta(0)):
+        await subscription_ws.send_json(clinical_request_resolved_query)
+        TEST_MILESTONE = {
+            "id": '1'
+        }
+        receive_task = asyncio.create_task(subscription_ws.receive_json())
+        await asyncio.sleep(0.01)  # advance the event loop
+        asyncio.create_task(
+            test_sdpubsub.publish(
+                "clinicalRequest-resolutions",
+                TEST_MILESTONE
+            )
+        )
+        res = await receive_task
+    assert_that(
+        res['payload']['data']['clinicalRequestResolved'],
+        equal_to(TEST_MILESTONE)
+    )
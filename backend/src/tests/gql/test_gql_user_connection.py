@@ -2,7 +2,7 @@ import pytest
 from async_asgi_testclient.response import Response
 
 from models import User, Pathway
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, equal_to, greater_than
 
 
 @pytest.fixture
@@ -63,3 +63,81 @@ async def test_user_connection(
     )
 
     assert_that(res.status_code, equal_to(200))
+
+
+async def test_user_connection_pages(
+        login_user: Response, test_client,
+        user_read_permission, user_connection_query,
+        insert_test_users
+):
+    first_page = (await test_client.post(
+        path="/graphql",
+        json={
+            "query": user_connection_query,
+            "variables": {
+                "first": 50,
+            },
+        }
+    )).json()['data']['getUserConnection']
+
+    second_page = (await test_client.post(
+        path="/graphql",
+        json={
+            "query": user_connection_query,
+            "variables": {
+                "first": 50,
+                "after": first_page['pageInfo']['endCursor'],
+            },
+        }
+    )).json()['data']['getUserConnection']
+
+    # 200 test users and the logged in user
+    assert_that(first_page['totalCount'], equal_to(201))
+    assert_that(len(first_page['edges']), equal_to(50))
+    assert_that(first_page['pageInfo']['hasNextPage'], equal_to(True))
+    assert_that(len(second_page['edges']), equal_to(50))
+    assert_that(
+        int(second_page['edges'][0]['node']['id']),
+        greater_than(int(first_page['edges'][-1]['node']['id']))
+    )
+
+
+async def test_user_connection_without_total_count(
+        login_user: Response, test_client,
+        user_read_permission, insert_test_users
+):
+    """
+    Given a connection query that does not select totalCount
+    When the query is run
+    Then the page is still returned
+    """
+    res = await test_client.post(
+        path="/graphql",
+        json={
+            "query": """
+                query UserListQuery($first: Int) {
+                    getUserConnection(first: $first) {
+                      ...UserPage
+                    }
+                }
+                fragment UserPage on UserConnection {
+                  pageInfo {
+                    hasNextPage
+                  }
+                  edges {
+                    node {
+                      id
+                    }
+                  }
+                }
+            """,
+            "variables": {
+                "first": 10,
+            },
+        }
+    )
+
+    assert_that(res.status_code, equal_to(200))
+    connection = res.json()['data']['getUserConnection']
+    assert_that(len(connection['edges']), equal_to(10))
+    assert_that(connection['pageInfo']['hasNextPage'], equal_to(True))
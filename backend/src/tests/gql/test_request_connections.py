@@ -0,0 +1,117 @@
+import asyncio
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that, equal_to, is_not, less_than_or_equal_to, same_instance
+)
+
+import gql.graphql
+from gql.requestconnections import RequestConnections
+from models import db
+
+
+async def test_request_connections_share_capped_connections():
+    """
+    Given a request limited to two connections
+    When many queries run at once, then again
+    Then no more than two connections are used and held, and they are
+    returned to the pool when the request closes
+    """
+    connections = RequestConnections(db=db, max_connections=2)
+    in_use = 0
+    max_in_use = 0
+    used = set()
+
+    async def query():
+        nonlocal in_use, max_in_use
+        async with connections.acquire(reuse=False) as conn:
+            in_use += 1
+            max_in_use = max(max_in_use, in_use)
+            used.add(id(conn.raw_connection))
+            await conn.scalar(db.text("SELECT pg_sleep(0.01)"))
+            in_use -= 1
+
+    await asyncio.gather(*[query() for _ in range(10)])
+    await asyncio.gather(*[query() for _ in range(10)])
+
+    assert_that(max_in_use, less_than_or_equal_to(2))
+    assert_that(len(used), less_than_or_equal_to(2))
+    assert_that(len(connections._idle), equal_to(len(used)))
+
+    await connections.close()
+    assert_that(connections._idle, equal_to([]))
+
+
+async def test_request_connections_are_not_reused_implicitly():
+    """
+    Given a request's connections
+    When one is borrowed
+    Then queries bound implicitly to `db` do not run on it, as other
+    loaders of the request may be using it
+    """
+    connections = RequestConnections(db=db, max_connections=1)
+
+    async with connections.acquire(reuse=False) as conn:
+        assert_that(db.bind.current_connection, is_not(same_instance(conn)))
+        async with db.acquire(reuse=True) as implicit:
+            assert_that(
+                implicit.raw_connection,
+                is_not(same_instance(conn.raw_connection))
+            )
+
+    await connections.close()
+
+
+async def test_paginated_query_stays_within_request_connections(
+    patient_read_permission, on_pathway_read_permission,
+    test_pathway, test_patients_on_pathway,
+    httpx_test_client, httpx_login_user,
+):
+    """
+    Given a request limited to two connections
+    When a page of patients is queried with its count and the patients'
+    relations
+    Then no more than two connections are checked out of the pool
+    """
+    query = {
+        "query": """
+        query getPatientOnPathwayConnection($pathwayId: ID!) {
+            getPatientOnPathwayConnection(
+                pathwayId: $pathwayId, first: 5,
+                outstanding: false
+            ) {
+                totalCount
+                edges { node {
+                    id
+                    onPathways(pathwayId: $pathwayId) {
+                        id
+                        clinicalRequests { id }
+                        decisionPoints { id }
+                        lockUser { id }
+                    }
+                } }
+            }
+        }
+        """,
+        "variables": {"pathwayId": test_pathway.id}
+    }
+    # caches the session, so only the query checks out connections
+    await httpx_test_client.post(url="graphql", json=query)
+    acquire = db.acquire
+    checked_out = 0
+
+    def record_acquire(*args, reuse=True, **kwargs):
+        nonlocal checked_out
+        # connections reused within the HTTP request are not checked out
+        if not reuse:
+            checked_out += 1
+        return acquire(*args, reuse=reuse, **kwargs)
+
+    with patch.object(gql.graphql, "REQUEST_CONNECTIONS", 2), \
+            patch.object(db, "acquire", side_effect=record_acquire):
+        result = await httpx_test_client.post(url="graphql", json=query)
+
+    assert_that(result.status_code, equal_to(200))
+    edges = result.json()['data']['getPatientOnPathwayConnection']['edges']
+    assert_that(len(edges), equal_to(5))
+    assert_that(checked_out, less_than_or_equal_to(2))
@@ -0,0 +1,32 @@
+from unittest.mock import patch
+from hamcrest import assert_that, equal_to
+from authentication.passwords import PasswordHasherStats, password_hasher
+
+
+async def test_password_hasher_status(httpx_login_user, httpx_test_client):
+    """
+    Given password hashes have queued for the hashing pool
+    When its status is requested
+    Then its queue depth and throughput are returned
+    """
+    stats = PasswordHasherStats(
+        waiting=2, running=4, max_waiting=5, completed=10
+    )
+    with patch.object(password_hasher, "stats", stats):
+        res = await httpx_test_client.get(url="/rest/passwordhasher/status/")
+
+    assert_that(res.status_code, equal_to(200))
+    assert_that(res.json(), equal_to({
+        "waiting": 2, "running": 4, "max_waiting": 5, "completed": 10,
+    }))
+
+
+async def test_password_hasher_status_needs_login(httpx_test_client):
+    """
+    Given no user is logged in
+    When the status of the hashing pool is requested
+    Then it is refused
+    """
+    res = await httpx_test_client.get(url="/rest/passwordhasher/status/")
+
+    assert_that(res.status_code, equal_to(403))
@@ -0,0 +1,38 @@
+from hamcrest import assert_that, equal_to
+from trustadapter.circuitbreaker import trust_adapter_circuit_breaker
+from trustadapter.patientcache import patient_cache
+
+
+async def test_trust_adapter_status(httpx_login_user, httpx_test_client):
+    """
+    Given the circuit to the trust integration engine has opened, and
+    patients have been served from the patient cache
+    When its status is requested
+    Then the state of the circuit and the cache's counts are returned
+    """
+    trust_adapter_circuit_breaker._open()
+    patient_cache.stats.hits = 3
+    patient_cache.stats.misses = 1
+
+    res = await httpx_test_client.get(url="/rest/trustadapter/status/")
+
+    assert_that(res.status_code, equal_to(200))
+    assert_that(res.json(), equal_to({
+        "state": "OPEN", "calls": 0, "error_rate": 0.0,
+        "p95_latency": 0.0, "times_opened": 1, "rejected": 0,
+        "patient_cache": {
+            "hits": 3, "misses": 1, "refreshes": 0, "refresh_failures": 0,
+            "evictions": 0, "stale_hits": 0,
+        },
+    }))
+
+
+async def test_trust_adapter_status_needs_login(httpx_test_client):
+    """
+    Given no user is logged in
+    When the status of the circuit is requested
+    Then it is refused
+    """
+    res = await httpx_test_client.get(url="/rest/trustadapter/status/")
+
+    assert_that(res.status_code, equal_to(403))
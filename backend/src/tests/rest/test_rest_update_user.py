@@ -1,6 +1,8 @@
 import pytest
 from typing import List
-from models import Role, UserRole, User, Pathway, UserPathway
+from unittest.mock import patch
+from authentication.permissionchanges import permission_changes
+from models import Role, UserRole, User, Pathway, UserPathway, db
 from tests.conftest import UserFixture
 from hamcrest import (
     assert_that, equal_to,
@@ -180,3 +182,38 @@ async def test_invalid_permission_user_update(
     )
 
     assert_that(res.status_code, equal_to(403))
+
+
+async def test_user_update_publishes_permission_changes_once_committed(
+        login_user, test_client, user_update_permission,
+        test_user: UserFixture, test_roles: List[Role], user_update_details
+):
+    """
+    Given a user whose roles are being changed
+    When the user is updated
+    Then the change of the user's permissions is published only once the
+    update was committed
+    """
+    user_update_details["roles"] = [test_roles[0].id]
+    in_transaction_at_publish = []
+    publish = permission_changes.publish
+
+    def record_publish(user_id=None):
+        conn = db.bind.current_connection
+        in_transaction_at_publish.append(
+            conn is not None and conn.raw_connection is not None
+            and conn.raw_connection.is_in_transaction()
+        )
+        publish(user_id)
+
+    with patch.object(
+        permission_changes, "publish", side_effect=record_publish
+    ) as mock_publish:
+        res = await test_client.post(
+            path="/rest/updateuser/",
+            json=user_update_details
+        )
+
+    assert_that(res.status_code, equal_to(200))
+    mock_publish.assert_called_once_with(test_user.user.id)
+    assert_that(in_transaction_at_publish, equal_to([False]))
@@ -1,8 +1,12 @@
 import asyncio
+from unittest.mock import patch
 
-from models import Role, RolePermission
+from authentication.sessioncache import session_cache
+from models import Role, RolePermission, db
 from SdTypes import Permissions
-from hamcrest import assert_that, equal_to, not_none, is_in, not_
+from hamcrest import (
+    assert_that, equal_to, not_none, is_in, not_, is_, none
+)
 from typing import List
 
 
@@ -77,3 +81,52 @@ async def test_user_lacks_permission(login_user, test_client):
     )
 
     assert_that(res.status_code, equal_to(403))
+
+
+async def test_update_role_expires_cached_sessions(
+    login_user, test_client, test_role, role_update_permission,
+    role_create_permission
+):
+    """
+    Given a session cached while its role could create roles
+    When the role's permission to create roles is removed
+    Then the session can no longer create roles, and the cache was
+    cleared only once the update was committed
+    """
+    res = await test_client.post(
+        path="/rest/createrole/", json={"name": "cached-role"}
+    )
+    assert_that(res.status_code, equal_to(200))
+
+    in_transaction_at_clear = []
+    clear = session_cache.clear
+
+    def record_clear():
+        conn = db.bind.current_connection
+        in_transaction_at_clear.append(
+            conn is not None and conn.raw_connection is not None
+            and conn.raw_connection.is_in_transaction()
+        )
+        clear()
+
+    with patch.object(session_cache, "clear", side_effect=record_clear):
+        res = await test_client.post(
+            path="/rest/updaterole/",
+            json={
+                "id": test_role.id,
+                "name": test_role.name,
+                "permissions": [Permissions.ROLE_UPDATE]
+            }
+        )
+    assert_that(res.status_code, equal_to(200))
+    assert_that(in_transaction_at_clear, equal_to([False]))
+
+    res = await test_client.post(
+        path="/rest/createrole/", json={"name": "uncached-role"}
+    )
+    assert_that(res.status_code, equal_to(403))
+    assert_that(
+        await Role.query.where(
+            Role.name == "uncached-role").gino.one_or_none(),
+        is_(none())
+    )
@@ -0,0 +1,204 @@
+import asyncio
+import dataclasses
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+import httpx
+import pytest
+from hamcrest import assert_that, equal_to, has_entries
+
+from services import TrustAdapterService
+from trustadapter import PseudoTrustAdapter
+from trustadapter.circuitbreaker import (
+    CircuitBreaker, CircuitOpenError, CircuitState
+)
+from trustadapter.patientcache import PatientCache
+from trustadapter.trustadapter import TrustIntegrationCommunicationError
+from tests.trustadapter.test_pseudo_trust_adapter import _patient_json
+
+
+class _FaultyEngine:
+    """
+    Mock transport of the integration engine, with the faults pseudotie
+    injects through /debug/faults/
+    """
+
+    def __init__(self):
+        self.delay = 0.0
+        self.status_code = None
+        self.requests: List[httpx.Request] = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status_code is not None:
+            return httpx.Response(self.status_code)
+        return httpx.Response(200, json=[
+            _patient_json(hospital_number)
+            for hospital_number in json.loads(request.content)
+        ])
+
+
+def _make_service(engine: _FaultyEngine, **kwargs):
+    breaker_kwargs = dict(
+        window=10, min_calls=4, error_rate=0.5, latency_budget=1,
+        reset_timeout=30
+    )
+    breaker_kwargs.update(kwargs)
+    breaker = CircuitBreaker(**breaker_kwargs)
+    service = TrustAdapterService(
+        trust_adapter_client=PseudoTrustAdapter(
+            transport=httpx.MockTransport(engine.handler)
+        ),
+        circuit_breaker=breaker
+    )
+    return service, breaker
+
+
+async def _load(service: TrustAdapterService, hospital_number="fake-1"):
+    return await service.load_many_patients(
+        hospitalNumbers=[hospital_number], auth_token="token"
+    )
+
+
+async def test_circuit_opens_on_errors_and_fails_fast():
+    """
+    Given the integration engine responds with server errors
+    When patients are loaded until the error rate is reached
+    Then the circuit opens, and further loads fail without calling the
+    integration engine
+    """
+    engine = _FaultyEngine()
+    engine.status_code = 503
+    service, breaker = _make_service(engine)
+
+    for _ in range(4):
+        with pytest.raises(TrustIntegrationCommunicationError):
+            await _load(service)
+    assert_that(breaker.state, equal_to(CircuitState.OPEN))
+
+    with pytest.raises(CircuitOpenError):
+        await _load(service)
+    assert_that(len(engine.requests), equal_to(4))
+    assert_that(dataclasses.asdict(breaker.stats), has_entries(
+        calls=4, error_rate=1.0, times_opened=1, rejected=1
+    ))
+
+
+async def test_circuit_opens_on_latency_over_budget():
+    """
+    Given the integration engine responds successfully but slowly
+    When patients are loaded
+    Then the circuit opens once the p95 latency is over the budget
+    """
+    engine = _FaultyEngine()
+    engine.delay = 0.05
+    service, breaker = _make_service(engine, latency_budget=0.01)
+
+    for _ in range(4):
+        await _load(service)
+
+    assert_that(breaker.state, equal_to(CircuitState.OPEN))
+    assert_that(breaker.stats.error_rate, equal_to(0.0))
+    with pytest.raises(CircuitOpenError):
+        await _load(service)
+
+
+async def test_circuit_ignores_client_errors():
+    """
+    Given the integration engine refuses requests, e.g. for an expired
+    session
+    When patients are loaded
+    Then the circuit stays closed
+    """
+    engine = _FaultyEngine()
+    engine.status_code = 401
+    service, breaker = _make_service(engine)
+
+    for _ in range(4):
+        with pytest.raises(TrustIntegrationCommunicationError):
+            await _load(service)
+
+    assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+    assert_that(breaker.stats.error_rate, equal_to(0.0))
+
+
+async def test_circuit_closes_after_successful_trial():
+    """
+    Given an open circuit past its reset timeout
+    When the integration engine has recovered and a patient is loaded
+    Then the trial call goes through and the circuit closes
+    """
+    engine = _FaultyEngine()
+    engine.status_code = 503
+    service, breaker = _make_service(engine, reset_timeout=0)
+    for _ in range(4):
+        with pytest.raises(TrustIntegrationCommunicationError):
+            await _load(service)
+    assert_that(breaker.state, equal_to(CircuitState.HALF_OPEN))
+
+    engine.status_code = None
+    patients = await _load(service)
+
+    assert_that(patients[0].hospital_number, equal_to("fake-1"))
+    assert_that(breaker.state, equal_to(CircuitState.CLOSED))
+    assert_that(breaker.stats.times_opened, equal_to(1))
+
+
+async def test_circuit_reopens_after_failed_trial():
+    """
+    Given an open circuit past its reset timeout
+    When the integration engine still fails
+    Then the trial call opens the circuit again
+    """
+    engine = _FaultyEngine()
+    engine.status_code = 503
+    service, breaker = _make_service(engine, reset_timeout=0)
+    for _ in range(4):
+        with pytest.raises(TrustIntegrationCommunicationError):
+            await _load(service)
+
+    breaker.reset_timeout = 30
+    breaker._opened_at -= 30
+    with pytest.raises(TrustIntegrationCommunicationError):
+        await _load(service)
+
+    assert_that(breaker.state, equal_to(CircuitState.OPEN))
+    assert_that(breaker.stats.times_opened, equal_to(2))
+    assert_that(len(engine.requests), equal_to(5))
+
+
+async def test_patient_cache_serves_stale_patients_while_open():
+    """
+    Given an expired cached patient and an open circuit
+    When the patient is loaded through the cache
+    Then the expired record is served
+    """
+    engine = _FaultyEngine()
+    service, breaker = _make_service(engine)
+    cache = PatientCache(max_size=10, ttl=300, refresh_ahead=60)
+    for patient in await _load(service):
+        cache.set(patient)
+    cache._patients["fake-1"] = dataclasses.replace(
+        cache._patients["fake-1"],
+        expiry=datetime.now() - timedelta(seconds=1)
+    )
+    engine.status_code = 503
+    while breaker.state == CircuitState.CLOSED:
+        with pytest.raises(TrustIntegrationCommunicationError):
+            await _load(service)
+
+    patients = await cache.load_many(
+        hospital_numbers=["fake-1"], trust_adapter=service,
+        auth_token="token"
+    )
+
+    assert_that(patients["fake-1"].hospital_number, equal_to("fake-1"))
+    assert_that(cache.stats.stale_hits, equal_to(1))
+    with pytest.raises(CircuitOpenError):
+        await cache.load_many(
+            hospital_numbers=["fake-2"], trust_adapter=service,
+            auth_token="token"
+        )
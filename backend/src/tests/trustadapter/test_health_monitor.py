@@ -0,0 +1,108 @@
+import asyncio
+from typing import List
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from hamcrest import assert_that, equal_to, is_
+from itsdangerous import TimestampSigner
+
+from config import config
+from services import TrustAdapterService
+from trustadapter import PseudoTrustAdapter, TrustAdapter
+from trustadapter.healthmonitor import HealthMonitor
+from trustadapter.trustadapter import TrustIntegrationCommunicationError
+
+
+async def test_health_monitor_probes_integration_engine():
+    """
+    Given the integration engine fails, then recovers
+    When it is probed each time
+    Then the monitor follows its state, probing with a signed session
+    """
+    status_codes = [503, 200]
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status_codes[len(requests) - 1])
+
+    trust_adapter = PseudoTrustAdapter(transport=httpx.MockTransport(handler))
+    monitor = HealthMonitor(interval=10)
+
+    assert_that(await monitor.check(trust_adapter), is_(False))
+    with pytest.raises(TrustIntegrationCommunicationError):
+        monitor.raise_if_unhealthy()
+    assert_that(await monitor.check(trust_adapter), is_(True))
+    monitor.raise_if_unhealthy()
+
+    assert_that(requests[0].url.path, equal_to("/test/"))
+    session = requests[0].headers["cookie"].split("=", 1)[1]
+    TimestampSigner(config['SESSION_SECRET_KEY']).unsign(session)
+    await trust_adapter.close()
+
+
+async def test_health_monitor_follows_real_calls():
+    """
+    Given a healthy trust adapter service
+    When a call to the integration engine fails, then another succeeds
+    Then the monitor is flipped on each call, without probing
+    """
+    monitor = HealthMonitor(interval=10)
+    trust_adapter = AsyncMock(spec=TrustAdapter)
+    trust_adapter.load_patient.side_effect = [
+        TrustIntegrationCommunicationError("timed out"), None
+    ]
+    service = TrustAdapterService(
+        trust_adapter_client=trust_adapter, health_monitor=monitor
+    )
+
+    with pytest.raises(TrustIntegrationCommunicationError):
+        await service.load_patient(hospitalNumber="fake-1")
+    assert_that(monitor.healthy, is_(False))
+    with pytest.raises(TrustIntegrationCommunicationError):
+        service.raise_if_unavailable()
+
+    await service.load_patient(hospitalNumber="fake-1")
+    assert_that(monitor.healthy, is_(True))
+    service.raise_if_unavailable()
+    trust_adapter.test_connection.assert_not_called()
+
+
+async def test_health_monitor_ignores_refused_requests():
+    """
+    Given the integration engine refuses a request, e.g. for an expired
+    session
+    When the refusal is recorded
+    Then the integration engine is still available
+    """
+    monitor = HealthMonitor(interval=10)
+
+    monitor.record_failure(
+        TrustIntegrationCommunicationError("unauthorised", status_code=401)
+    )
+
+    assert_that(monitor.healthy, is_(True))
+
+
+async def test_health_monitor_skips_probes_after_real_calls():
+    """
+    Given the monitor is running
+    When the integration engine was called within the interval
+    Then it is not probed until the interval passes
+    """
+    monitor = HealthMonitor(interval=0.5)
+    trust_adapter = AsyncMock(spec=TrustAdapter)
+
+    monitor.start(trust_adapter)
+    await asyncio.sleep(0.05)
+    assert_that(trust_adapter.test_connection.await_count, equal_to(1))
+
+    await asyncio.sleep(0.3)
+    monitor.record_success()
+    await asyncio.sleep(0.3)
+    assert_that(trust_adapter.test_connection.await_count, equal_to(1))
+
+    await asyncio.sleep(0.3)
+    assert_that(trust_adapter.test_connection.await_count, equal_to(2))
+    await monitor.stop()
@@ -0,0 +1,90 @@
+import asyncio
+import dataclasses
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+from hamcrest import assert_that, equal_to, has_entries
+
+from trustadapter import TrustAdapter
+from trustadapter.patientcache import PatientCache, PatientCacheStats
+from trustadapter.trustadapter import Patient_IE
+
+
+def _patient(hospital_number: str, first_name: str = "Old") -> Patient_IE:
+    return Patient_IE(
+        first_name=first_name,
+        last_name="Patient",
+        hospital_number=hospital_number,
+    )
+
+
+async def test_patient_cache_loads_only_misses():
+    """
+    Given a cache holding one patient
+    When it and another patient are loaded
+    Then only the other patient is requested from the trust adapter
+    """
+    trust_adapter = AsyncMock(spec=TrustAdapter)
+    trust_adapter.load_many_patients.return_value = [_patient("fake-2")]
+    cache = PatientCache(max_size=10, ttl=300, refresh_ahead=60)
+    cache.set(_patient("fake-1"))
+
+    found = await cache.load_many(
+        hospital_numbers=["fake-1", "fake-2", "fake-3"],
+        trust_adapter=trust_adapter, auth_token="token"
+    )
+
+    trust_adapter.load_many_patients.assert_awaited_once_with(
+        hospitalNumbers=["fake-2", "fake-3"], auth_token="token"
+    )
+    assert_that(sorted(found), equal_to(["fake-1", "fake-2"]))
+    assert_that(cache.stats, equal_to(PatientCacheStats(hits=1, misses=2)))
+
+
+async def test_patient_cache_refreshes_ahead_of_expiry():
+    """
+    Given a cached patient close to expiry
+    When it is loaded
+    Then the cached record is returned and reloaded in the background
+    """
+    trust_adapter = AsyncMock(spec=TrustAdapter)
+    trust_adapter.load_many_patients.return_value = [
+        _patient("fake-1", first_name="New")
+    ]
+    cache = PatientCache(max_size=10, ttl=300, refresh_ahead=60)
+    cache.set(_patient("fake-1"))
+    cache._patients["fake-1"] = dataclasses.replace(
+        cache._patients["fake-1"],
+        expiry=datetime.now() + timedelta(seconds=30),
+        refresh_at=datetime.now() - timedelta(seconds=30)
+    )
+
+    found = await cache.load_many(
+        hospital_numbers=["fake-1"],
+        trust_adapter=trust_adapter, auth_token="token"
+    )
+    assert_that(found["fake-1"].first_name, equal_to("Old"))
+
+    await asyncio.gather(*cache._tasks)
+    found = await cache.load_many(
+        hospital_numbers=["fake-1"],
+        trust_adapter=trust_adapter, auth_token="token"
+    )
+    assert_that(found["fake-1"].first_name, equal_to("New"))
+    assert_that(
+        cache.stats.__dict__, has_entries(hits=2, misses=0, refreshes=1)
+    )
+
+
+def test_patient_cache_evicts_least_recently_used():
+    """
+    Given a full cache
+    When another patient is cached
+    Then the least recently used patient is evicted
+    """
+    cache = PatientCache(max_size=2, ttl=300, refresh_ahead=60)
+    for hospital_number in ["fake-1", "fake-2", "fake-3"]:
+        cache.set(_patient(hospital_number))
+
+    assert_that(list(cache._patients), equal_to(["fake-2", "fake-3"]))
+    assert_that(cache.stats.evictions, equal_to(1))
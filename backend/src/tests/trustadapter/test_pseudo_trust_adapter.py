@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+from typing import List
+
+import httpx
+from hamcrest import assert_that, equal_to, is_, none, same_instance
+
+from trustadapter import PseudoTrustAdapter
+from trustadapter.trustadapter import (
+    TestResultRequest_IE, TestResultRequestImmediately_IE
+)
+
+
+def _patient_json(hospital_number: str) -> dict:
+    return {
+        "first_name": "Test",
+        "last_name": "Patient",
+        "hospital_number": hospital_number,
+        "national_number": "fake-national-number",
+        "communication_method": "LETTER",
+        "date_of_birth": "2000-01-01",
+        "sex": "female",
+        "occupation": "Engineer",
+        "address": {
+            "line": "1 Street", "city": "City", "district": "District",
+            "postal_code": "AB1 2CD", "country": "England",
+        },
+        "telephone_number": "0000",
+    }
+
+
+async def test_pseudo_trust_adapter_shares_client_between_users():
+    """
+    Given the integration engine sets a cookie in its responses
+    When two users load patients
+    Then both requests go through one client, with the load timeout,
+    and each only sends its own user's session cookie
+    """
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json=_patient_json("fake-1"),
+            headers={"Set-Cookie": "SDSESSION=from-response; Path=/"}
+        )
+
+    trust_adapter = PseudoTrustAdapter(transport=httpx.MockTransport(handler))
+
+    await trust_adapter.load_patient(
+        hospitalNumber="fake-1", auth_token="first-user"
+    )
+    client = trust_adapter._client
+    await trust_adapter.load_patient(
+        hospitalNumber="fake-1", auth_token="second-user"
+    )
+
+    assert_that(trust_adapter._client, same_instance(client))
+    assert_that(
+        [request.headers["cookie"] for request in requests],
+        equal_to(["SDSESSION=first-user", "SDSESSION=second-user"])
+    )
+    assert_that(
+        requests[0].extensions["timeout"],
+        equal_to(trust_adapter.read_timeout.as_dict())
+    )
+
+    await trust_adapter.close()
+    assert_that(client.is_closed, is_(True))
+    assert_that(trust_adapter._client, none())
+
+
+async def test_pseudo_trust_adapter_creates_many_test_results(
+    test_clinical_request_type
+):
+    """
+    Given a pending and a completed test result to create
+    When they are created together
+    Then they are sent in one request, and returned in the order asked
+    """
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[
+            {
+                "id": id, "description": None,
+                "type_reference_name": params["typeReferenceName"],
+                "current_state": params.get("currentState") or "INIT",
+                "added_at": "2022-01-01T00:00:00",
+                "updated_at": "2022-01-01T00:00:00",
+            }
+            for id, params in enumerate(json.loads(request.content))
+        ])
+
+    trust_adapter = PseudoTrustAdapter(transport=httpx.MockTransport(handler))
+
+    test_results = await trust_adapter.create_many_test_results(
+        testResults=[
+            TestResultRequest_IE(
+                type_id=test_clinical_request_type.id,
+                hospital_number="fake-1", pathway_name="pathway"
+            ),
+            TestResultRequestImmediately_IE(
+                type_id=test_clinical_request_type.id,
+                current_state="COMPLETED",
+                hospital_number="fake-1", pathway_name="pathway"
+            ),
+        ],
+        auth_token="token"
+    )
+
+    assert_that(len(requests), equal_to(1))
+    assert_that(requests[0].url.path, equal_to("/testresults"))
+    params = json.loads(requests[0].content)
+    assert_that("currentState" in params[0], is_(False))
+    assert_that(params[1]["currentState"], equal_to("COMPLETED"))
+    assert_that([r.id for r in test_results], equal_to([0, 1]))
+    assert_that(
+        [r.current_state for r in test_results],
+        equal_to(["INIT", "COMPLETED"])
+    )
+    assert_that(test_results[0].added_at, equal_to(datetime(2022, 1, 1)))
+
+    assert_that(
+        await trust_adapter.create_many_test_results(
+            testResults=[], auth_token="token"
+        ),
+        equal_to([])
+    )
+    assert_that(len(requests), equal_to(1))
+    await trust_adapter.close()
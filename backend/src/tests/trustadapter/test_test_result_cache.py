@@ -0,0 +1,67 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from hamcrest import assert_that, equal_to
+
+import dataloaders
+from trustadapter.testresultcache import CompletedTestResultCache
+from trustadapter.trustadapter import TestResult_IE
+
+
+def _test_result(id: int, current_state: str = "COMPLETED") -> TestResult_IE:
+    return TestResult_IE(
+        id=id,
+        description=f"result {id}",
+        type_reference_name="ref",
+        current_state=current_state,
+        added_at=datetime(2022, 1, 1),
+        updated_at=datetime(2022, 1, 2),
+    )
+
+
+async def test_completed_test_results_not_reloaded(mock_trust_adapter):
+    """
+    Given a completed and an incomplete test result
+    When they are loaded in two requests
+    Then only the incomplete one is loaded from the trust adapter again
+    """
+    mock_trust_adapter.load_many_test_results.return_value = [
+        _test_result(1), _test_result(2, current_state="WAITING")
+    ]
+
+    loader = dataloaders.TestResultByReferenceIdFromIELoader
+    for _ in range(2):
+        context = {
+            'request': SimpleNamespace(cookies={'SDSESSION': "token"})
+        }
+        await loader.load_many_from_id(context=context, ids=[1, 2])
+
+    assert_that(
+        [
+            call.kwargs['recordIds'] for call in
+            mock_trust_adapter.load_many_test_results.await_args_list
+        ],
+        equal_to([[1, 2], [2]])
+    )
+
+
+async def test_test_result_cache_spills_to_disk(tmp_path):
+    """
+    Given a cache holding one test result in memory, with a disk store
+    When a second is cached, then the first is read
+    Then the first is read back from disk
+    """
+    cache = CompletedTestResultCache(
+        max_size=1, disk_path=str(tmp_path / "results.sqlite"),
+        disk_max_size=10
+    )
+    await cache.set_many([_test_result(1)])
+    await cache.set_many([_test_result(2)])
+
+    found = await cache.get_many([1, 3])
+
+    assert_that(found, equal_to({1: _test_result(1)}))
+    assert_that(
+        (cache.stats.disk_hits, cache.stats.misses, cache.stats.spilled),
+        equal_to((1, 1, 2))
+    )
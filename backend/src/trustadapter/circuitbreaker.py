@@ -0,0 +1,199 @@
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple
+from config import config
+from .trustadapter import TrustIntegrationCommunicationError
+
+log = logging.getLogger("uvicorn")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(TrustIntegrationCommunicationError):
+    """
+    This is raised instead of calling the trust integration engine while
+    the circuit is open
+    """
+
+
+@dataclass(frozen=True)
+class CircuitBreakerStats:
+    """
+    State of a CircuitBreaker, over the calls in its window
+    """
+    state: CircuitState
+    calls: int
+    error_rate: float
+    p95_latency: float
+    times_opened: int
+    rejected: int
+
+
+class CircuitBreaker:
+    """
+    Stops calling the trust integration engine while it fails or is
+    slow, so requests fail at once rather than each waiting for it. The
+    outcomes of the last `window` calls are kept. Once there are
+    `min_calls` of them, the circuit opens if their error rate reaches
+    `error_rate`, or their 95th percentile latency goes over
+    `latency_budget` seconds. After `reset_timeout` seconds open, one
+    trial call is let through: the circuit closes if it succeeds within
+    the budget, and opens again otherwise
+    """
+
+    def __init__(
+        self, window: int = None, min_calls: int = None,
+        error_rate: float = None, latency_budget: float = None,
+        reset_timeout: float = None
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.latency_budget = latency_budget
+        self.reset_timeout = reset_timeout
+        # (failed, latency) of each call
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        The current state of the circuit
+        """
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if monotonic() - self._opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    @property
+    def stats(self) -> CircuitBreakerStats:
+        """
+        The current state of the circuit, with the error rate and
+        latency it is judged by
+        """
+        return CircuitBreakerStats(
+            state=self.state,
+            calls=len(self._outcomes),
+            error_rate=self._error_rate(),
+            p95_latency=self._p95_latency(),
+            times_opened=self._times_opened,
+            rejected=self._rejected,
+        )
+
+    async def call(
+        self, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """
+        Calls the trust integration engine through the circuit
+
+        :param func: coroutine function calling the integration engine
+        :param args: positional arguments of the function
+        :param kwargs: keyword arguments of the function
+
+        :return: result of the function
+
+        :raise CircuitOpenError: the circuit is open
+        :raise TrustIntegrationCommunicationError: the call failed
+        """
+        trial = self._start_call()
+        started = monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except TrustIntegrationCommunicationError as e:
+            self._record(e.engine_failed, monotonic() - started, trial)
+            raise
+        except BaseException:
+            # not an outcome of the integration engine, e.g. cancelled
+            if trial:
+                self._trial_running = False
+            raise
+        self._record(False, monotonic() - started, trial)
+        return result
+
+    def reset(self):
+        """
+        Closes the circuit and forgets past calls
+        """
+        self._outcomes.clear()
+        self._opened_at = None
+        self._trial_running = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    def _start_call(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return False
+        if state == CircuitState.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        self._rejected += 1
+        raise CircuitOpenError(
+            "Trust system is unavailable. Please try again later."
+        )
+
+    def _record(self, failed: bool, latency: float, trial: bool):
+        if trial:
+            self._trial_running = False
+            if failed or latency > self.latency_budget:
+                self._open()
+            else:
+                log.info("Trust integration engine circuit closed")
+                self._outcomes.clear()
+                self._opened_at = None
+            return
+        if self._opened_at is not None:
+            # finished after the circuit opened
+            return
+
+        self._outcomes.append((failed, latency))
+        if len(self._outcomes) < self.min_calls:
+            return
+        if self._error_rate() >= self.error_rate \
+                or self._p95_latency() > self.latency_budget:
+            self._open()
+
+    def _open(self):
+        log.warning(
+            "Trust integration engine circuit opened: error rate "
+            f"{self._error_rate():.2f}, p95 latency "
+            f"{self._p95_latency():.3f}s"
+        )
+        self._opened_at = monotonic()
+        self._times_opened += 1
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        return failures / len(self._outcomes)
+
+    def _p95_latency(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        latencies = sorted(latency for _, latency in self._outcomes)
+        return latencies[math.ceil(len(latencies) * 0.95) - 1]
+
+
+trust_adapter_circuit_breaker = CircuitBreaker(
+    window=int(config.get('TRUST_ADAPTER_BREAKER_WINDOW', 50)),
+    min_calls=int(config.get('TRUST_ADAPTER_BREAKER_MIN_CALLS', 10)),
+    error_rate=float(config.get('TRUST_ADAPTER_BREAKER_ERROR_RATE', 0.5)),
+    latency_budget=float(
+        config.get('TRUST_ADAPTER_BREAKER_LATENCY_BUDGET', 2)
+    ),
+    reset_timeout=float(
+        config.get('TRUST_ADAPTER_BREAKER_RESET_TIMEOUT', 30)
+    ),
+)
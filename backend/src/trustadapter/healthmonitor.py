@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from base64 import b64encode
+from random import getrandbits
+from time import monotonic
+from typing import Optional
+from itsdangerous import TimestampSigner
+from config import config
+from .trustadapter import TrustAdapter, TrustIntegrationCommunicationError
+
+log = logging.getLogger("uvicorn")
+
+
+class HealthMonitor:
+    """
+    Keeps whether the trust integration engine is available, so writes
+    need not test the connection before each call. The engine is probed
+    in the background once `interval` seconds pass without a call to it.
+    The outcome of every call, probe or not, updates the state at once
+    """
+
+    def __init__(self, interval: float = None):
+        self.interval = interval
+        self._healthy = True
+        self._checked_at: Optional[float] = None
+        self._signer = TimestampSigner(config['SESSION_SECRET_KEY'])
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        """
+        Whether the last call to the integration engine succeeded. True
+        until the first call
+        """
+        return self._healthy
+
+    def record_success(self):
+        """
+        Marks the integration engine available, after a call to it
+        succeeded
+        """
+        if not self._healthy:
+            log.info("Trust integration engine is available")
+        self._healthy = True
+        self._checked_at = monotonic()
+
+    def record_failure(self, error: Exception = None):
+        """
+        Marks the integration engine unavailable, after a call to it
+        failed. Requests it refused, e.g. for an expired session, are
+        recorded as successes
+
+        :param error: error the call raised
+        """
+        if isinstance(error, TrustIntegrationCommunicationError) \
+                and not error.engine_failed:
+            self.record_success()
+            return
+        if self._healthy:
+            log.warning(f"Trust integration engine is unavailable: {error}")
+        self._healthy = False
+        self._checked_at = monotonic()
+
+    def raise_if_unhealthy(self):
+        """
+        Raises if the last call to the integration engine failed
+
+        :raise TrustIntegrationCommunicationError: the integration engine
+            is unavailable
+        """
+        if not self._healthy:
+            raise TrustIntegrationCommunicationError(
+                "Trust system is unavailable. Please try again later."
+            )
+
+    async def check(self, trust_adapter: TrustAdapter = None) -> bool:
+        """
+        Probes the integration engine and records the outcome
+
+        :param trust_adapter: adapter to probe the integration engine with
+
+        :return: whether the integration engine is available
+        """
+        # the probe runs outside any request, so it signs its own session
+        auth_token = self._signer.sign(
+            b64encode(str(getrandbits(64)).encode("utf-8"))
+        ).decode("utf-8")
+        try:
+            await trust_adapter.test_connection(auth_token=auth_token)
+        except Exception as e:
+            self.record_failure(e)
+        else:
+            self.record_success()
+        return self._healthy
+
+    def reset(self):
+        """
+        Marks the integration engine available, forgetting past calls
+        """
+        self._healthy = True
+        self._checked_at = None
+
+    async def _run(self, trust_adapter: TrustAdapter):
+        while True:
+            if self._checked_at is None \
+                    or monotonic() - self._checked_at >= self.interval:
+                await self.check(trust_adapter)
+            await asyncio.sleep(
+                self.interval - (monotonic() - self._checked_at)
+            )
+
+    def start(self, trust_adapter: TrustAdapter = None):
+        """
+        Starts probing the integration engine in the background
+
+        :param trust_adapter: adapter to probe the integration engine with
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(trust_adapter))
+
+    async def stop(self):
+        """
+        Stops probing
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+trust_adapter_health_monitor = HealthMonitor(
+    interval=float(config.get('TRUST_ADAPTER_HEALTH_INTERVAL', 10)),
+)
@@ -0,0 +1,206 @@
+import asyncio
+import dataclasses
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from config import config
+from .circuitbreaker import CircuitOpenError
+from .trustadapter import Patient_IE, TrustAdapter
+
+log = logging.getLogger("uvicorn")
+
+
+@dataclass
+class PatientCacheStats:
+    """
+    Hit rate and refresh counts of a PatientCache
+    """
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    evictions: int = 0
+    stale_hits: int = 0
+
+
+@dataclass(frozen=True)
+class _CachedPatient:
+    patient: Patient_IE
+    expiry: datetime
+    refresh_at: datetime
+
+
+class PatientCache:
+    """
+    Per-process LRU cache of hospital number to the patient's record in
+    the trust integration engine, shared between requests. Entries live
+    for `ttl` seconds. An entry read within `refresh_ahead` seconds of
+    its expiry is reloaded in the background, using the reading
+    request's auth token, so patients in regular use are not reloaded
+    while a request waits. Expired entries are kept until evicted, and
+    served while the circuit to the integration engine is open
+    """
+
+    def __init__(
+        self, max_size: int = None, ttl: int = None,
+        refresh_ahead: int = None
+    ):
+        self.max_size = max_size
+        self.ttl = timedelta(seconds=ttl)
+        self.refresh_ahead = timedelta(seconds=refresh_ahead)
+        self.stats = PatientCacheStats()
+        self._patients: "OrderedDict[str, _CachedPatient]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def set(self, patient: Patient_IE = None):
+        """
+        Caches a patient, e.g. once created in the integration engine
+
+        :param patient: patient record from the integration engine
+        """
+        now = datetime.now()
+        hospital_number = patient.hospital_number
+        self._patients.pop(hospital_number, None)
+        # a copy, as callers may add attributes to their record
+        self._patients[hospital_number] = _CachedPatient(
+            patient=dataclasses.replace(patient),
+            expiry=now + self.ttl,
+            refresh_at=now + self.ttl - self.refresh_ahead
+        )
+        while len(self._patients) > self.max_size:
+            self._patients.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self):
+        """
+        Removes every patient from the cache and resets its stats
+        """
+        self._patients.clear()
+        self.stats = PatientCacheStats()
+
+    async def load_many(
+        self, hospital_numbers: List[str] = None,
+        trust_adapter: TrustAdapter = None, auth_token: str = None
+    ) -> Dict[str, Patient_IE]:
+        """
+        Gets patients from the cache, loading the misses from the
+        integration engine in one call. Hits due a refresh are reloaded
+        in the background
+
+        :param hospital_numbers: hospital numbers of the patients
+        :param trust_adapter: adapter to load misses and refreshes with
+        :param auth_token: auth token of the current request
+
+        :return: Dict of hospital number to patient, without patients
+            not found
+        """
+        now = datetime.now()
+        found: Dict[str, Patient_IE] = {}
+        misses: List[str] = []
+        due_refresh: List[str] = []
+        for hospital_number in hospital_numbers:
+            cached = self._get_entry(hospital_number, now)
+            if cached is None:
+                misses.append(hospital_number)
+                continue
+            found[hospital_number] = cached.patient
+            if cached.refresh_at <= now:
+                due_refresh.append(hospital_number)
+        self.stats.hits += len(found)
+        self.stats.misses += len(misses)
+
+        if due_refresh:
+            self._refresh(due_refresh, trust_adapter, auth_token)
+
+        if misses:
+            try:
+                loaded = await trust_adapter.load_many_patients(
+                    hospitalNumbers=misses, auth_token=auth_token
+                )
+            except CircuitOpenError:
+                stale = self._get_stale(misses)
+                if not stale:
+                    raise
+                self.stats.stale_hits += len(stale)
+                found.update(stale)
+                return found
+            for patient in loaded:
+                self.set(patient)
+                found[patient.hospital_number] = patient
+        return found
+
+    def _get_entry(
+        self, hospital_number: str, now: datetime = None
+    ) -> Optional[_CachedPatient]:
+        cached = self._patients.get(hospital_number)
+        if cached is None or cached.expiry <= (now or datetime.now()):
+            return None
+        self._patients.move_to_end(hospital_number)
+        return cached
+
+    def _get_stale(
+        self, hospital_numbers: Iterable[str]
+    ) -> Dict[str, Patient_IE]:
+        stale: Dict[str, Patient_IE] = {}
+        for hospital_number in hospital_numbers:
+            cached = self._patients.get(hospital_number)
+            if cached is not None:
+                stale[hospital_number] = cached.patient
+        return stale
+
+    def _refresh(
+        self, hospital_numbers: Iterable[str],
+        trust_adapter: TrustAdapter, auth_token: str
+    ):
+        hospital_numbers = [
+            n for n in hospital_numbers if n not in self._refreshing
+        ]
+        if not hospital_numbers:
+            return
+        self._refreshing.update(hospital_numbers)
+        task = asyncio.create_task(
+            self._run_refresh(hospital_numbers, trust_adapter, auth_token)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_refresh(
+        self, hospital_numbers: List[str],
+        trust_adapter: TrustAdapter, auth_token: str
+    ):
+        try:
+            loaded = await trust_adapter.load_many_patients(
+                hospitalNumbers=hospital_numbers, auth_token=auth_token
+            )
+            for patient in loaded:
+                self.set(patient)
+            self.stats.refreshes += 1
+        except Exception as e:
+            # entries are left to expire
+            self.stats.refresh_failures += 1
+            log.error(f"Failed to refresh cached patients: {e}")
+        finally:
+            self._refreshing.difference_update(hospital_numbers)
+
+    async def stop(self):
+        """
+        Cancels refreshes still running
+        """
+        tasks, self._tasks = self._tasks, set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    def __len__(self):
+        return len(self._patients)
+
+
+patient_cache = PatientCache(
+    max_size=int(config.get('PATIENT_CACHE_SIZE', 5000)),
+    ttl=int(config.get('PATIENT_CACHE_TTL', 300)),
+    refresh_ahead=int(config.get('PATIENT_CACHE_REFRESH_AHEAD', 60)),
+)
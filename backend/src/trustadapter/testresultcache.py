@@ -0,0 +1,189 @@
+import asyncio
+import dataclasses
+import json
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import config
+from SdTypes import ClinicalRequestState
+from .trustadapter import TestResult_IE
+
+
+@dataclass
+class TestResultCacheStats:
+    """
+    Hit rate of a CompletedTestResultCache
+    """
+    __test__ = False
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    spilled: int = 0
+
+
+def _to_json(test_result: TestResult_IE) -> str:
+    record = dataclasses.asdict(test_result)
+    for name in ("added_at", "updated_at"):
+        if record[name] is not None:
+            record[name] = record[name].isoformat()
+    return json.dumps(record)
+
+
+def _from_json(data: str) -> TestResult_IE:
+    record = json.loads(data)
+    for name in ("added_at", "updated_at"):
+        if record[name] is not None:
+            record[name] = datetime.fromisoformat(record[name])
+    return TestResult_IE(**record)
+
+
+class _DiskStore:
+    """
+    SQLite file holding test results evicted from memory, keeping at
+    most `max_size` of the most recently stored. Only used from the
+    cache's single worker thread
+    """
+
+    def __init__(self, path: str = None, max_size: int = None):
+        self.path = path
+        self.max_size = max_size
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS test_result ("
+                "id INTEGER PRIMARY KEY, record TEXT NOT NULL, "
+                "stored_at INTEGER NOT NULL)"
+            )
+        return self._conn
+
+    def get_many(self, ids: List[int]) -> Dict[int, TestResult_IE]:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT id, record FROM test_result "
+            f"WHERE id IN ({', '.join('?' * len(ids))})",
+            ids
+        ).fetchall()
+        return {id: _from_json(record) for id, record in rows}
+
+    def put_many(self, test_results: List[TestResult_IE]):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO test_result (id, record, stored_at) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(stored_at), 0) + 1 "
+                "FROM test_result))",
+                [(int(r.id), _to_json(r)) for r in test_results]
+            )
+            conn.execute(
+                "DELETE FROM test_result WHERE stored_at <= "
+                "(SELECT MAX(stored_at) FROM test_result) - ?",
+                (self.max_size,)
+            )
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM test_result")
+
+
+class CompletedTestResultCache:
+    """
+    Per-process cache of completed test results from the trust
+    integration engine, keyed by reference ID. Completed results do not
+    change, so entries never expire. At most `max_size` are held in
+    memory, least recently used first out; with a `disk_path`, those
+    pushed out are kept on disk instead of being dropped
+    """
+
+    def __init__(
+        self, max_size: int = None, disk_path: str = None,
+        disk_max_size: int = None
+    ):
+        self.max_size = max_size
+        self.stats = TestResultCacheStats()
+        self._results: "OrderedDict[int, TestResult_IE]" = OrderedDict()
+        self._disk: Optional[_DiskStore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if disk_path:
+            self._disk = _DiskStore(path=disk_path, max_size=disk_max_size)
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="testresultcache"
+            )
+
+    async def _run_on_disk(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def get_many(
+        self, ids: List[int] = None
+    ) -> Dict[int, TestResult_IE]:
+        """
+        Gets cached test results
+
+        :param ids: reference IDs of the test results
+
+        :return: Dict of reference ID to test result, without those
+            not cached
+        """
+        found: Dict[int, TestResult_IE] = {}
+        for id in ids:
+            test_result = self._results.get(id)
+            if test_result is not None:
+                self._results.move_to_end(id)
+                found[id] = test_result
+        self.stats.hits += len(found)
+
+        missing = [id for id in ids if id not in found]
+        if missing and self._disk is not None:
+            from_disk = await self._run_on_disk(self._disk.get_many, missing)
+            self.stats.disk_hits += len(from_disk)
+            await self._put_in_memory(list(from_disk.values()))
+            found.update(from_disk)
+
+        self.stats.misses += len(ids) - len(found)
+        return found
+
+    async def set_many(self, test_results: List[TestResult_IE] = None):
+        """
+        Caches the completed test results among those given
+
+        :param test_results: test results from the integration engine
+        """
+        completed = ClinicalRequestState.COMPLETED.value
+        await self._put_in_memory([
+            test_result for test_result in test_results
+            if test_result.current_state == completed
+        ])
+
+    async def _put_in_memory(self, test_results: List[TestResult_IE]):
+        for test_result in test_results:
+            self._results[int(test_result.id)] = test_result
+            self._results.move_to_end(int(test_result.id))
+
+        evicted: List[TestResult_IE] = []
+        while len(self._results) > self.max_size:
+            evicted.append(self._results.popitem(last=False)[1])
+        if evicted and self._disk is not None:
+            await self._run_on_disk(self._disk.put_many, evicted)
+            self.stats.spilled += len(evicted)
+
+    async def clear(self):
+        """
+        Removes every test result from the cache, including on disk
+        """
+        self._results.clear()
+        if self._disk is not None:
+            await self._run_on_disk(self._disk.clear)
+
+
+test_result_cache = CompletedTestResultCache(
+    max_size=int(config.get('TEST_RESULT_CACHE_SIZE', 10000)),
+    disk_path=config.get('TEST_RESULT_CACHE_PATH', None),
+    disk_max_size=int(config.get('TEST_RESULT_CACHE_DISK_SIZE', 1000000)),
+)
@@ -1,8 +1,12 @@
+import asyncio
 import logging
 import httpx
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from config import config
 from models import ClinicalRequestType
+from referencedata import reference_data
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import date, datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -24,6 +28,7 @@ class Patient_IE:
 
 @dataclass
 class TestResultRequest_IE:
+    __test__ = False
     type_id: int = None
     hospital_number: str = None
     pathway_name: str = None
@@ -31,6 +36,7 @@ class TestResultRequest_IE:
 
 @dataclass
 class TestResultRequestImmediately_IE:
+    __test__ = False
     type_id: int = None
     current_state: str = None
     added_at: datetime = datetime.now()
@@ -157,6 +163,28 @@ class TrustAdapter(ABC):
         :return: String ID of created test result
         """
 
+    @abstractmethod
+    async def create_many_test_results(
+        self,
+        testResults: List[
+            Union[TestResultRequest_IE, TestResultRequestImmediately_IE]
+        ] = None,
+        auth_token: str = None
+    ) -> List[TestResult_IE]:
+        """
+        Create many test results in one call
+        :param auth_token: Auth token string to pass to backend
+        :param testResults: Test results to create, immediately if given
+            as TestResultRequestImmediately_IE
+        :return: List of created test results, in the order requested
+        """
+
+    async def close(self):
+        """
+        Releases connections held to the trust integration engine, on
+        shutdown
+        """
+
 
 class TrustIntegrationCommunicationError(Exception):
     """
@@ -164,6 +192,23 @@ class TrustIntegrationCommunicationError(Exception):
     fails or times out
     """
 
+    def __init__(self, message: str = None, status_code: int = None):
+        """
+        :param message: error message
+        :param status_code: HTTP status of the response, if one was
+            received
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def engine_failed(self) -> bool:
+        """
+        Whether the integration engine failed, rather than refusing one
+        request, e.g. for an expired session
+        """
+        return self.status_code is None or self.status_code >= 500
+
 
 class HTTPRequestType(Enum):
     POST = "POST"
@@ -172,30 +217,39 @@ class HTTPRequestType(Enum):
 
 async def httpRequest(
     method: HTTPRequestType, endpoint: str,
-    json: dict = {}, cookies: dict = {}
+    json: dict = {}, cookies: dict = {},
+    client: httpx.AsyncClient = None,
+    timeout: httpx.Timeout = httpx.USE_CLIENT_DEFAULT
 ):
+    """
+    Sends a request to the trust integration engine
+
+    :param method: HTTP method
+    :param endpoint: URL to send the request to
+    :param json: body of POST requests
+    :param cookies: cookies to send
+    :param client: client to send the request through, a new one is
+        used for this request if not given
+    :param timeout: timeouts of this request, defaults to the client's
+
+    :return: response
+
+    :raise TrustIntegrationCommunicationError: request failed
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            if method == HTTPRequestType.POST:
-                response = await client.post(
-                    endpoint,
-                    json=json,
-                    cookies=cookies
-                )
-            elif method == HTTPRequestType.GET:
-                response = await client.get(
-                    endpoint,
-                    cookies=cookies
+        if client is None:
+            async with httpx.AsyncClient() as client:
+                return await _send(
+                    client, method, endpoint, json, cookies, timeout
                 )
-
-            response.raise_for_status()
-            return response
+        return await _send(client, method, endpoint, json, cookies, timeout)
 
     except httpx.HTTPStatusError as e:
         logging.error(e)
         raise TrustIntegrationCommunicationError(
             "Connection to trust system gave HTTP error: "
-            f"{response.status_code}. Please try again later."
+            f"{e.response.status_code}. Please try again later.",
+            status_code=e.response.status_code
         )
     except httpx.TimeoutException as e:
         logging.error(e)
@@ -209,6 +263,28 @@ async def httpRequest(
         )
 
 
+async def _send(
+    client: httpx.AsyncClient, method: HTTPRequestType, endpoint: str,
+    json: dict, cookies: dict, timeout: httpx.Timeout
+) -> httpx.Response:
+    if method == HTTPRequestType.POST:
+        response = await client.post(
+            endpoint,
+            json=json,
+            cookies=cookies,
+            timeout=timeout
+        )
+    elif method == HTTPRequestType.GET:
+        response = await client.get(
+            endpoint,
+            cookies=cookies,
+            timeout=timeout
+        )
+
+    response.raise_for_status()
+    return response
+
+
 class PseudoTrustAdapter(TrustAdapter):
     """
     Pseudo Integration Engine
@@ -216,14 +292,76 @@ class PseudoTrustAdapter(TrustAdapter):
     This is the Integration Engine implementation for the pseudo-trust backend.
     """
 
-    def __init__(self):
+    def __init__(self, transport: httpx.AsyncBaseTransport = None):
         """
         Constructor
+
+        :param transport: transport of the HTTP client, defaults to
+            connecting to the integration engine over the network
         """
         self.TRUST_INTEGRATION_ENGINE_ENDPOINT = "http://sd-pseudotie:8081"
+        self._transport = transport
+        self.limits = httpx.Limits(
+            max_connections=int(
+                config.get('TRUST_ADAPTER_MAX_CONNECTIONS', 50)
+            ),
+            max_keepalive_connections=int(
+                config.get('TRUST_ADAPTER_MAX_KEEPALIVE_CONNECTIONS', 20)
+            ),
+            keepalive_expiry=float(
+                config.get('TRUST_ADAPTER_KEEPALIVE_EXPIRY', 30)
+            )
+        )
+        connect_timeout = float(
+            config.get('TRUST_ADAPTER_CONNECT_TIMEOUT', 2)
+        )
+        # loads are waited on by requests, creates may do more work
+        self.read_timeout = httpx.Timeout(
+            float(config.get('TRUST_ADAPTER_READ_TIMEOUT', 5)),
+            connect=connect_timeout
+        )
+        self.write_timeout = httpx.Timeout(
+            float(config.get('TRUST_ADAPTER_WRITE_TIMEOUT', 15)),
+            connect=connect_timeout
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # created lazily so its connections belong to the running loop
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.read_timeout,
+                transport=self._transport,
+                # shared by every user's requests, so cookies set by
+                # responses must not be kept
+                cookies=CookieJar(
+                    policy=DefaultCookiePolicy(allowed_domains=[])
+                )
+            )
+            self._client_loop = loop
+        return self._client
 
-    async def test_connection(self, auth_token: str = None):
+    async def _request(
+        self, method: HTTPRequestType, endpoint: str,
+        json: dict = {}, cookies: dict = {}, timeout: httpx.Timeout = None
+    ):
         return await httpRequest(
+            method, endpoint, json=json, cookies=cookies,
+            client=self._get_client(),
+            timeout=timeout or self.read_timeout
+        )
+
+    async def close(self):
+        client, self._client = self._client, None
+        loop, self._client_loop = self._client_loop, None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    async def test_connection(self, auth_token: str = None):
+        return await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/test/',
             cookies={"SDSESSION": auth_token}
@@ -250,11 +388,12 @@ class PseudoTrustAdapter(TrustAdapter):
             },
             "telephone_number": patient.telephone_number
         }
-        patientRecord = await httpRequest(
+        patientRecord = await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/debug/patient/',
             json=json,
-            cookies={"SDSESSION": auth_token}
+            cookies={"SDSESSION": auth_token},
+            timeout=self.write_timeout
         )
         if not patientRecord:
             return None
@@ -285,7 +424,7 @@ class PseudoTrustAdapter(TrustAdapter):
     async def load_patient(
         self, hospitalNumber: str = None, auth_token: str = None
     ) -> Optional[Patient_IE]:
-        patientRecord = await httpRequest(
+        patientRecord = await self._request(
             HTTPRequestType.GET,
             (
                 f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/patient'
@@ -321,7 +460,7 @@ class PseudoTrustAdapter(TrustAdapter):
     async def load_many_patients(
         self, hospitalNumbers: List = None, auth_token: str = None
     ) -> List[Optional[Patient_IE]]:
-        patientList = await httpRequest(
+        patientList = await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/patient/hospital/',
             json=hospitalNumbers,
@@ -357,28 +496,29 @@ class PseudoTrustAdapter(TrustAdapter):
             )
         return patientObjectList
 
-    async def create_test_result(
-        self, testResult: TestResultRequest_IE = None, auth_token: str = None
-    ) -> TestResult_IE:
+    @staticmethod
+    async def _test_result_params(
+        testResult: Union[
+            TestResultRequest_IE, TestResultRequestImmediately_IE
+        ]
+    ) -> dict:
         params = {}
-        clinicalRequestType: ClinicalRequestType = await ClinicalRequestType.\
-            get(int(testResult.type_id))
+        clinicalRequestType: ClinicalRequestType = await reference_data.\
+            get_clinical_request_type(int(testResult.type_id))
         params['typeReferenceName'] = clinicalRequestType.ref_name
         params['hospitalNumber'] = testResult.hospital_number
         params['pathwayName'] = testResult.pathway_name
-
-        testResultRecord = await httpRequest(
-            HTTPRequestType.POST,
-            f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/testresult',
-            json=params,
-            cookies={"SDSESSION": auth_token}
-        )
-
-        if not testResultRecord:
-            return None
-
-        testResultRecord = testResultRecord.json()
-
+        if isinstance(testResult, TestResultRequestImmediately_IE):
+            params['addedAt'] = str(testResult.added_at) if (
+                testResult.added_at) else None
+            params['updatedAt'] = str(testResult.updated_at) if (
+                testResult.updated_at) else None
+            params['currentState'] = testResult.current_state if (
+                testResult.current_state) else None
+        return params
+
+    @staticmethod
+    def _test_result_from_json(testResultRecord: dict) -> TestResult_IE:
         testResultRecord['added_at'] = datetime.fromisoformat(
             testResultRecord['added_at']
         )
@@ -390,10 +530,28 @@ class PseudoTrustAdapter(TrustAdapter):
             **testResultRecord
         )
 
+    async def create_test_result(
+        self, testResult: TestResultRequest_IE = None, auth_token: str = None
+    ) -> TestResult_IE:
+        params = await self._test_result_params(testResult)
+
+        testResultRecord = await self._request(
+            HTTPRequestType.POST,
+            f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/testresult',
+            json=params,
+            cookies={"SDSESSION": auth_token},
+            timeout=self.write_timeout
+        )
+
+        if not testResultRecord:
+            return None
+
+        return self._test_result_from_json(testResultRecord.json())
+
     async def load_test_result(
         self, recordId: str = None, auth_token: str = None
     ) -> Optional[TestResult_IE]:
-        testResultRecord = await httpRequest(
+        testResultRecord = await self._request(
             HTTPRequestType.GET,
             (
                 f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}'
@@ -419,7 +577,7 @@ class PseudoTrustAdapter(TrustAdapter):
     async def load_many_test_results(
         self, recordIds: List = None, auth_token: str = None
     ) -> List[Optional[TestResult_IE]]:
-        testResultList = await httpRequest(
+        testResultList = await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/testresults/get/',
             json=recordIds,
@@ -442,7 +600,7 @@ class PseudoTrustAdapter(TrustAdapter):
         return testResultObjectList
 
     async def patient_search(self, query: str) -> List[Patient_IE]:
-        response = await httpRequest(
+        response = await self._request(
             HTTPRequestType.GET,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/patientsearch/{query}'
         )
@@ -457,10 +615,11 @@ class PseudoTrustAdapter(TrustAdapter):
         return patient_list
 
     async def clear_database(self, auth_token: str = None) -> bool:
-        await httpRequest(
+        await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/debug/cleardatabase/',
-            cookies={"SDSESSION": auth_token}
+            cookies={"SDSESSION": auth_token},
+            timeout=self.write_timeout
         )
         return True
 
@@ -468,38 +627,44 @@ class PseudoTrustAdapter(TrustAdapter):
         self, testResult: TestResultRequestImmediately_IE = None,
         auth_token: str = None
     ) -> TestResult_IE:
-        params = {}
-        clinicalRequestType: ClinicalRequestType = await ClinicalRequestType\
-            .get(int(testResult.type_id))
-        params['typeReferenceName'] = clinicalRequestType.ref_name
-        params['hospitalNumber'] = testResult.hospital_number
-        params['pathwayName'] = testResult.pathway_name
-        params['addedAt'] = str(testResult.added_at) if (
-            testResult.added_at) else None
-        params['updatedAt'] = str(testResult.updated_at) if (
-            testResult.updated_at) else None
-        params['currentState'] = testResult.current_state if (
-            testResult.current_state) else None
-
-        testResultRecord = await httpRequest(
+        params = await self._test_result_params(testResult)
+
+        testResultRecord = await self._request(
             HTTPRequestType.POST,
             f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/debug/testresult/',
             json=params,
-            cookies={"SDSESSION": auth_token}
+            cookies={"SDSESSION": auth_token},
+            timeout=self.write_timeout
         )
 
         if not testResultRecord:
             return None
 
-        testResultRecord = testResultRecord.json()
+        return self._test_result_from_json(testResultRecord.json())
 
-        testResultRecord['added_at'] = datetime.fromisoformat(
-            testResultRecord['added_at']
-        )
-        testResultRecord['updated_at'] = datetime.fromisoformat(
-            testResultRecord['updated_at']
+    async def create_many_test_results(
+        self,
+        testResults: List[
+            Union[TestResultRequest_IE, TestResultRequestImmediately_IE]
+        ] = None,
+        auth_token: str = None
+    ) -> List[TestResult_IE]:
+        if not testResults:
+            return []
+        params = [
+            await self._test_result_params(testResult)
+            for testResult in testResults
+        ]
+
+        testResultList = await self._request(
+            HTTPRequestType.POST,
+            f'{self.TRUST_INTEGRATION_ENGINE_ENDPOINT}/testresults',
+            json=params,
+            cookies={"SDSESSION": auth_token},
+            timeout=self.write_timeout
         )
 
-        return TestResult_IE(
-            **testResultRecord
-        )
+        return [
+            self._test_result_from_json(record)
+            for record in testResultList.json()
+        ]
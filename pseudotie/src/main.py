@@ -2,7 +2,7 @@ from ast import Add
 import asyncio
 import os
 import logging
-from random import randint
+from random import randint, random
 import re
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import JSONResponse
@@ -422,6 +422,45 @@ async def debug_patient_post(request: Request, input: PatientInput):
         return JSONResponse(status_code=409)
 
 
+class FaultInjection(BaseModel):
+    # seconds added before each response
+    delay: float = 0
+    # share of responses replaced with an HTTP 503
+    error_rate: float = 0
+
+
+faults = FaultInjection()
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    """
+    Makes the integration engine slow or failing, as set through
+    /debug/faults/, to test how the backend copes
+    """
+    if request.url.path.startswith("/debug/faults/"):
+        return await call_next(request)
+    if faults.delay:
+        await asyncio.sleep(faults.delay)
+    if faults.error_rate and random() < faults.error_rate:
+        return JSONResponse({"error": "injected fault"}, status_code=503)
+    return await call_next(request)
+
+
+@app.post("/debug/faults/")
+@needs_authentication
+async def debug_faults_post(request: Request, input: FaultInjection):
+    """
+    Sets the faults injected into later responses
+    :param _: Request - ignored
+    :param input: FaultInjection - delay and error rate, zero to stop
+    :return: JSONResponse of faults now injected
+    """
+    global faults
+    faults = input
+    return faults
+
+
 @app.post("/debug/cleardatabase/")
 @needs_authentication
 async def debug_clear_db(request: Request):
@@ -446,23 +485,17 @@ class DebugTestResultRequest(BaseModel):
     pathwayName: str
 
 
-@app.post("/debug/testresult/")
-@needs_authentication
-async def debug_create_test_result(
-    request: Request, input: DebugTestResultRequest
-):
+async def createTestResult(
+    input: DebugTestResultRequest, patientId: int, bg: BackgroundTasks
+) -> TestResult:
     """
-    Create test result
-    :return: JSONResponse containing ID of created test result or error data
-    """
-    """
-    Runs as it does currently, opens up a thread to wait until the time
-    is right
-    Additionally, when pseudotie starts it'll query the database for a
-    list of not yet completed
-    results and send them all at once to backend
+    Creates a test result, completing it later unless it is created
+    completed
+    :param input: DebugTestResultRequest - test result to create
+    :param patientId: int - ID of the test result's patient
+    :param bg: BackgroundTasks - tasks to run once the response is sent
+    :return: TestResult created
     """
-
     data = {
         "type_reference_name": input.typeReferenceName,
         "pathway_name": input.pathwayName
@@ -474,9 +507,7 @@ async def debug_create_test_result(
     if input.updatedAt is not None:
         data["updated_at"] = input.updatedAt
 
-    patient: Patient = await Patient.query.where(
-        Patient.hospital_number == input.hospitalNumber).gino.one_or_none()
-    data['patient_id'] = patient.id
+    data['patient_id'] = patientId
 
     if input.currentState is not None and input.currentState == "COMPLETED":
         data["description"] = input.description or \
@@ -498,7 +529,6 @@ async def debug_create_test_result(
         **data
     )
 
-    bg = BackgroundTasks()
     if "description" not in data:
         bg.add_task(proc_wrapper, updateTestResultAtRandomTime(
                 testResultId=testResult.id,
@@ -507,14 +537,83 @@ async def debug_create_test_result(
                 delay=plannedReturnDelay
             )
         )
+    return testResult
 
-    return JSONResponse({
+
+def testResultToJson(testResult: TestResult) -> dict:
+    return {
         "id": testResult.id,
         "description":  testResult.description,
         "type_reference_name": testResult.type_reference_name,
         "current_state": testResult.current_state.value,
         "added_at": testResult.added_at.isoformat(),
         "updated_at": testResult.updated_at.isoformat()
-    }, background=bg)
+    }
+
+
+@app.post("/debug/testresult/")
+@needs_authentication
+async def debug_create_test_result(
+    request: Request, input: DebugTestResultRequest
+):
+    """
+    Create test result
+    :return: JSONResponse containing ID of created test result or error data
+    """
+    """
+    Runs as it does currently, opens up a thread to wait until the time
+    is right
+    Additionally, when pseudotie starts it'll query the database for a
+    list of not yet completed
+    results and send them all at once to backend
+    """
+
+    patient: Patient = await Patient.query.where(
+        Patient.hospital_number == input.hospitalNumber).gino.one_or_none()
+
+    bg = BackgroundTasks()
+    testResult = await createTestResult(input, patient.id, bg)
+
+    return JSONResponse(testResultToJson(testResult), background=bg)
+
+
+@app.post("/testresults")
+@needs_authentication
+async def create_test_results_post(
+    request: Request, input: List[DebugTestResultRequest]
+):
+    """
+    Create many test results at once, each as /debug/testresult/ would
+    :param input: List[DebugTestResultRequest] - test results to create
+    :return: JSONResponse containing the created test results, in the
+        order requested, or a 404 listing hospital numbers of unknown
+        patients
+    """
+    patients: List[Patient] = await Patient.query.where(
+        Patient.hospital_number.in_([i.hospitalNumber for i in input])
+    ).gino.all()
+    patientIds = {patient.hospital_number: patient.id for patient in patients}
+    # checked before any is created, so the batch is created whole or
+    # not at all
+    missing = sorted(
+        set(i.hospitalNumber for i in input) - patientIds.keys()
+    )
+    if missing:
+        return JSONResponse(
+            {"error": "unknown hospital numbers", "hospitalNumbers": missing},
+            status_code=404
+        )
+
+    bg = BackgroundTasks()
+    async with db.transaction():
+        testResults = [
+            await createTestResult(i, patientIds[i.hospitalNumber], bg)
+            for i in input
+        ]
+
+    return JSONResponse(
+        [testResultToJson(testResult) for testResult in testResults],
+        background=bg
+    )
 
 db.init_app(app)